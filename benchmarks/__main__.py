@@ -0,0 +1,24 @@
+
+import os
+import sys
+import importlib
+
+import maya.standalone
+maya.standalone.initialize()
+
+# pulse setup
+import pulse
+pulse.loadBuiltinActions()
+
+# run the named benchmarks, or all of them if none are given
+# e.g. `mayapy benchmarks bench_yaml`
+names = sys.argv[1:]
+if not names:
+    benchDir = os.path.dirname(os.path.abspath(__file__))
+    names = sorted([os.path.splitext(f)[0] for f in os.listdir(benchDir)
+                    if f.startswith('bench_') and f.endswith('.py')])
+
+for name in names:
+    module = importlib.import_module(name)
+    print('\n{0}\n{1}'.format(name, '=' * len(name)))
+    module.run()
@@ -0,0 +1,65 @@
+"""
+Measure adding many steps with the same name to a group, compared
+to the unique name allocation used before name suffixes were remembered.
+"""
+
+import re
+
+import pulse
+
+import benchutils
+
+
+def incrementName(name):
+    numMatch = re.match('(.*?)([0-9]+$)', name)
+    if numMatch:
+        base, num = numMatch.groups()
+        return base + str(int(num) + 1)
+    else:
+        return name + ' 1'
+
+
+def allocateNamesByScanning(names):
+    """
+    Return unique names for a list of names the way steps were
+    named before, by scanning sibling names and incrementing
+    the name until it is unique.
+    """
+    result = []
+    for name in names:
+        siblingNames = list(result)
+        while name in siblingNames:
+            name = incrementName(name)
+        result.append(name)
+    return result
+
+
+def run():
+    rows = []
+    for stepCount in (100, 1000, 2000):
+        names = ['Anim Control'] * stepCount
+
+        def addOneAtATime():
+            group = pulse.BuildStep('Group')
+            for name in names:
+                group.addChild(pulse.BuildStep(name))
+            return group
+
+        def addAll():
+            group = pulse.BuildStep('Group')
+            group.addChildren([pulse.BuildStep(name) for name in names])
+            return group
+
+        scanTime = benchutils.timeit(
+            lambda: allocateNamesByScanning(names), repeat=1)
+        addChildTime = benchutils.timeit(addOneAtATime)
+        addChildrenTime = benchutils.timeit(addAll)
+        rows.append([
+            stepCount,
+            '{0:.4f}s'.format(scanTime),
+            '{0:.4f}s'.format(addChildTime),
+            '{0:.4f}s'.format(addChildrenTime),
+        ])
+
+    benchutils.printTable(
+        ['steps', 'naming only (before)', 'addChild', 'addChildren'], rows)
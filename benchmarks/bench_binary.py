@@ -0,0 +1,33 @@
+"""
+Compare yaml and binary blueprint save/load times and file sizes.
+"""
+
+import os
+import tempfile
+
+import pulse
+
+import benchutils
+
+
+def run():
+    nodes = benchutils.createNodes(100)
+    tempDir = tempfile.mkdtemp()
+    rows = []
+    for stepCount in (1000, 10000):
+        blueprint = benchutils.createSyntheticBlueprint(
+            stepCount, variantCount=4, nodes=nodes)
+        for ext in ('.yaml', pulse.BINARY_BLUEPRINT_EXT):
+            filepath = os.path.join(tempDir, 'bench' + ext)
+            saveTime = benchutils.timeit(
+                lambda: blueprint._writeFile(filepath))
+            loadTime = benchutils.timeit(
+                lambda: pulse.Blueprint().loadFromFile(filepath))
+            rows.append([
+                stepCount, ext,
+                '{0:.3f}s'.format(saveTime),
+                '{0:.3f}s'.format(loadTime),
+                '{0}KB'.format(os.path.getsize(filepath) // 1024),
+            ])
+
+    benchutils.printTable(['steps', 'format', 'save', 'load', 'size'], rows)
@@ -0,0 +1,39 @@
+"""
+Compare full and incremental blueprint serialization
+after editing a single attribute.
+"""
+
+import benchutils
+
+
+def markAllDirty(blueprint):
+    for step in blueprint.rootStep.childIterator():
+        step.markDirty()
+        proxy = step.actionProxy
+        if proxy:
+            proxy.markDirty()
+            for i in range(proxy.numVariants()):
+                proxy.getVariant(i).markDirty()
+
+
+def run():
+    blueprint = benchutils.createSyntheticBlueprint(5000, variantCount=4)
+    step = blueprint.getStepByPath('Group50/Anim Control 10')
+    values = [True, False]
+
+    def fullSave():
+        markAllDirty(blueprint)
+        blueprint.serialize()
+
+    def incrementalSave():
+        values.reverse()
+        step.actionProxy.setAttrValue('createOffset', values[0])
+        blueprint.serialize()
+
+    blueprint.serialize()
+    fullTime = benchutils.timeit(fullSave)
+    incTime = benchutils.timeit(incrementalSave)
+    benchutils.printTable(['steps', 'full', 'one attr edit', 'speedup'], [[
+        5000, '{0:.4f}s'.format(fullTime), '{0:.4f}s'.format(incTime),
+        '{0:.0f}x'.format(fullTime / max(incTime, 1e-6)),
+    ]])
@@ -0,0 +1,40 @@
+"""
+Compare eager and lazy deserialization of a blueprint, measuring
+the time until the top level of the step tree can be displayed.
+"""
+
+import pulse
+
+import benchutils
+
+
+def showTopLevel(blueprint):
+    root = blueprint.rootStep
+    return [root.getChildAt(i).getDisplayName()
+            for i in range(root.numChildren())]
+
+
+def run():
+    rows = []
+    for stepCount in (1000, 10000):
+        data = benchutils.createSyntheticBlueprint(
+            stepCount, variantCount=4).serialize()
+
+        def load(lazy):
+            blueprint = pulse.Blueprint.fromData(data, lazy=lazy)
+            showTopLevel(blueprint)
+            return blueprint
+
+        eagerTime = benchutils.timeit(lambda: load(False))
+        lazyTime = benchutils.timeit(lambda: load(True))
+        lazySaveTime = benchutils.timeit(lambda: load(True).serialize())
+        rows.append([
+            stepCount,
+            '{0:.4f}s'.format(eagerTime),
+            '{0:.4f}s'.format(lazyTime),
+            '{0:.4f}s'.format(lazySaveTime),
+            '{0:.0f}x'.format(eagerTime / max(lazyTime, 1e-6)),
+        ])
+
+    benchutils.printTable(
+        ['steps', 'eager', 'lazy', 'lazy + serialize', 'speedup'], rows)
@@ -0,0 +1,95 @@
+"""
+Report the memory used by the object model of a large synthetic
+blueprint, with 10k steps and 50k variants.
+
+Uses tracemalloc when available (Python 3), otherwise measures
+the size of all objects reachable from the blueprint, excluding
+action configs and other data that is shared between blueprints.
+"""
+
+import gc
+import sys
+import types
+
+import pulse
+from pulse.core import buildItems
+
+import benchutils
+
+try:
+    import tracemalloc
+except ImportError:
+    tracemalloc = None
+
+
+def getSharedObjectIds():
+    """
+    Return the ids of all objects that are shared between blueprints,
+    such as registered action configs, which shouldn't be counted.
+    """
+    ids = set()
+    pending = [buildItems.BUILDACTIONMAP, buildItems.BUILDACTIONCLASSMAP]
+    while pending:
+        obj = pending.pop()
+        if id(obj) in ids:
+            continue
+        ids.add(id(obj))
+        pending.extend(gc.get_referents(obj))
+    return ids
+
+
+def getDeepSize(root, excludeIds):
+    """
+    Return the total size and count of all objects reachable from root.
+    """
+    skipTypes = (type, types.ModuleType, types.FunctionType,
+                 types.BuiltinFunctionType)
+    seen = set(excludeIds)
+    pending = [root]
+    size = 0
+    count = 0
+    while pending:
+        obj = pending.pop()
+        if id(obj) in seen or isinstance(obj, skipTypes):
+            continue
+        seen.add(id(obj))
+        size += sys.getsizeof(obj)
+        count += 1
+        pending.extend(gc.get_referents(obj))
+    return size, count
+
+
+def createBlueprint(nodes):
+    # 5k variant actions with 10 variants each
+    return benchutils.createSyntheticBlueprint(
+        10000, variantCount=10, nodes=nodes)
+
+
+def run():
+    nodes = benchutils.createNodes(100)
+    # make sure lazily created shared data exists before measuring
+    createBlueprint(nodes).serialize()
+
+    if tracemalloc:
+        gc.collect()
+        tracemalloc.start()
+        blueprint = createBlueprint(nodes)
+        gc.collect()
+        size = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        method = 'tracemalloc'
+        count = '-'
+    else:
+        blueprint = createBlueprint(nodes)
+        size, count = getDeepSize(blueprint, getSharedObjectIds())
+        method = 'reachable objects'
+
+    stepCount = sum(1 for _ in blueprint.rootStep.childIterator())
+    variantCount = sum(s.actionProxy.numVariants()
+                       for s in blueprint.rootStep.childIterator()
+                       if s.isAction())
+    benchutils.printTable(
+        ['steps', 'variants', 'method', 'objects', 'size', 'per step'],
+        [[stepCount, variantCount, method, count,
+          '{0:.1f} MB'.format(size / 1048576.0),
+          '{0:.0f} B'.format(float(size) / stepCount)]])
@@ -0,0 +1,50 @@
+"""
+Compare finding Pulse metadata nodes by rescanning the scene
+with using the shared metadata index.
+"""
+
+import pymel.core as pm
+import pymetanode as meta
+
+import pulse
+from pulse import spaces
+
+import benchutils
+
+
+def run():
+    rows = []
+    for nodeCount in (10000, 20000):
+        pm.newFile(force=True)
+        nodes = benchutils.createNodes(nodeCount, prefix='metaindex')
+        # tag 1% of nodes as spaces
+        for i, node in enumerate(nodes[::100]):
+            spaces.createSpace(node, 'space{0}'.format(i))
+        index = pulse.MetaIndex.getShared()
+        index.rebuild()
+
+        scanTime = benchutils.timeit(
+            lambda: meta.findMetaNodes(spaces.SPACE_METACLASS))
+        indexTime = benchutils.timeit(spaces.getAllSpaces)
+        byNameTime = benchutils.timeit(spaces.getAllSpacesIndexedByName)
+
+        # adding nodes only checks the new nodes on the next query
+        def addAndFind():
+            newNodes = benchutils.createNodes(10, prefix='metaindexNew')
+            spaces.createSpace(newNodes[0], 'newSpace')
+            spaces.getAllSpaces()
+            pm.delete(newNodes)
+        addTime = benchutils.timeit(addAndFind)
+
+        rows.append([
+            nodeCount,
+            '{0:.4f}s'.format(scanTime),
+            '{0:.4f}s'.format(indexTime),
+            '{0:.1f}x'.format(scanTime / max(indexTime, 1e-6)),
+            '{0:.4f}s'.format(byNameTime),
+            '{0:.4f}s'.format(addTime),
+        ])
+
+    benchutils.printTable(
+        ['nodes', 'rescan', 'index', 'speedup', 'spaces by name',
+         'add 10 + query'], rows)
@@ -0,0 +1,40 @@
+"""
+Compare resolving node references one at a time with
+resolving them all at once when loading blueprints.
+"""
+
+import pymetanode as meta
+
+from pulse.core import serializer
+
+import benchutils
+
+
+def run():
+    rows = []
+    for nodeCount in (100, 1000, 5000):
+        nodes = benchutils.createNodes(nodeCount, prefix='resolve')
+        blueprint = benchutils.createSyntheticBlueprint(
+            nodeCount, nodes=nodes)
+        text = serializer.dumpYaml(blueprint.serialize())
+        uuids = [str(meta.getUUID(n)) for n in nodes]
+
+        findTime = benchutils.timeit(
+            lambda: [meta.findNodeByUUID(u) for u in uuids])
+        batchTime = benchutils.timeit(
+            lambda: serializer.getNodesByUUID(uuids))
+        loadTime = benchutils.timeit(lambda: serializer.loadYaml(text))
+        rawLoadTime = benchutils.timeit(
+            lambda: serializer.loadYaml(text, resolveNodes=False))
+        rows.append([
+            nodeCount,
+            '{0:.3f}s'.format(findTime),
+            '{0:.3f}s'.format(batchTime),
+            '{0:.1f}x'.format(findTime / batchTime),
+            '{0:.3f}s'.format(loadTime),
+            '{0:.3f}s'.format(loadTime - rawLoadTime),
+        ])
+
+    benchutils.printTable(
+        ['nodes', 'one at a time', 'batched', 'speedup', 'load yaml',
+         'resolve'], rows)
@@ -0,0 +1,73 @@
+"""
+Compare resolving steps by path using the path index against
+scanning children by name, and measure the cost of keeping
+the index up to date when renaming and moving steps.
+"""
+
+import pulse
+
+import benchutils
+
+
+def findStepByScanning(step, path):
+    """
+    Resolve a step path by scanning the children at each level,
+    the way paths were resolved before the path index.
+    """
+    for name in path.split('/'):
+        for child in step.children:
+            if child.name == name:
+                step = child
+                break
+        else:
+            return
+    return step
+
+
+def run():
+    rows = []
+    for stepCount, groupSize in ((1000, 50), (10000, 50), (10000, 2000)):
+        blueprint = benchutils.createSyntheticBlueprint(
+            stepCount, groupSize=groupSize)
+        paths = [s.getFullPath() for s in blueprint.rootStep.childIterator()
+                 if s.isAction()]
+        # prime the path index
+        blueprint.getStepByPath(paths[0])
+
+        def scanAll():
+            root = blueprint.rootStep
+            for path in paths:
+                findStepByScanning(root, path)
+
+        def lookupAll():
+            for path in paths:
+                blueprint.getStepByPath(path)
+
+        def renameAndMove():
+            root = blueprint.rootStep
+            groupA = root.getChildAt(0)
+            groupB = root.getChildAt(1)
+            for _ in range(100):
+                step = groupA.getChildAt(0)
+                groupA.removeChildAt(0)
+                groupB.addChild(step)
+                step.setName(step.name + 'x')
+                groupB.removeChild(step)
+                groupA.insertChild(0, step)
+
+        scanTime = benchutils.timeit(scanAll)
+        lookupTime = benchutils.timeit(lookupAll)
+        editTime = benchutils.timeit(renameAndMove)
+        rows.append([
+            stepCount,
+            groupSize,
+            '{0:.2f}us'.format(scanTime / len(paths) * 1e6),
+            '{0:.2f}us'.format(lookupTime / len(paths) * 1e6),
+            '{0:.0f}x'.format(scanTime / max(lookupTime, 1e-6)),
+            '{0:.2f}us'.format(editTime / 100 * 1e6),
+        ])
+        assert not blueprint.rootStep.getIndexErrors()
+
+    benchutils.printTable(
+        ['steps', 'group size', 'scan', 'indexed', 'speedup',
+         'move + rename'], rows)
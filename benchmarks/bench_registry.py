@@ -0,0 +1,68 @@
+"""
+Measure BuildAction construction with many registered actions,
+compared to scanning the registry for the action's class.
+"""
+
+import pulse
+from pulse.core import buildItems
+
+import benchutils
+
+
+class BenchRegistryAction(pulse.BuildAction):
+
+    def validate(self):
+        pass
+
+    def run(self):
+        pass
+
+
+def getConfigByScanning(actionClass):
+    """
+    Return the config for an action class the way
+    BuildAction.__init__ did before the class index.
+    """
+    for v in buildItems.BUILDACTIONMAP.values():
+        if v['class'] is actionClass:
+            return v['config']
+
+
+def run():
+    rows = []
+    for extraCount in (0, 100, 1000):
+        # register extra actions, each with its own class
+        extraIds = []
+        for i in range(extraCount):
+            actionId = 'Bench.Extra{0}'.format(i)
+            actionClass = type('BenchExtra{0}'.format(i),
+                               (BenchRegistryAction,), {})
+            pulse.registerAction({'id': actionId, 'attrs': []}, actionClass)
+            extraIds.append(actionId)
+        pulse.registerAction({'id': 'Bench.Registry', 'attrs': []},
+                             BenchRegistryAction)
+        try:
+            count = 1000
+
+            def scanAll():
+                for _ in range(count):
+                    getConfigByScanning(BenchRegistryAction)
+
+            def constructAll():
+                for _ in range(count):
+                    BenchRegistryAction()
+
+            scanTime = benchutils.timeit(scanAll)
+            constructTime = benchutils.timeit(constructAll)
+            rows.append([
+                len(buildItems.BUILDACTIONMAP),
+                '{0:.2f}us'.format(scanTime / count * 1e6),
+                '{0:.2f}us'.format(constructTime / count * 1e6),
+            ])
+        finally:
+            for actionId in extraIds + ['Bench.Registry']:
+                pulse.unregisterAction(actionId)
+
+    benchutils.printTable(
+        ['registered actions', 'class lookup (before)', 'construct action'],
+        rows)
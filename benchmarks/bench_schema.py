@@ -0,0 +1,92 @@
+"""
+Measure attribute access on BuildActions with many attributes,
+compared to scanning the action config for every access.
+"""
+
+import pulse
+from pulse.core import buildItems
+
+import benchutils
+
+
+class BenchManyAttrsAction(pulse.BuildAction):
+
+    def validate(self):
+        pass
+
+    def run(self):
+        pass
+
+
+class BenchScanningAction(BenchManyAttrsAction):
+    """
+    An action that looks up attributes the way BuildAction.__getattr__
+    did before compiled action schemas.
+    """
+
+    def __getattr__(self, name):
+        return getAttrByScanning(self, name)
+
+
+def createConfig(actionId, attrCount):
+    attrs = []
+    for i in range(attrCount):
+        attrType = ['bool', 'int', 'string', 'nodelist'][i % 4]
+        attrs.append({'name': 'attr{0}'.format(i), 'type': attrType})
+    return {'id': actionId, 'attrs': attrs}
+
+
+def getAttrByScanning(action, name):
+    for attr in action.config['attrs']:
+        if attr['name'] == name:
+            break
+    else:
+        raise AttributeError(name)
+    if name in action._attrValues:
+        return action._attrValues[name]
+    if 'value' in attr:
+        return attr['value']
+    attrType = attr['type']
+    if 'list' in attrType:
+        return []
+    elif attrType == 'bool':
+        return False
+    elif attrType in ['int', 'float']:
+        return 0
+    elif attrType == 'string':
+        return ''
+
+
+def run():
+    rows = []
+    for attrCount in (10, 50, 200):
+        pulse.registerAction(createConfig('Bench.ManyAttrs', attrCount),
+                             BenchManyAttrsAction)
+        pulse.registerAction(createConfig('Bench.Scanning', attrCount),
+                             BenchScanningAction)
+        try:
+            names = ['attr{0}'.format(i) for i in range(attrCount)]
+            accessCount = 100 * len(names)
+
+            def getAll(action):
+                for name in names[::2]:
+                    action.setAttrValue(name, 1)
+                for _ in range(100):
+                    for name in names:
+                        getattr(action, name)
+
+            scanTime = benchutils.timeit(
+                lambda: getAll(BenchScanningAction()))
+            schemaTime = benchutils.timeit(
+                lambda: getAll(BenchManyAttrsAction()))
+            rows.append([
+                attrCount,
+                '{0:.3f}us'.format(scanTime / accessCount * 1e6),
+                '{0:.3f}us'.format(schemaTime / accessCount * 1e6),
+                '{0:.1f}x'.format(scanTime / max(schemaTime, 1e-9)),
+            ])
+        finally:
+            buildItems.unregisterAction('Bench.ManyAttrs')
+            buildItems.unregisterAction('Bench.Scanning')
+
+    benchutils.printTable(['attrs', 'scan', 'schema', 'speedup'], rows)
@@ -0,0 +1,145 @@
+"""
+Compare the undo data stored by plug-in commands in an UndoJournal,
+with the previous approach of storing encoded values and snapshots
+of the whole action proxy, and the cost of applying it. Attribute
+value changes record the encoded old value, other changes a delta.
+"""
+
+import sys
+
+import pymetanode as meta
+
+import pulse
+from pulse.core import deltas
+
+import benchutils
+
+
+def createProxy(variantCount, nodes):
+    proxy = pulse.BuildActionProxy('Pulse.AnimControl')
+    proxy.setIsVariantAttr('controlNode', True)
+    proxy.setIsVariantAttr('keyableAttrs', True)
+    for i in range(variantCount):
+        variant = proxy.getOrCreateVariant(i)
+        variant.setAttrValue('controlNode', nodes[i % len(nodes)])
+        variant.setAttrValue('keyableAttrs', ['t', 'r{0}'.format(i)])
+    return proxy
+
+
+def setAttr(proxy):
+    proxy.setAttrValue('createOffset', not proxy.getAttrValue('createOffset'))
+
+
+def setVariantAttr(proxy):
+    variant = proxy.getVariant(proxy.numVariants() // 2)
+    value = variant.getAttrValue('keyableAttrs')
+    variant.setAttrValue('keyableAttrs', value + ['s'])
+
+
+def setIsVariantAttr(proxy):
+    proxy.setIsVariantAttr(
+        'createOffset', not proxy.isVariantAttr('createOffset'))
+
+
+def getJournalData(isValueChange, oldStr, delta):
+    """
+    Return the data a command records in the undo journal.
+    """
+    return oldStr if isValueChange else delta
+
+
+def measure(proxy, change, oldUndoData, restoreOld, isValueChange):
+    """
+    Perform a change and return the size of the undo data stored by
+    the old approach and in the journal, and the time to apply the
+    old undo data and a delta.
+    """
+    oldStr = oldUndoData(proxy)
+    oldData = proxy.serialize()
+    change(proxy)
+    newData = proxy.serialize()
+    delta = deltas.diffData(oldData, newData)
+    targets = []
+
+    def createTarget():
+        target = pulse.BuildActionProxy()
+        target.deserialize(newData)
+        targets.append(target)
+
+    def applyOld():
+        # decode the old value or snapshot and restore it
+        restoreOld(targets.pop(), meta.decodeMetaData(oldStr))
+
+    def applyDelta():
+        targets.pop().applyDelta(delta, reverse=True)
+
+    def patchOnly():
+        deltas.patchData(newData, delta, reverse=True)
+
+    journalData = getJournalData(isValueChange, oldStr, delta)
+    return [sys.getsizeof(oldStr), deltas.getDataSize(journalData),
+            timeWithSetup(createTarget, applyOld),
+            timeWithSetup(createTarget, applyDelta),
+            benchutils.timeit(patchOnly)]
+
+
+def timeWithSetup(setup, func, repeat=3):
+    best = None
+    for _ in range(repeat):
+        setup()
+        elapsed = benchutils.timeit(func, repeat=1)
+        if best is None or elapsed < best:
+            best = elapsed
+    return best
+
+
+def run():
+    nodes = benchutils.createNodes(10)
+    rows = []
+    # (name, change, old undo data, restore old undo data,
+    #  whether the command only records the old value)
+    commands = [
+        ('pulseSetActionAttr', setAttr,
+         lambda p: meta.encodeMetaData(p.getAttrValue('createOffset')),
+         lambda p, v: p.setAttrValue('createOffset', v), True),
+        ('pulseSetActionAttr -v', setVariantAttr,
+         lambda p: meta.encodeMetaData(p.getVariant(
+             p.numVariants() // 2).getAttrValue('keyableAttrs')),
+         lambda p, v: p.getVariant(
+             p.numVariants() // 2).setAttrValue('keyableAttrs', v), True),
+        ('pulseSetIsVariantAttr', setIsVariantAttr,
+         lambda p: meta.encodeMetaData(p.serialize()),
+         lambda p, v: p.deserialize(v), False),
+    ]
+    for variantCount in (10, 1000):
+        for name, change, oldUndoData, restoreOld, isValue in commands:
+            proxy = createProxy(variantCount, nodes)
+            oldSize, deltaSize, oldTime, deltaTime, patchTime = measure(
+                proxy, change, oldUndoData, restoreOld, isValue)
+            rows.append([
+                variantCount, name,
+                '{0} B'.format(oldSize), '{0} B'.format(deltaSize),
+                '{0:.5f}s'.format(oldTime), '{0:.5f}s'.format(deltaTime),
+                '{0:.5f}s'.format(patchTime)])
+
+    benchutils.printTable(
+        ['variants', 'command', 'old undo data', 'journal data',
+         'old apply', 'delta apply', 'patch only'], rows)
+
+    # a long editing session with a bounded journal
+    proxy = createProxy(1000, nodes)
+    journal = deltas.UndoJournal(maxEntries=1000)
+    oldTotal = 0
+    for i in range(5000):
+        _, change, oldUndoData, _, isValue = commands[i % len(commands)]
+        oldStr = oldUndoData(proxy)
+        oldTotal += sys.getsizeof(oldStr)
+        oldData = proxy.serialize()
+        change(proxy)
+        delta = deltas.diffData(oldData, proxy.serialize())
+        journal.record(getJournalData(isValue, oldStr, delta))
+    print('')
+    benchutils.printTable(
+        ['commands', 'old undo data', 'journal entries', 'journal size'],
+        [[5000, '{0:.1f} MB'.format(oldTotal / 1048576.0), len(journal),
+          '{0:.1f} MB'.format(journal.getSize() / 1048576.0)]])
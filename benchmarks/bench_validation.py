@@ -0,0 +1,28 @@
+"""
+Measure the time to check all actions of large blueprints before
+building, with validators run on the main thread or on a thread pool.
+"""
+
+import pulse
+
+import benchutils
+
+
+def run():
+    nodes = benchutils.createNodes(10)
+    rows = []
+    for stepCount in (1000, 10000):
+        blueprint = benchutils.createSyntheticBlueprint(
+            stepCount, variantCount=4, nodes=nodes)
+        times = []
+        for maxWorkers in (0, 4):
+            checker = pulse.BlueprintChecker(blueprint, maxWorkers=maxWorkers)
+            times.append(benchutils.timeit(checker.run))
+        results = pulse.BlueprintChecker(blueprint).run()
+        rows.append([
+            stepCount, results.actionCount, len(results.errors),
+            '{0:.4f}s'.format(times[0]), '{0:.4f}s'.format(times[1]),
+        ])
+
+    benchutils.printTable(
+        ['steps', 'actions', 'errors', 'main thread', 'thread pool'], rows)
@@ -0,0 +1,64 @@
+"""
+Measure creating BuildActions from an action proxy with many variants,
+compared to copying the serialized data of the proxy for every variant.
+"""
+
+import pymetanode as meta
+
+import pulse
+
+import benchutils
+
+
+def createProxy(variantCount, nodes):
+    proxy = pulse.BuildActionProxy('Pulse.SpaceConstrain')
+    proxy.setAttrValue('node', nodes[0])
+    proxy.setAttrValue('spaces', ['world', 'root'])
+    proxy.setIsVariantAttr('node', True)
+    for i in range(variantCount):
+        variant = proxy.getOrCreateVariant(i)
+        variant.setAttrValue('node', nodes[i % len(nodes)])
+    return proxy
+
+
+def createActionsByCopying(proxy):
+    """
+    Create actions the way BuildActionProxy.actionIterator did before
+    variant actions shared values, by round tripping the proxy data
+    through pymetanode for every variant.
+    """
+    mainData = proxy.serialize()
+    actions = []
+    for i in range(proxy.numVariants()):
+        variant = proxy.getVariant(i)
+        data = dict(variant.serialize())
+        data.update(meta.decodeMetaData(meta.encodeMetaData(mainData)))
+        actions.append(pulse.BuildAction.fromData(data))
+    return actions
+
+
+def readAttrs(actions):
+    for action in actions:
+        action.node
+        action.spaces
+
+
+def run():
+    nodes = benchutils.createNodes(100)
+    rows = []
+    for variantCount in (1, 100, 1000):
+        proxy = createProxy(variantCount, nodes)
+
+        copyTime = benchutils.timeit(
+            lambda: readAttrs(createActionsByCopying(proxy)))
+        sharedTime = benchutils.timeit(
+            lambda: readAttrs(list(proxy.actionIterator())))
+        rows.append([
+            variantCount,
+            '{0:.4f}s'.format(copyTime),
+            '{0:.4f}s'.format(sharedTime),
+            '{0:.1f}x'.format(copyTime / max(sharedTime, 1e-6)),
+        ])
+
+    benchutils.printTable(
+        ['variants', 'copy per variant', 'shared values', 'speedup'], rows)
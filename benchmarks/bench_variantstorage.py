@@ -0,0 +1,54 @@
+"""
+Measure deserializing, serializing and bulk editing
+action proxies with many variants.
+"""
+
+import pulse
+
+import benchutils
+
+
+def createProxyData(variantCount):
+    proxy = pulse.BuildActionProxy('Pulse.AnimControl')
+    proxy.setIsVariantAttr('controlNode', True)
+    proxy.setIsVariantAttr('keyableAttrs', True)
+    for i in range(variantCount):
+        variant = proxy.getOrCreateVariant(i)
+        variant.setAttrValue('keyableAttrs', ['t', 'r{0}'.format(i)])
+    return proxy.serialize()
+
+
+def run():
+    rows = []
+    for variantCount in (100, 1000, 10000):
+        data = createProxyData(variantCount)
+        proxy = pulse.BuildActionProxy()
+        proxy.deserialize(data)
+        values = [['s', str(i)] for i in range(variantCount)]
+
+        def deserialize():
+            pulse.BuildActionProxy().deserialize(data)
+
+        def serialize():
+            proxy.markDirty()
+            proxy._serializedVariants = [None] * proxy.numVariants()
+            proxy.serialize()
+
+        def setEachVariant():
+            for i, value in enumerate(values):
+                proxy.getVariant(i).setAttrValue('keyableAttrs', value)
+
+        def setAllVariants():
+            proxy.setVariantValues('keyableAttrs', values)
+
+        rows.append([
+            variantCount,
+            '{0:.4f}s'.format(benchutils.timeit(deserialize)),
+            '{0:.4f}s'.format(benchutils.timeit(serialize)),
+            '{0:.4f}s'.format(benchutils.timeit(setEachVariant)),
+            '{0:.4f}s'.format(benchutils.timeit(setAllVariants)),
+        ])
+
+    benchutils.printTable(
+        ['variants', 'deserialize', 'serialize', 'set each variant',
+         'setVariantValues'], rows)
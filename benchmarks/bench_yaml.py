@@ -0,0 +1,47 @@
+"""
+Compare pure python and libyaml blueprint load/save times.
+"""
+
+from pulse.vendor import yaml
+from pulse.core import serializer
+
+import benchutils
+
+
+def run():
+    if not serializer.isLibYamlEnabled():
+        print('libyaml is not available, only pure python yaml will be timed')
+
+    nodes = benchutils.createNodes(100)
+    rows = []
+    for stepCount in (1000, 10000):
+        blueprint = benchutils.createSyntheticBlueprint(
+            stepCount, variantCount=4, nodes=nodes)
+        data = blueprint.serialize()
+
+        def dumpPy():
+            return yaml.dump(data, default_flow_style=False,
+                             Dumper=serializer.PulseDumper)
+
+        text = dumpPy()
+        pyDump = benchutils.timeit(dumpPy)
+        pyLoad = benchutils.timeit(
+            lambda: yaml.load(text, Loader=serializer.PulseLoader))
+
+        cDump = cLoad = None
+        if serializer.isLibYamlEnabled():
+            if serializer.dumpYaml(data) != text:
+                raise AssertionError('libyaml output does not match')
+            cDump = benchutils.timeit(lambda: serializer.dumpYaml(data))
+            cLoad = benchutils.timeit(lambda: serializer.loadYaml(text))
+
+        for op, pyTime, cTime in (('dump', pyDump, cDump),
+                                  ('load', pyLoad, cLoad)):
+            rows.append([
+                stepCount, op, '{0:.3f}s'.format(pyTime),
+                '{0:.3f}s'.format(cTime) if cTime else '-',
+                '{0:.1f}x'.format(pyTime / cTime) if cTime else '-',
+            ])
+
+    benchutils.printTable(
+        ['steps', 'op', 'python', 'libyaml', 'speedup'], rows)
@@ -0,0 +1,94 @@
+"""
+Utils for creating synthetic blueprints and timing operations
+"""
+
+import time
+import maya.cmds as cmds
+import pymel.core as pm
+
+import pulse
+
+
+def createNodes(count, prefix='bench'):
+    """
+    Create and return a list of transform nodes to use
+    as node attribute values.
+    """
+    names = [cmds.createNode('transform', n='{0}_{1}'.format(prefix, i))
+             for i in range(count)]
+    return [pm.PyNode(n) for n in names]
+
+
+def createSyntheticBlueprint(stepCount, groupSize=50, variantCount=0,
+                             nodes=None):
+    """
+    Create a Blueprint with a number of action steps organized into groups.
+
+    Args:
+        stepCount (int): The total number of action steps to create
+        groupSize (int): The number of action steps in each group
+        variantCount (int): If > 0, every other action is a variant
+            action with this many variants
+        nodes (list of PyNode): Optional nodes to reference in node attrs
+    """
+    blueprint = pulse.Blueprint()
+    blueprint.rigName = 'benchRig'
+    groupCount = (stepCount + groupSize - 1) // groupSize
+    index = 0
+    for g in range(groupCount):
+        group = pulse.BuildStep('Group{0}'.format(g))
+        blueprint.rootStep.addChild(group)
+        for _ in range(min(groupSize, stepCount - index)):
+            node = nodes[index % len(nodes)] if nodes else None
+            step = _createSyntheticStep(index, variantCount, node)
+            group.addChild(step)
+            index += 1
+    return blueprint
+
+
+def _createSyntheticStep(index, variantCount, node):
+    if index % 2:
+        step = pulse.BuildStep(actionId='Pulse.AnimControl')
+        proxy = step.actionProxy
+        proxy.setAttrValue('controlNode', node)
+        proxy.setAttrValue('createOffset', bool(index % 3))
+        proxy.setAttrValue('keyableAttrs', ['t', 'r'])
+    else:
+        step = pulse.BuildStep(actionId='Pulse.SpaceConstrain')
+        proxy = step.actionProxy
+        proxy.setAttrValue('node', node)
+        proxy.setAttrValue('spaces', ['world', 'space{0}'.format(index)])
+        if variantCount:
+            proxy.setIsVariantAttr('spaces', True)
+            for v in range(variantCount):
+                variant = proxy.getOrCreateVariant(v)
+                variant.setAttrValue('spaces', ['space{0}'.format(v)])
+    return step
+
+
+def timeit(func, repeat=3):
+    """
+    Call a function multiple times and return the best time in seconds.
+    """
+    best = None
+    for _ in range(repeat):
+        start = time.time()
+        func()
+        elapsed = time.time() - start
+        if best is None or elapsed < best:
+            best = elapsed
+    return best
+
+
+def printTable(headers, rows):
+    """
+    Print a simple aligned table of results.
+    """
+    rows = [[str(c) for c in row] for row in rows]
+    widths = [max([len(str(h))] + [len(r[i]) for r in rows])
+              for i, h in enumerate(headers)]
+    fmt = '  '.join('{{{0}:<{1}}}'.format(i, w) for i, w in enumerate(widths))
+    print(fmt.format(*headers))
+    print(fmt.format(*['-' * w for w in widths]))
+    for row in rows:
+        print(fmt.format(*row))
@@ -44,10 +44,81 @@ class PulseCmdBase(om.MPxCommand):
     def fromStrData(self, data):
         return pulse.core.deserializeAttrValue(data)
 
+    def getJournalData(self, blueprintModel):
+        """
+        Return the data recorded by this command in the undo
+        journal of the blueprint model.
+
+        Raises:
+            RuntimeError: If the entry has been discarded, since
+                the blueprint would no longer match Maya's undo queue
+        """
+        data = blueprintModel.undoJournal.get(self.journalEntryId)
+        if data is None:
+            raise RuntimeError(
+                "{0}: undo history for this change is no longer available, "
+                "the blueprint no longer matches the undo queue".format(
+                    self.cmdName))
+        return data
+
+
+class PulseStepDeltaCmdBase(PulseCmdBase):
+    """
+    Base class for commands that modify a single BuildStep.
+
+    The change is stored as a delta of the step's data in the undo
+    journal of the blueprint model, and undo and redo apply the delta,
+    so that commands don't need to keep copies of any data.
+    Subclasses implement `doChange`, and set `stepPath` and `newStepPath`
+    to the paths of the step before and after the change.
+    """
+
+    def doIt(self, args):
+        self.parseArguments(args)
+        self.journalEntryId = None
+
+        blueprintModel = self.getBlueprintModel()
+        if blueprintModel:
+            oldData = blueprintModel.getStepDeltaData(self.stepPath)
+            self.doChange(blueprintModel)
+            if oldData is not None:
+                newData = blueprintModel.getStepDeltaData(self.newStepPath)
+                if newData is not None:
+                    delta = pulse.core.diffData(oldData, newData)
+                    self.journalEntryId = blueprintModel.undoJournal.record(
+                        delta)
+
+    def parseArguments(self, args):
+        raise NotImplementedError
+
+    def doChange(self, blueprintModel):
+        """
+        Perform the change for the first time.
+        """
+        raise NotImplementedError
+
+    def redoIt(self):
+        blueprintModel = self.getBlueprintModel()
+        if blueprintModel:
+            delta = self.getJournalData(blueprintModel)
+            blueprintModel.applyStepDelta(self.stepPath, delta)
+
+    def undoIt(self):
+        blueprintModel = self.getBlueprintModel()
+        if blueprintModel:
+            delta = self.getJournalData(blueprintModel)
+            blueprintModel.applyStepDelta(
+                self.newStepPath, delta, reverse=True)
 
-class PulseSetActionAttrCmd(PulseCmdBase):
+
+class PulseSetActionAttrCmd(PulseStepDeltaCmdBase):
     """
     Command to modify the value of a Pulse BuildAction attribute.
+
+    Changes to a single existing value only record the old value in
+    the undo journal, and redo uses the new value from the command
+    arguments. Changes that create variants, or set all variants at
+    once, record a delta of the step like other step commands.
     """
 
     cmdName = "pulseSetActionAttr"
@@ -58,6 +129,8 @@ class PulseSetActionAttrCmd(PulseCmdBase):
     valueArgType = om.MSyntax.kString
     # the index of the variant to modify
     variantFlag = CmdFlag('-v', '-variant', om.MSyntax.kLong)
+    # when set, the value is a list of values for all variants
+    allVariantsFlag = CmdFlag('-av', '-allVariants')
 
     @staticmethod
     def createCmd():
@@ -69,12 +142,9 @@ class PulseSetActionAttrCmd(PulseCmdBase):
         syntax.addArg(PulseSetActionAttrCmd.attrPathArgType)
         syntax.addArg(PulseSetActionAttrCmd.valueArgType)
         syntax.addFlag(*PulseSetActionAttrCmd.variantFlag)
+        syntax.addFlag(*PulseSetActionAttrCmd.allVariantsFlag)
         return syntax
 
-    def doIt(self, args):
-        self.parseArguments(args)
-        self.redoIt()
-
     def parseArguments(self, args):
         if len(args) != 2:
             raise TypeError(
@@ -89,6 +159,8 @@ class PulseSetActionAttrCmd(PulseCmdBase):
 
         # attr path
         self.attrPath = argparser.commandArgumentString(0)
+        self.stepPath = self.attrPath.split('.')[0]
+        self.newStepPath = self.stepPath
 
         # attr value
         self.newStrValue = argparser.commandArgumentString(1)
@@ -99,32 +171,149 @@ class PulseSetActionAttrCmd(PulseCmdBase):
             self.variantIndex = argparser.flagArgumentInt(
                 PulseSetActionAttrCmd.variantFlag.flag, 0)
 
-    def redoIt(self):
-        blueprintModel = self.getBlueprintModel()
-        if blueprintModel:
-            # store old value as str
-            self.oldStrValue = self.toStrData(
-                blueprintModel.getActionAttr(
-                    self.attrPath, self.variantIndex))
+        # all variants
+        self.allVariants = argparser.isFlagSet(
+            PulseSetActionAttrCmd.allVariantsFlag.flag)
 
-            # deserialize str value into objects
-            value = self.fromStrData(self.newStrValue)
+    def doIt(self, args):
+        self.parseArguments(args)
+        self.isValueChange = False
+
+        blueprintModel = self.getBlueprintModel()
+        if blueprintModel and self.canRecordValue(blueprintModel):
+            self.isValueChange = True
+            self.journalEntryId = None
+            oldValue = blueprintModel.getActionAttr(
+                self.attrPath, self.variantIndex)
+            if self.setValue(blueprintModel, self.newStrValue) is None:
+                raise RuntimeError("Failed to set BuildAction attribute")
+            self.journalEntryId = blueprintModel.undoJournal.record(
+                self.toStrData(oldValue))
+        else:
+            super(PulseSetActionAttrCmd, self).doIt(args)
+
+    def canRecordValue(self, blueprintModel):
+        """
+        Return True if the change only modifies one existing value,
+        and can be undone by restoring the old value.
+        """
+        if self.allVariants:
+            return False
+        step = blueprintModel.blueprint.getStepByPath(self.stepPath)
+        if not step or not step.isAction():
+            return False
+        return self.variantIndex < step.actionProxy.numVariants()
+
+    def setValue(self, blueprintModel, strValue):
+        return blueprintModel.setActionAttr(
+            self.attrPath, self.fromStrData(strValue), self.variantIndex)
+
+    def doChange(self, blueprintModel):
+        # deserialize str value into objects
+        value = self.fromStrData(self.newStrValue)
+        if self.allVariants:
+            blueprintModel.setActionAttrVariantValues(self.attrPath, value)
+        else:
             blueprintModel.setActionAttr(
                 self.attrPath, value, self.variantIndex)
 
+    def redoIt(self):
+        if not self.isValueChange:
+            return super(PulseSetActionAttrCmd, self).redoIt()
+        blueprintModel = self.getBlueprintModel()
+        if blueprintModel:
+            self.setValue(blueprintModel, self.newStrValue)
+
     def undoIt(self):
+        if not self.isValueChange:
+            return super(PulseSetActionAttrCmd, self).undoIt()
         blueprintModel = self.getBlueprintModel()
         if blueprintModel:
-            # deserialize str value into objects
-            value = self.fromStrData(self.oldStrValue)
-            blueprintModel.setActionAttr(
-                self.attrPath, value, self.variantIndex)
+            self.setValue(
+                blueprintModel, self.getJournalData(blueprintModel))
 
 
 CMD_CLASSES.append(PulseSetActionAttrCmd)
 
 
-class PulseSetIsVariantAttrCmd(PulseCmdBase):
+class PulseSetActionAttrsCmd(PulseCmdBase):
+    """
+    Command to modify the values of multiple Pulse BuildAction
+    attributes at once, as a single undoable change.
+    """
+
+    cmdName = "pulseSetActionAttrs"
+
+    # the serialized list of edits, where each edit is a list of
+    # [attrPath, variantIndex, value], and a variantIndex of -1
+    # sets the invariant value, e.g. '[["My/Step.myAttr", -1, 123]]'
+    editsArgType = om.MSyntax.kString
+
+    @staticmethod
+    def createCmd():
+        return PulseSetActionAttrsCmd()
+
+    @staticmethod
+    def createSyntax():
+        syntax = om.MSyntax()
+        syntax.addArg(PulseSetActionAttrsCmd.editsArgType)
+        return syntax
+
+    def doIt(self, args):
+        self.parseArguments(args)
+        self.journalEntryId = None
+
+        blueprintModel = self.getBlueprintModel()
+        if blueprintModel:
+            stepPaths = []
+            for attrPath, _, _ in self.edits:
+                stepPath = attrPath.split('.')[0]
+                if stepPath not in stepPaths:
+                    stepPaths.append(stepPath)
+
+            oldData = blueprintModel.getStepsDeltaData(stepPaths)
+            if oldData is None:
+                raise RuntimeError("Failed to find BuildSteps")
+            if blueprintModel.setActionAttrs(self.edits) is None:
+                raise RuntimeError("Failed to set BuildAction attributes")
+            newData = blueprintModel.getStepsDeltaData(stepPaths)
+            delta = pulse.core.diffData(oldData, newData)
+            self.journalEntryId = blueprintModel.undoJournal.record(delta)
+
+    def parseArguments(self, args):
+        if len(args) != 1:
+            raise TypeError(
+                "pulseSetActionAttrs() takes exactly 1 argument "
+                "({0} given)".format(len(args)))
+
+        try:
+            argparser = om.MArgParser(self.syntax(), args)
+        except RuntimeError:
+            om.MGlobal.displayError('Error while parsing arguments')
+            raise
+
+        # deserialize the list of edits
+        edits = self.fromStrData(argparser.commandArgumentString(0))
+        self.edits = [(str(attrPath), int(variantIndex), value)
+                      for attrPath, variantIndex, value in edits]
+
+    def redoIt(self):
+        blueprintModel = self.getBlueprintModel()
+        if blueprintModel:
+            delta = self.getJournalData(blueprintModel)
+            blueprintModel.applyStepsDelta(delta)
+
+    def undoIt(self):
+        blueprintModel = self.getBlueprintModel()
+        if blueprintModel:
+            delta = self.getJournalData(blueprintModel)
+            blueprintModel.applyStepsDelta(delta, reverse=True)
+
+
+CMD_CLASSES.append(PulseSetActionAttrsCmd)
+
+
+class PulseSetIsVariantAttrCmd(PulseStepDeltaCmdBase):
     """
     Command to change an attribute of a Pulse BuildAction attribute
     from being constant or variant.
@@ -148,10 +337,6 @@ class PulseSetIsVariantAttrCmd(PulseCmdBase):
         syntax.addArg(PulseSetIsVariantAttrCmd.valueArgType)
         return syntax
 
-    def doIt(self, args):
-        self.parseArguments(args)
-        self.redoIt()
-
     def parseArguments(self, args):
         if len(args) != 2:
             raise TypeError(
@@ -166,35 +351,22 @@ class PulseSetIsVariantAttrCmd(PulseCmdBase):
 
         # attr path
         self.attrPath = argparser.commandArgumentString(0)
+        self.stepPath = self.attrPath.split('.')[0]
+        self.newStepPath = self.stepPath
 
         # is variant value
         self.newValue = argparser.commandArgumentBool(1)
 
-    def redoIt(self):
-        blueprintModel = self.getBlueprintModel()
-        if blueprintModel:
-            # TODO: fail if not changing anything
-
-            # snapshot the whole action proxy, since it may change
-            # significantly when modifying variant attrs
-            self.oldStrData = self.toStrData(
-                blueprintModel.getActionDataForAttrPath(
-                    self.attrPath))
-            blueprintModel.setIsActionAttrVariant(
-                self.attrPath, self.newValue)
-
-    def undoIt(self):
-        blueprintModel = self.getBlueprintModel()
-        if blueprintModel:
-            oldData = self.fromStrData(self.oldStrData)
-            blueprintModel.setActionDataForAttrPath(
-                self.attrPath, oldData)
+    def doChange(self, blueprintModel):
+        # TODO: fail if not changing anything
+        blueprintModel.setIsActionAttrVariant(
+            self.attrPath, self.newValue)
 
 
 CMD_CLASSES.append(PulseSetIsVariantAttrCmd)
 
 
-class PulseMoveStepCmd(PulseCmdBase):
+class PulseMoveStepCmd(PulseStepDeltaCmdBase):
     """
     Command to move or rename a Pulse BuildStep.
     """
@@ -215,10 +387,6 @@ class PulseMoveStepCmd(PulseCmdBase):
         syntax.addArg(PulseMoveStepCmd.targetFlagType)
         return syntax
 
-    def doIt(self, args):
-        self.parseArguments(args)
-        self.redoIt()
-
     def parseArguments(self, args):
         if len(args) != 2:
             raise TypeError(
@@ -233,21 +401,15 @@ class PulseMoveStepCmd(PulseCmdBase):
 
         self.sourcePath = argdb.commandArgumentString(0)
         self.targetPath = argdb.commandArgumentString(1)
-
-    def redoIt(self):
-        blueprintModel = self.getBlueprintModel()
-        if blueprintModel:
-            # save the resolved path after performing the move
-            self.resolvedTargetPath = blueprintModel.moveStep(
-                self.sourcePath, self.targetPath)
-            if self.resolvedTargetPath is None:
-                raise RuntimeError("Failed to move BuildStep")
-
-    def undoIt(self):
-        blueprintModel = self.getBlueprintModel()
-        if blueprintModel:
-            blueprintModel.moveStep(
-                self.resolvedTargetPath, self.sourcePath)
+        self.stepPath = self.sourcePath
+        self.newStepPath = self.targetPath
+
+    def doChange(self, blueprintModel):
+        # save the resolved path after performing the move
+        self.newStepPath = blueprintModel.moveStep(
+            self.sourcePath, self.targetPath)
+        if self.newStepPath is None:
+            raise RuntimeError("Failed to move BuildStep")
 
 
 CMD_CLASSES.append(PulseMoveStepCmd)
@@ -7,10 +7,12 @@ import pulse.nodes
 
 class SimpleConstrainAction(pulse.BuildAction):
 
+    validateUsesScene = False
+
     def validate(self):
-        if not self.leader:
+        if self.leader is None:
             raise pulse.BuildActionError("leader must be set")
-        if not self.follower:
+        if self.follower is None:
             raise pulse.BuildActionError("follower must be set")
 
     def run(self):
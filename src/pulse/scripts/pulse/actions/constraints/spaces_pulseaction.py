@@ -9,8 +9,10 @@ import pulse.nodes
 
 class CreateSpaceAction(pulse.BuildAction):
 
+    validateUsesScene = False
+
     def validate(self):
-        if not self.node:
+        if self.node is None:
             raise pulse.BuildActionError("node is not set")
         if not self.name:
             raise pulse.BuildActionError("name is empty")
@@ -21,8 +23,10 @@ class CreateSpaceAction(pulse.BuildAction):
 
 class SpaceConstrainAction(pulse.BuildAction):
 
+    validateUsesScene = False
+
     def validate(self):
-        if not self.node:
+        if self.node is None:
             raise pulse.BuildActionError("node is not set")
         if not self.spaces:
             raise pulse.BuildActionError("no spaces were set")
@@ -35,6 +39,8 @@ class SpaceConstrainAction(pulse.BuildAction):
 
 class ApplySpacesAction(pulse.BuildAction):
 
+    validateUsesScene = False
+
     def validate(self):
         pass
 
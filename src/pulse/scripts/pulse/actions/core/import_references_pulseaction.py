@@ -6,6 +6,10 @@ import pulse.references
 
 class ImportReferencesAction(pulse.BuildAction):
 
+    def getSourceFiles(self):
+        refs = pulse.references.getFileReferences()
+        return [str(ref.path) for ref in refs if ref is not None]
+
     def run(self):
         pulse.references.importAllReferences(
             loadUnloaded=self.loadUnloaded,
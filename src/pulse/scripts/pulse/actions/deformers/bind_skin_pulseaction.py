@@ -9,6 +9,8 @@ import pulse.skins
 
 class BindSkinAction(pulse.BuildAction):
 
+    validateUsesScene = False
+
     @classmethod
     def util_fromSelection(cls):
         sel = pm.selected()
@@ -67,21 +69,28 @@ class BindSkinAction(pulse.BuildAction):
 
 class ApplySkinWeightsAction(pulse.BuildAction):
 
+    validateUsesScene = False
+
     def validate(self):
         if not len(self.meshes):
             raise pulse.BuildActionError('No meshes were set')
         if not self.fileName:
             raise pulse.BuildActionError('No filename was set')
 
-    def run(self):
-        # get full path
+    def getFilePath(self):
+        """
+        Return the full path to the weights file
+        """
         blueprintPath = str(pm.sceneName())
         if not self.fileName:
             # default to blueprint file name
-            filePath = os.path.splitext(blueprintPath)[0] + '.weights'
-        else:
-            filePath = os.path.join(
-                os.path.dirname(blueprintPath), self.fileName)
+            return os.path.splitext(blueprintPath)[0] + '.weights'
+        return os.path.join(os.path.dirname(blueprintPath), self.fileName)
 
+    def getSourceFiles(self):
+        return [self.getFilePath()]
+
+    def run(self):
+        filePath = self.getFilePath()
         skins = [pulse.skins.getSkinFromMesh(m) for m in self.meshes]
         pulse.skins.applySkinWeightsFromFile(filePath, *skins)
@@ -8,16 +8,18 @@ import pulse.joints
 
 class ThreeBoneIKFKAction(pulse.BuildAction):
 
+    validateUsesScene = False
+
     def validate(self):
-        if not self.endJoint:
+        if self.endJoint is None:
             raise pulse.BuildActionError('endJoint is not set')
-        if not self.rootCtl:
+        if self.rootCtl is None:
             raise pulse.BuildActionError('rootCtl is not set')
-        if not self.midCtlIk:
+        if self.midCtlIk is None:
             raise pulse.BuildActionError('midCtlIk is not set')
-        if not self.midCtlFk:
+        if self.midCtlFk is None:
             raise pulse.BuildActionError('midCtlFk is not set')
-        if not self.endCtl:
+        if self.endCtl is None:
             raise pulse.BuildActionError('endCtl is not set')
 
     def run(self):
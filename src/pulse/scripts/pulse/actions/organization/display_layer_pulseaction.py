@@ -5,6 +5,8 @@ import pulse
 
 class DisplayLayerAction(pulse.BuildAction):
 
+    validateUsesScene = False
+
     def validate(self):
         if not len(self.name):
             raise pulse.BuildActionError('No name was given for display layer')
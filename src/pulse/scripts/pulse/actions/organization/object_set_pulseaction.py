@@ -6,6 +6,8 @@ import pulse
 
 class ObjectSetAction(pulse.BuildAction):
 
+    validateUsesScene = False
+
     def validate(self):
         if not len(self.name):
             raise pulse.BuildActionError('No name was given for object set')
@@ -0,0 +1,322 @@
+"""
+Command-line batch building of blueprints, using a pool of
+worker processes that each build one rig in mayapy.
+
+Usage:
+    mayapy pulse/batch.py [-w WORKERS] [-o OUTPUTDIR] SCENE[,BLUEPRINT] ...
+
+Each job is a blueprint scene, and an optional blueprint file to build
+it with, which defaults to the blueprint stored in the scene. The built
+rig, build log, and worker output of each job are saved in a directory
+for the job, and the results of all jobs are aggregated into one json
+report.
+
+This module only uses the standard library until a worker starts,
+so the coordinator can run in any Python interpreter.
+"""
+
+import os
+import sys
+import json
+import time
+import logging
+import argparse
+import tempfile
+import traceback
+import subprocess
+from multiprocessing.pool import ThreadPool
+
+__all__ = [
+    'getDefaultWorkerCommand',
+    'runBatch',
+]
+
+LOG = logging.getLogger('pulse.batch')
+
+
+def getDefaultWorkerCommand(mayapy=None):
+    """
+    Return the command used to run a worker, which is
+    called with a job file and result file path.
+
+    Args:
+        mayapy (str): The path to the mayapy executable, defaults
+            to the MAYAPY environment variable, or 'mayapy'
+    """
+    if not mayapy:
+        mayapy = os.environ.get('MAYAPY', 'mayapy')
+    modulePath = os.path.splitext(os.path.abspath(__file__))[0] + '.py'
+    return [mayapy, modulePath, '--worker']
+
+
+def _createJobs(jobs, outputDir):
+    """
+    Return a list of job dicts with absolute paths
+    and a unique output directory for each job.
+    """
+    result = []
+    usedNames = set()
+    for job in jobs:
+        scene = os.path.abspath(job['scene'])
+        blueprint = job.get('blueprint')
+        name = os.path.splitext(os.path.basename(scene))[0]
+        uniqueName = name
+        index = 1
+        while uniqueName in usedNames:
+            uniqueName = '{0}_{1}'.format(name, index)
+            index += 1
+        usedNames.add(uniqueName)
+        result.append(dict(
+            name=uniqueName,
+            scene=scene,
+            blueprint=os.path.abspath(blueprint) if blueprint else None,
+            outputDir=os.path.join(outputDir, uniqueName),
+        ))
+    return result
+
+
+def _runJob(args):
+    """
+    Run a worker process for a job and return its result.
+    """
+    job, workerCommand = args
+    outputDir = job['outputDir']
+    if not os.path.isdir(outputDir):
+        os.makedirs(outputDir)
+    jobFile = os.path.join(outputDir, 'job.json')
+    resultFile = os.path.join(outputDir, 'result.json')
+    workerLog = os.path.join(outputDir, 'worker.log')
+    with open(jobFile, 'w') as fp:
+        json.dump(job, fp, indent=2)
+    if os.path.isfile(resultFile):
+        os.remove(resultFile)
+
+    startTime = time.time()
+    with open(workerLog, 'w') as logFp:
+        try:
+            returnCode = subprocess.call(
+                workerCommand + [jobFile, resultFile],
+                stdout=logFp, stderr=subprocess.STDOUT)
+        except OSError as error:
+            logFp.write('Failed to start worker: {0}\n'.format(error))
+            returnCode = None
+    elapsedTime = time.time() - startTime
+
+    result = None
+    if os.path.isfile(resultFile):
+        try:
+            with open(resultFile, 'r') as fp:
+                result = json.load(fp)
+        except ValueError as error:
+            LOG.error("Invalid worker result: {0}: {1}".format(
+                resultFile, error))
+    if result is None:
+        result = dict(success=False, errors=[dict(
+            message='Worker did not write a result, see {0}'.format(
+                workerLog))])
+    result.update(
+        name=job['name'],
+        scene=job['scene'],
+        blueprint=job['blueprint'],
+        outputDir=outputDir,
+        workerLog=workerLog,
+        returnCode=returnCode,
+        elapsedTime=elapsedTime,
+    )
+    if returnCode != 0:
+        result['success'] = False
+    return result
+
+
+def runBatch(jobs, outputDir, workerCount=2, workerCommand=None,
+             reportFile=None):
+    """
+    Build a list of blueprints in parallel using worker processes.
+
+    Args:
+        jobs (list of dict): The jobs to build, each a dict with a 'scene'
+            path, and an optional 'blueprint' file path
+        outputDir (str): The directory in which to save the results
+        workerCount (int): The maximum number of workers to run at once
+        workerCommand (list of str): The command to run a worker, which is
+            called with a job file and result file path, see
+            `getDefaultWorkerCommand` and `runWorker`
+        reportFile (str): The path of the json report, defaults
+            to 'report.json' in the output directory
+
+    Returns:
+        The report dict, containing the results of each job
+    """
+    if workerCommand is None:
+        workerCommand = getDefaultWorkerCommand()
+    if not reportFile:
+        reportFile = os.path.join(outputDir, 'report.json')
+    outputDir = os.path.abspath(outputDir)
+    jobs = _createJobs(jobs, outputDir)
+    workerCount = max(1, min(workerCount, len(jobs)))
+
+    LOG.info("Building {0} blueprint(s) with {1} worker(s)".format(
+        len(jobs), workerCount))
+    startTime = time.time()
+    pool = ThreadPool(workerCount)
+    try:
+        results = pool.map(
+            _runJob, [(job, workerCommand) for job in jobs], 1)
+    finally:
+        pool.close()
+        pool.join()
+    elapsedTime = time.time() - startTime
+
+    for result in results:
+        lvl = logging.INFO if result['success'] else logging.ERROR
+        LOG.log(lvl, "{0}: {1}, {2:.3f} seconds, {3} error(s)".format(
+            result['name'], 'succeeded' if result['success'] else 'failed',
+            result['elapsedTime'], len(result.get('errors', []))))
+
+    report = dict(
+        workerCount=workerCount,
+        elapsedTime=elapsedTime,
+        jobCount=len(results),
+        succeeded=len([r for r in results if r['success']]),
+        failed=len([r for r in results if not r['success']]),
+        errorCount=sum([len(r.get('errors', [])) for r in results]),
+        jobs=results,
+    )
+    reportDir = os.path.dirname(os.path.abspath(reportFile))
+    if not os.path.isdir(reportDir):
+        os.makedirs(reportDir)
+    with open(reportFile, 'w') as fp:
+        json.dump(report, fp, indent=2)
+    LOG.info("Wrote batch report: {0}".format(reportFile))
+    return report
+
+
+def runWorker(jobFile, resultFile):
+    """
+    Build a single job in the current process, which must be able
+    to initialize Maya, and write the result to a json file.
+
+    Returns:
+        True if the job was built successfully
+    """
+    with open(jobFile, 'r') as fp:
+        job = json.load(fp)
+    result = dict(success=False, errors=[], output=None, buildTime=0)
+    try:
+        _buildJob(job, result)
+    except Exception:
+        result['errors'].append(dict(message=traceback.format_exc()))
+        result['success'] = False
+    with open(resultFile, 'w') as fp:
+        json.dump(result, fp, indent=2)
+    return result['success']
+
+
+def _buildJob(job, result):
+    import maya.standalone
+    maya.standalone.initialize()
+
+    # make sure pulse can be imported when running this file directly
+    scriptsDir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    if scriptsDir not in sys.path:
+        sys.path.insert(0, scriptsDir)
+
+    import pymel.core as pm
+    import pulse
+    pulse.loadBuiltinActions()
+
+    class BatchBlueprintBuilder(pulse.BlueprintBuilder):
+        def onError(self, step, action, error):
+            super(BatchBlueprintBuilder, self).onError(step, action, error)
+            result['errors'].append(dict(
+                path=step.getFullPath(),
+                actionId=action.getActionId(),
+                message=str(error),
+            ))
+
+    pm.openFile(job['scene'], force=True)
+    blueprint = pulse.Blueprint()
+    if job.get('blueprint'):
+        if not blueprint.loadFromFile(job['blueprint']):
+            raise ValueError(
+                "Failed to load blueprint: {0}".format(job['blueprint']))
+    else:
+        nodes = pulse.Blueprint.getAllBlueprintNodes()
+        if not nodes:
+            raise ValueError(
+                "Scene contains no blueprint: {0}".format(job['scene']))
+        blueprint.loadFromNode(nodes[0])
+    result['rigName'] = blueprint.rigName
+    result['version'] = pulse.__version__
+
+    builder = BatchBlueprintBuilder(
+        blueprint, blueprintFile=job['scene'], logDir=job['outputDir'],
+        fastBuild=True)
+    builder.start()
+    result['buildTime'] = builder.elapsedTime
+    if not builder.isFinished:
+        raise RuntimeError("Build did not finish")
+
+    output = os.path.join(job['outputDir'], job['name'] + '_rig.mb')
+    pm.renameFile(output)
+    pm.saveFile(force=True, type='mayaBinary')
+    result['output'] = output
+    result['success'] = not result['errors']
+
+
+def _parseJob(value):
+    parts = value.split(',', 1)
+    return dict(scene=parts[0], blueprint=parts[1] if len(parts) > 1 else None)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Build pulse blueprints in parallel.")
+    parser.add_argument(
+        'jobs', nargs='*', metavar='SCENE[,BLUEPRINT]',
+        help="A blueprint scene to build, and an optional blueprint file")
+    parser.add_argument(
+        '-f', '--jobs-file',
+        help="A json file containing a list of jobs, "
+             "each a dict with 'scene' and optional 'blueprint' paths")
+    parser.add_argument(
+        '-w', '--workers', type=int, default=2,
+        help="The number of worker processes to run at once")
+    parser.add_argument(
+        '-o', '--output-dir', default=None,
+        help="The directory in which to save results")
+    parser.add_argument(
+        '-r', '--report', default=None,
+        help="The path of the json report, defaults to the output dir")
+    parser.add_argument(
+        '--mayapy', default=None,
+        help="The mayapy executable used to run workers")
+    parser.add_argument(
+        '--worker', nargs=2, metavar=('JOBFILE', 'RESULTFILE'),
+        help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+
+    if args.worker:
+        return 0 if runWorker(*args.worker) else 1
+
+    jobs = [_parseJob(j) for j in args.jobs]
+    if args.jobs_file:
+        with open(args.jobs_file, 'r') as fp:
+            jobs.extend(json.load(fp))
+    if not jobs:
+        parser.error("no jobs were given")
+
+    outputDir = args.output_dir
+    if not outputDir:
+        outputDir = tempfile.mkdtemp(prefix='pulse_batch_')
+    report = runBatch(
+        jobs, outputDir, workerCount=args.workers,
+        workerCommand=getDefaultWorkerCommand(args.mayapy),
+        reportFile=args.report)
+    return 0 if report['failed'] == 0 else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
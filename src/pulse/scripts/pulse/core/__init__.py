@@ -1,11 +1,33 @@
 
 from . import serializer
+from . import binaryFormat
+from . import metaIndex
 from . import blueprints
 from . import buildItems
 from . import rigs
 from . import events
+from . import deltas
+from . import checkpoints
+from . import dependencies
+from . import profiling
+from . import validation
+from . import fastBuild
+from . import buildExecutor
+from . import buildLog
+from . import buildCache
 from .serializer import *
+from .binaryFormat import *
+from .metaIndex import *
 from .blueprints import *
 from .buildItems import *
 from .rigs import *
 from .events import *
+from .deltas import *
+from .checkpoints import *
+from .dependencies import *
+from .profiling import *
+from .validation import *
+from .fastBuild import *
+from .buildExecutor import *
+from .buildLog import *
+from .buildCache import *
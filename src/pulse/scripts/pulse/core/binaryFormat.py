@@ -0,0 +1,284 @@
+"""
+A compact binary format for serialized blueprint data.
+
+All integers are little-endian. The file starts with a header
+and a table of interned strings, followed by a single typed value:
+
+    magic       4 bytes, 'PLSB'
+    version     uint8
+    strings     uint32 count, then uint32 length + utf-8 bytes for each
+    value       a typed value
+
+Every typed value starts with a one byte tag:
+
+    N           None
+    T / F       True / False
+    i           int64
+    L           long too large for int64, as a string index
+    d           float64
+    s           string, as a uint32 index into the string table
+    l           list, uint32 count followed by the values
+    m           mapping, uint32 count followed by key, value pairs
+    u           node reference, 16 byte UUID
+    U           node reference with a non-standard UUID, as a string index
+"""
+
+import uuid
+import struct
+import pymetanode as meta
+import pymel.core as pm
+
+from .serializer import UnresolvedNode, resolveNodeReferences
+
+__all__ = [
+    'BINARY_BLUEPRINT_EXT',
+    'dumpBinary',
+    'isBinaryData',
+    'isBinaryFilepath',
+    'loadBinary',
+]
+
+BINARY_MAGIC = 'PLSB'
+BINARY_VERSION = 1
+
+# the file extension used for binary blueprint files
+BINARY_BLUEPRINT_EXT = '.pbin'
+
+_UINT8 = struct.Struct('<B')
+_UINT32 = struct.Struct('<I')
+_INT64 = struct.Struct('<q')
+_FLOAT64 = struct.Struct('<d')
+
+_INT64_MIN = -(1 << 63)
+_INT64_MAX = (1 << 63) - 1
+
+
+def isBinaryData(header):
+    """
+    Return True if the given data starts with the binary blueprint header
+
+    Args:
+        header (str): The first bytes of a file or data
+    """
+    return header[:len(BINARY_MAGIC)] == BINARY_MAGIC
+
+
+def isBinaryFilepath(filepath):
+    """
+    Return True if a file path has the binary blueprint extension
+    """
+    return filepath.lower().endswith(BINARY_BLUEPRINT_EXT)
+
+
+class _BinaryWriter(object):
+    """
+    Writes typed values to a list of byte chunks, interning all strings.
+    """
+
+    def __init__(self):
+        self.chunks = []
+        self.strings = []
+        self.stringIndeces = {}
+
+    def getBytes(self):
+        header = [BINARY_MAGIC, _UINT8.pack(BINARY_VERSION),
+                  _UINT32.pack(len(self.strings))]
+        for s in self.strings:
+            header.append(_UINT32.pack(len(s)))
+            header.append(s)
+        return ''.join(header + self.chunks)
+
+    def intern(self, value):
+        """
+        Return the index of a string in the string table, adding it if needed.
+        """
+        if isinstance(value, unicode):
+            value = value.encode('utf-8')
+        index = self.stringIndeces.get(value)
+        if index is None:
+            index = len(self.strings)
+            self.strings.append(value)
+            self.stringIndeces[value] = index
+        return index
+
+    def write(self, value):
+        append = self.chunks.append
+        if value is None:
+            append('N')
+        elif value is True:
+            append('T')
+        elif value is False:
+            append('F')
+        elif isinstance(value, basestring):
+            append('s' + _UINT32.pack(self.intern(value)))
+        elif isinstance(value, (int, long)):
+            if _INT64_MIN <= value <= _INT64_MAX:
+                append('i' + _INT64.pack(value))
+            else:
+                append('L' + _UINT32.pack(self.intern(str(value))))
+        elif isinstance(value, float):
+            append('d' + _FLOAT64.pack(value))
+        elif isinstance(value, dict):
+            append('m' + _UINT32.pack(len(value)))
+            for k, v in value.items():
+                self.write(k)
+                self.write(v)
+        elif isinstance(value, (list, tuple)):
+            append('l' + _UINT32.pack(len(value)))
+            for v in value:
+                self.write(v)
+        elif isinstance(value, UnresolvedNode):
+            self.writeNodeUUID(value.uuid)
+        elif isinstance(value, pm.nt.DagNode):
+            self.writeNodeUUID(str(meta.getUUID(value)))
+        else:
+            raise TypeError(
+                "Cannot write {0} to binary blueprint data".format(
+                    type(value).__name__))
+
+    def writeNodeUUID(self, nodeUUID):
+        try:
+            uuidBytes = uuid.UUID(nodeUUID).bytes
+        except ValueError:
+            self.chunks.append('U' + _UINT32.pack(self.intern(nodeUUID)))
+        else:
+            self.chunks.append('u' + uuidBytes)
+
+
+class _BinaryReader(object):
+    """
+    Reads typed values from binary blueprint data.
+    """
+
+    def __init__(self, data):
+        self.data = data
+        self.pos = 0
+        self.strings = []
+
+    def readHeader(self):
+        if not isBinaryData(self.data):
+            raise ValueError("Data is not a binary blueprint")
+        self.pos = len(BINARY_MAGIC)
+        version = _UINT8.unpack_from(self.data, self.pos)[0]
+        if version > BINARY_VERSION:
+            raise ValueError(
+                "Unsupported binary blueprint version: {0}".format(version))
+        self.pos += _UINT8.size
+
+        data = self.data
+        count = _UINT32.unpack_from(data, self.pos)[0]
+        pos = self.pos + _UINT32.size
+        strings = []
+        for _ in xrange(count):
+            length = _UINT32.unpack_from(data, pos)[0]
+            pos += _UINT32.size
+            strings.append(_decodeString(data[pos:pos + length]))
+            pos += length
+        self.strings = strings
+        self.pos = pos
+
+    def read(self):
+        data = self.data
+        tag = data[self.pos]
+        self.pos += 1
+        if tag == 's':
+            index = _UINT32.unpack_from(data, self.pos)[0]
+            self.pos += _UINT32.size
+            return self.strings[index]
+        elif tag == 'm':
+            count = _UINT32.unpack_from(data, self.pos)[0]
+            self.pos += _UINT32.size
+            read = self.read
+            result = {}
+            for _ in xrange(count):
+                k = read()
+                result[k] = read()
+            return result
+        elif tag == 'l':
+            count = _UINT32.unpack_from(data, self.pos)[0]
+            self.pos += _UINT32.size
+            read = self.read
+            return [read() for _ in xrange(count)]
+        elif tag == 'i':
+            value = _INT64.unpack_from(data, self.pos)[0]
+            self.pos += _INT64.size
+            return value
+        elif tag == 'd':
+            value = _FLOAT64.unpack_from(data, self.pos)[0]
+            self.pos += _FLOAT64.size
+            return value
+        elif tag == 'N':
+            return None
+        elif tag == 'T':
+            return True
+        elif tag == 'F':
+            return False
+        elif tag == 'L':
+            index = _UINT32.unpack_from(data, self.pos)[0]
+            self.pos += _UINT32.size
+            return long(self.strings[index])
+        elif tag == 'u':
+            nodeUUID = str(uuid.UUID(bytes=data[self.pos:self.pos + 16]))
+            self.pos += 16
+            return self.getNode(nodeUUID.upper())
+        elif tag == 'U':
+            index = _UINT32.unpack_from(data, self.pos)[0]
+            self.pos += _UINT32.size
+            return self.getNode(self.strings[index])
+        else:
+            raise ValueError(
+                "Invalid binary blueprint data, unknown tag {0!r} "
+                "at {1}".format(tag, self.pos - 1))
+
+    def getNode(self, nodeUUID):
+        # nodes are resolved all at once after reading
+        return UnresolvedNode(nodeUUID)
+
+
+def _decodeString(value):
+    """
+    Decode a utf-8 string, returning a str if possible,
+    and unicode otherwise, matching the behavior of yaml.
+    """
+    try:
+        value.decode('ascii')
+    except UnicodeDecodeError:
+        return value.decode('utf-8')
+    return value
+
+
+def dumpBinary(data, stream=None):
+    """
+    Serialize data to the binary blueprint format.
+
+    Args:
+        data: The data to serialize, made up of dicts, lists,
+            strings, numbers, bools, None, and nodes
+        stream: An optional file-like object to write to. If not
+            given, the binary data is returned as a str.
+    """
+    writer = _BinaryWriter()
+    writer.write(data)
+    result = writer.getBytes()
+    if stream is None:
+        return result
+    stream.write(result)
+
+
+def loadBinary(stream, resolveNodes=True):
+    """
+    Load data from the binary blueprint format.
+
+    Args:
+        stream: A str or file-like object containing binary blueprint data
+        resolveNodes (bool): If False, node references are loaded
+            as UnresolvedNode instances instead of scene nodes
+    """
+    if hasattr(stream, 'read'):
+        stream = stream.read()
+    reader = _BinaryReader(stream)
+    reader.readHeader()
+    data = reader.read()
+    if resolveNodes:
+        data = resolveNodeReferences(data)[0]
+    return data
@@ -1,25 +1,40 @@
 
 import os
+import base64
+import hashlib
 import logging
-import traceback
 import tempfile
 import time
+import zlib
+from collections import Mapping
 from datetime import datetime
 from pulse.vendor import yaml
 import pymel.core as pm
 import maya.cmds as cmds
 import pymetanode as meta
 
+from .binaryFormat import dumpBinary, isBinaryData, isBinaryFilepath, loadBinary
+from .buildCache import BuildCache
 from .buildItems import BuildStep
-from .rigs import RIG_METACLASS, createRigNode
-from .serializer import PulseDumper, PulseLoader, UnsortableOrderedDict
+from .buildLog import BuildLogWriter, ParentLogHandler
+from .checkpoints import BuildCheckpoints
+from .dependencies import ActionGraph
+from .fastBuild import FastBuildContext
+from .metaIndex import findIndexedMetaNodes, updateIndexedMetaNode
+from .validation import BlueprintChecker
+from .profiling import BuildProfiler
+from .rigs import RIG_METACLASS, createRigNode, getAllRigsByName
+from .serializer import UnsortableOrderedDict, dumpYaml, loadYaml
 from .. import version
+from ..prefs import optionVarProperty
 
 __all__ = [
+    'BLUEPRINT_CHUNK_ATTR_PREFIX',
     'BLUEPRINT_METACLASS',
     'BLUEPRINT_VERSION',
     'Blueprint',
     'BlueprintBuilder',
+    'convertBlueprintFile',
 ]
 
 LOG = logging.getLogger(__name__)
@@ -28,6 +43,10 @@ LOG.level = logging.DEBUG
 BLUEPRINT_METACLASS = 'pulse_blueprint'
 BLUEPRINT_VERSION = version.__version__
 
+# the prefix of the attributes that store chunks of blueprint
+# data on a node, followed by the hash of the chunk's contents
+BLUEPRINT_CHUNK_ATTR_PREFIX = 'pulseBlueprintChunk_'
+
 
 def getDefaultConfigFile():
     """
@@ -57,6 +76,91 @@ def _loadConfig(configFile):
         return yaml.load(fp)
 
 
+def _encodeChunk(data):
+    """
+    Return (payload, hash) for a chunk of serialized blueprint data,
+    where payload is the data compressed into a str that can be
+    stored in a string attribute, and hash is a hash of the payload.
+    """
+    payload = base64.b64encode(zlib.compress(dumpBinary(data)))
+    return payload, hashlib.sha1(payload).hexdigest()
+
+
+def _decodeChunk(payload):
+    """
+    Return the serialized blueprint data of a chunk payload
+    """
+    return loadBinary(zlib.decompress(base64.b64decode(payload)))
+
+
+def _getChunkAttrs(node):
+    """
+    Return the names of all blueprint chunk attributes on a node
+    """
+    return cmds.listAttr(
+        str(node), userDefined=True,
+        string=BLUEPRINT_CHUNK_ATTR_PREFIX + '*') or []
+
+
+def _writeChunks(node, chunks):
+    """
+    Store chunks of blueprint data on a node, removing any other chunks.
+    Chunks are stored by hash, so chunks that already exist on the node
+    are not written again.
+
+    Args:
+        node: A PyNode or node name
+        chunks (dict): A dict of chunk payloads, indexed by hash
+
+    Returns:
+        The number of chunks that were written
+    """
+    nodeName = str(node)
+    existingAttrs = set(_getChunkAttrs(nodeName))
+    count = 0
+    for chunkHash, payload in chunks.items():
+        attrName = BLUEPRINT_CHUNK_ATTR_PREFIX + chunkHash
+        if attrName in existingAttrs:
+            existingAttrs.remove(attrName)
+            continue
+        cmds.addAttr(nodeName, longName=attrName, dataType='string')
+        cmds.setAttr('{0}.{1}'.format(nodeName, attrName),
+                     payload, type='string')
+        count += 1
+    # remove chunks that are no longer used
+    for attrName in existingAttrs:
+        cmds.deleteAttr(nodeName, attribute=attrName)
+    return count
+
+
+class _LazyChunkData(Mapping):
+    """
+    The serialized data of a step that is stored as a chunk on a node,
+    which is only read and decompressed when it is first accessed.
+    """
+
+    def __init__(self, node, chunkHash):
+        self.node = pm.PyNode(node)
+        self.chunkHash = chunkHash
+        self._data = None
+
+    def getData(self):
+        if self._data is None:
+            payload = cmds.getAttr('{0}.{1}{2}'.format(
+                self.node, BLUEPRINT_CHUNK_ATTR_PREFIX, self.chunkHash))
+            self._data = _decodeChunk(payload)
+        return self._data
+
+    def __getitem__(self, key):
+        return self.getData()[key]
+
+    def __iter__(self):
+        return iter(self.getData())
+
+    def __len__(self):
+        return len(self.getData())
+
+
 class Blueprint(object):
     """
     A Blueprint contains all the information necessary to build
@@ -64,13 +168,23 @@ class Blueprint(object):
     and an ordered hierarchy of BuildActions.
     """
 
+    # whether to save blueprints to nodes in compressed chunks by default,
+    # so that only modified top-level steps are written, see `saveToNode`
+    useChunkedNodeStorage = optionVarProperty(
+        'pulse.blueprints.useChunkedNodeStorage', True)
+
     @staticmethod
-    def fromData(data):
+    def fromData(data, lazy=False):
         """
         Create a Blueprint instance from serialized data
+
+        Args:
+            data (dict): Serialized Blueprint data
+            lazy (bool): If True, defer deserializing BuildSteps
+                until they are accessed, see `BuildStep.deserialize`
         """
         blueprint = Blueprint()
-        blueprint.deserialize(data)
+        blueprint.deserialize(data, lazy=lazy)
         return blueprint
 
     @staticmethod
@@ -115,7 +229,7 @@ class Blueprint(object):
         """
         Return all nodes in the scene with Blueprint data
         """
-        return meta.findMetaNodes(BLUEPRINT_METACLASS)
+        return findIndexedMetaNodes(BLUEPRINT_METACLASS)
 
     def __init__(self):
         # the name of the rig this blueprint represents
@@ -128,6 +242,9 @@ class Blueprint(object):
         self.configFile = getDefaultConfigFile()
         # the config, automatically loaded when calling `getConfig`
         self.config = None
+        # the encoded chunks of the last chunked save, indexed by the
+        # id of each step's serialized data, see `saveToNode`
+        self._chunkCache = {}
 
     def serialize(self):
         data = UnsortableOrderedDict()
@@ -136,18 +253,34 @@ class Blueprint(object):
         data['steps'] = self.rootStep.serialize()
         return data
 
-    def deserialize(self, data):
+    def deserialize(self, data, lazy=False):
         """
+        Args:
+            data (dict): Serialized Blueprint data
+            lazy (bool): If True, defer deserializing BuildSteps
+                until they are accessed, see `BuildStep.deserialize`
+
         Returns:
             True if the data was deserialized successfully
         """
         self.version = data.get('version', None)
         self.rigName = data.get('rigName', None)
-        self.rootStep.deserialize(data.get('steps', {'name': 'Root'}))
+        self.rootStep.deserialize(
+            data.get('steps', {'name': 'Root'}), lazy=lazy)
         return True
 
-    def loadFromFile(self, filepath):
+    def loadFromFile(self, filepath, resolveNodes=True, lazy=False):
         """
+        Load the Blueprint from a yaml or binary file.
+        The format is detected automatically.
+
+        Args:
+            filepath (str): The path to the blueprint file
+            resolveNodes (bool): If False, node references are loaded
+                as UnresolvedNode instances instead of scene nodes
+            lazy (bool): If True, defer deserializing BuildSteps
+                until they are accessed, see `BuildStep.deserialize`
+
         Returns:
             True if the load was successful
         """
@@ -155,14 +288,22 @@ class Blueprint(object):
 
         try:
             with open(filepath, 'rb') as fp:
-                data = yaml.load(fp, Loader=PulseLoader)
+                header = fp.read(4)
+                fp.seek(0)
+                if isBinaryData(header):
+                    data = loadBinary(fp, resolveNodes=resolveNodes)
+                else:
+                    data = loadYaml(fp, resolveNodes=resolveNodes)
         except IOError:
             return False
 
-        return self.deserialize(data)
+        return self.deserialize(data, lazy=lazy)
 
     def saveToFile(self, filepath):
         """
+        Save the Blueprint to a file. Uses the binary format if the
+        file has the binary blueprint extension, otherwise yaml.
+
         Returns:
             True if the save was successful
         """
@@ -172,49 +313,106 @@ class Blueprint(object):
 
         LOG.debug("Saving blueprint: {0}".format(filepath))
 
+        self._writeFile(filepath)
+        return True
+
+    def _writeFile(self, filepath):
         data = self.serialize()
         with open(filepath, 'wb') as fp:
-            yaml.dump(data, fp, default_flow_style=False, Dumper=PulseDumper)
-
-        return True
+            if isBinaryFilepath(filepath):
+                dumpBinary(data, fp)
+            else:
+                dumpYaml(data, fp)
 
     def dumpYaml(self):
         data = self.serialize()
-        return yaml.dump(data, default_flow_style=False, Dumper=PulseDumper)
+        return dumpYaml(data)
 
-    def saveToNode(self, node, create=False):
+    def saveToNode(self, node, create=False, chunked=None):
         """
         Save this Blueprint to a node, creating a new node if desired.
 
         Args:
             node (PyNode or str): A node or node name
             create (bool): If true, create the node if necessary
+            chunked (bool): If true, store each top-level step as a
+                separate compressed chunk, and only write the chunks
+                that have changed since they were last saved to the node.
+                Defaults to `useChunkedNodeStorage`.
 
         Returns:
             The node on which the blueprint was saved
         """
         if create and not cmds.objExists(node):
             node = cmds.createNode('network', n=node)
-        data = self.serialize()
+        if chunked is None:
+            chunked = self.useChunkedNodeStorage
+        if chunked:
+            data, chunks = self._serializeChunks()
+        else:
+            data, chunks = self.serialize(), {}
         st = time.time()
         meta.setMetaData(node, BLUEPRINT_METACLASS, data, replace=True)
+        updateIndexedMetaNode(node)
+        count = _writeChunks(node, chunks)
         et = time.time()
-        LOG.debug('blueprint save time: {0}s'.format(et - st))
+        LOG.debug('blueprint save time: {0}s, wrote {1} of {2} '
+                  'chunks'.format(et - st, count, len(chunks)))
         return node
 
-    def loadFromNode(self, node):
+    def _serializeChunks(self):
+        """
+        Return the serialized data of this Blueprint, with the data
+        of each top-level step replaced by a hash of its chunk,
+        and a dict of all chunk payloads indexed by hash.
+        """
+        stepsData = self.rootStep.serialize()
+        # serialized step data is cached until modified, so
+        # unmodified steps don't need to be encoded again
+        chunkCache = {}
+        chunkHashes = []
+        chunks = {}
+        for childData in stepsData.get('children', []):
+            cached = self._chunkCache.get(id(childData))
+            if cached is None or cached[0] is not childData:
+                payload, chunkHash = _encodeChunk(childData)
+                cached = (childData, chunkHash, payload)
+            chunkCache[id(childData)] = cached
+            chunkHashes.append(cached[1])
+            chunks[cached[1]] = cached[2]
+        self._chunkCache = chunkCache
+
+        rootData = UnsortableOrderedDict(
+            [(k, v) for k, v in stepsData.items() if k != 'children'])
+        data = UnsortableOrderedDict()
+        data['version'] = self.version
+        data['rigName'] = self.rigName
+        data['steps'] = rootData
+        data['chunks'] = chunkHashes
+        return data, chunks
+
+    def loadFromNode(self, node, lazy=False):
         """
-        Load Blueprint data from a node.
+        Load Blueprint data from a node. Supports data saved
+        as a single string or in chunks, see `saveToNode`.
 
         Args:
             node: A PyNode or node name
+            lazy (bool): If True, defer deserializing BuildSteps
+                until they are accessed, see `BuildStep.deserialize`.
+                Chunks are also only decompressed when accessed.
         """
         if not Blueprint.isBlueprintNode(node):
             LOG.warning(
                 "Node does not contain Blueprint data: {0}".format(node))
             return
         data = meta.getMetaData(node, BLUEPRINT_METACLASS)
-        self.deserialize(data)
+        if 'chunks' in data:
+            stepsData = dict(data.get('steps', {'name': 'Root'}))
+            stepsData['children'] = [
+                _LazyChunkData(node, h) for h in data['chunks']]
+            data = dict(data, steps=stepsData)
+        self.deserialize(data, lazy=lazy)
 
     def actionIterator(self):
         """
@@ -278,6 +476,29 @@ class Blueprint(object):
             self.config = _loadConfig(self.configFile)
 
 
+def convertBlueprintFile(srcFile, dstFile):
+    """
+    Convert a blueprint file between the yaml and binary formats.
+    The source format is detected automatically, and the destination
+    format is determined by the destination file extension.
+    Node references are preserved as-is, the referenced nodes
+    don't need to exist in the scene. BuildActions must be registered
+    so that the output is ordered the same as a normal save.
+
+    Args:
+        srcFile (str): The path to an existing blueprint file
+        dstFile (str): The path of the file to write
+
+    Returns:
+        True if the conversion was successful
+    """
+    blueprint = Blueprint()
+    if not blueprint.loadFromFile(srcFile, resolveNodes=False):
+        return False
+    blueprint._writeFile(dstFile)
+    return True
+
+
 class BlueprintBuilder(object):
     """
     The Blueprint Builder is responsible for turning a Blueprint
@@ -285,7 +506,10 @@ class BlueprintBuilder(object):
     the Blueprint itself.
     """
 
-    def __init__(self, blueprint, blueprintFile=None, debug=False, logDir=None):
+    def __init__(self, blueprint, blueprintFile=None, debug=False, logDir=None,
+                 profile=False, checkpoints=False, checkpointSteps=None,
+                 batchActions=False, check=False, fastBuild=False,
+                 jsonLog=False, cache=False):
         """
         Initialize a BlueprintBuilder
 
@@ -294,6 +518,34 @@ class BlueprintBuilder(object):
             blueprintFile: An optional string path to the maya file that contains
                 the blueprint for the built rig. This path is stored in the built
                 rig for convenience.
+            profile (bool): If true, profile each action and write a trace
+                and summary of the results to the log directory,
+                see `BuildProfiler`
+            checkpoints (bool): If true, save a scene snapshot after top-level
+                steps, and resume from the latest valid snapshot instead of
+                building from scratch, see `BuildCheckpoints`. Requires a
+                blueprintFile that exists on disk, and a scene without
+                unsaved changes.
+            checkpointSteps (list of str): The names of the top-level steps
+                after which to save snapshots, defaults to all top-level steps
+            batchActions (bool): If true, run the actions of each top-level
+                step in batches of actions that don't depend on each other,
+                reporting progress once per batch, see `ActionGraph`
+            check (bool): If true, validate all actions before building,
+                and cancel the build if any problems are found,
+                see `BlueprintChecker`
+            fastBuild (bool): If true, suspend undo, viewport refresh,
+                Pulse's Maya callbacks and evaluation manager rebuilds
+                for the duration of the build, see `FastBuildContext`.
+                Clears the undo queue.
+            jsonLog (bool): If true, also write the path, action id,
+                duration and error of each action as json lines to
+                a '.jsonl' file next to the build log
+            cache (bool): If true, open the cached result of an identical
+                earlier build instead of building, and cache the result
+                of successful builds, see `BuildCache`. Requires a
+                blueprintFile that exists on disk, and a scene without
+                unsaved changes.
 
         """
         if not isinstance(blueprint, Blueprint):
@@ -305,20 +557,58 @@ class BlueprintBuilder(object):
         self.debug = debug
 
         self.log = logging.getLogger('pulse.build')
+        # action timings are logged at debug level, and must reach
+        # the log files regardless of the level of parent loggers.
+        # Only warnings are passed on to the parent loggers, so that
+        # the console doesn't slow down each action
+        self.log.setLevel(logging.DEBUG)
+        self.log.propagate = False
         # the output directory for log files
         dateStr = datetime.now().strftime('%Y-%m-%d_%H%M%S')
         if not logDir:
             logDir = tempfile.gettempdir()
-        logFile = os.path.join(logDir, 'pulse_build_{0}_{1}.log'.format(
-            self.blueprint.rigName, dateStr))
-        self.fileHandler = logging.FileHandler(logFile)
-        self.fileHandler.setLevel(logging.DEBUG)
-        logFormatter = logging.Formatter(
-            '%(asctime)s %(levelname)s %(name)s: %(message)s')
-        self.fileHandler.setFormatter(logFormatter)
-        self.log.handlers = [self.fileHandler]
+        self.logDir = logDir
+        self.logName = 'pulse_build_{0}_{1}'.format(
+            self.blueprint.rigName, dateStr)
+        logFile = os.path.join(logDir, self.logName + '.log')
+        jsonFile = None
+        if jsonLog:
+            jsonFile = os.path.join(logDir, self.logName + '.jsonl')
+        # log files are written on a background thread during the build
+        self.logWriter = BuildLogWriter(logFile, jsonFile)
+        self.log.handlers = [
+            self.logWriter.handler, ParentLogHandler(self.log)]
+
+        # the profiler, if profiling is enabled
+        self.profiler = BuildProfiler() if profile else None
+
+        # the checkpoints to save and restore, if enabled
+        self.checkpoints = None
+        if checkpoints:
+            self.checkpoints = BuildCheckpoints(self.blueprint.rigName)
+        self.checkpointSteps = checkpointSteps
+        # the index of the top-level step after which the build resumed
+        # from a checkpoint, or -1 if the build started from scratch
+        self.resumeStepIndex = -1
+
+        # the cache of built rigs, if enabled
+        self.cache = BuildCache() if cache else None
+        # the cache key of this build, if caching is enabled
+        self.cacheKey = None
+        # whether the build was restored from the cache
+        self.isCacheHit = False
+
+        self.batchActions = batchActions
+        self.check = check
+        # the dependency graph of all actions, when batching actions
+        self.actionGraph = None
+        # the suspended scene state, if fast building is enabled
+        self.fastBuildContext = FastBuildContext(self.log) if fastBuild \
+            else None
 
         self.errors = []
+        # the (index, total) of the last progress report
+        self.progress = (0, 0)
         self.generator = None
         self.isStarted = False
         self.isFinished = False
@@ -327,6 +617,8 @@ class BlueprintBuilder(object):
         self.startTime = None
         self.endTime = None
         self.elapsedTime = 0
+        # the total time spent running actions
+        self.actionTime = 0
 
     def start(self, run=True):
         """
@@ -351,6 +643,10 @@ class BlueprintBuilder(object):
         self.isStarted = True
         self.onStart()
 
+        if self.check and not self.runCheck():
+            self.cancel()
+            return False
+
         # start the build generator
         self.generator = self.buildGenerator()
 
@@ -359,12 +655,17 @@ class BlueprintBuilder(object):
 
         return True
 
-    def run(self):
+    def run(self, timeout=None):
         """
         Continue the current build
 
         The builder must be started by calling `start` first
         before this can be called
+
+        Args:
+            timeout (float): If given, pause the build after the first
+                action that ends once this many seconds have passed,
+                so that it can be continued later by calling `run` again
         """
         if self.isRunning:
             self.log.warning("Builder is already running")
@@ -377,22 +678,50 @@ class BlueprintBuilder(object):
                 "Cannot run/continue a finished or cancelled build")
             return
         self.isRunning = True
+        endTime = time.time() + timeout if timeout is not None else None
 
-        while True:
-            iterResult = self.generator.next()
-            # handle the result of the build iteration
-            if iterResult.get('finish'):
-                self.finish()
-            # report progress
-            self.onProgress(iterResult['index'], iterResult['total'])
-            # check for user cancel
-            if self.checkCancel():
-                self.cancel()
-            # check if we should stop running
-            if self.isFinished or self.isCancelled or self.checkPause():
-                break
+        try:
+            while True:
+                iterResult = self.generator.next()
+                # handle the result of the build iteration
+                if iterResult.get('finish'):
+                    self.finish()
+                # report progress
+                self.progress = (iterResult['index'], iterResult['total'])
+                self.onProgress(iterResult['index'], iterResult['total'])
+                # check for user cancel
+                if self.checkCancel():
+                    self.cancel()
+                # check if we should stop running
+                if self.isFinished or self.isCancelled or self.checkPause():
+                    break
+                if endTime is not None and time.time() >= endTime:
+                    break
+        except Exception:
+            # never leave the scene suspended after an unexpected error
+            self._restoreSceneState()
+            self.log.error("Build failed unexpectedly", exc_info=True)
+            self.logWriter.stop()
+            raise
+        finally:
+            self.isRunning = False
+
+    def runCheck(self):
+        """
+        Validate all actions of the blueprint, logging any problems found.
 
-        self.isRunning = False
+        Returns:
+            True if no problems were found
+        """
+        results = BlueprintChecker(self.blueprint).run()
+        if results.hasErrors():
+            results.logErrors(self.log)
+            self.errors.extend([error for _, _, error in results.errors])
+            self.log.warning(
+                "Check found {0} error(s) in {1} actions, cancelling "
+                "build".format(len(results.errors), results.actionCount))
+            return False
+        return True
 
     def checkPause(self):
         """
@@ -426,11 +755,16 @@ class BlueprintBuilder(object):
         """
         # record time
         self.startTime = time.time()
+        self.logWriter.start()
         # log start of build
         self.log.info("Started building rig: {0}".format(
             self.blueprint.rigName))
         if self.debug:
             self.log.info("Debug is enabled")
+        if self.profiler:
+            self.profiler.start()
+        if self.fastBuildContext:
+            self.fastBuildContext.suspend()
 
     def onProgress(self, index, total):
         """
@@ -447,9 +781,11 @@ class BlueprintBuilder(object):
         """
         Called when the build has completely finished.
         """
+        self._restoreSceneState()
         # record time
         self.endTime = time.time()
         self.elapsedTime = self.endTime - self.startTime
+        self._writeProfile()
 
         errorCount = len(self.errors)
         # log results
@@ -460,9 +796,16 @@ class BlueprintBuilder(object):
             duration=self.elapsedTime,
             scenePath=self.blueprintFile,
         ))
-        self.fileHandler.close()
+        # log where the time went, to compare fast and normal builds
+        self.log.info(
+            "Timing: actions {0:.3f}, other {1:.3f} seconds{2}".format(
+                self.actionTime, self.elapsedTime - self.actionTime,
+                ', fast build' if self.fastBuildContext else ''))
+        self.logWriter.stop()
 
         # show results with in view message
+        if cmds.about(batch=True):
+            return
         if errorCount:
             pm.inViewMessage(amg='Build Finished with {0} error(s)'.format(errorCount),
                              pos='topCenter', backColor=0xaa8336,
@@ -474,7 +817,35 @@ class BlueprintBuilder(object):
         """
         Called if the build was cancelled
         """
-        pass
+        self._restoreSceneState()
+        self._writeProfile()
+        self.log.warning("Cancelled build of rig: {0}".format(
+            self.blueprint.rigName))
+        self.logWriter.stop()
+
+    def _restoreSceneState(self):
+        """
+        Restore the scene features that were suspended, if fast
+        building is enabled
+        """
+        if self.fastBuildContext:
+            self.fastBuildContext.restore()
+
+    def _writeProfile(self):
+        """
+        Stop the profiler, if profiling is enabled, and write its results
+        """
+        if not self.profiler or not self.profiler.isRunning:
+            return
+        self.profiler.stop()
+        basePath = os.path.join(self.logDir, self.logName + '_profile')
+        try:
+            traceFile, summaryFile = self.profiler.writeResults(basePath)
+        except (IOError, OSError) as error:
+            self.log.error("Failed to write build profile: {0}".format(error))
+        else:
+            self.log.info("Wrote build profile: {0}, {1}".format(
+                traceFile, summaryFile))
 
     def _onError(self, step, action, error):
         self.errors.append(error)
@@ -493,11 +864,173 @@ class BlueprintBuilder(object):
             # when debugging, show stack trace
             self.log.error('{0}'.format(
                 step.getFullPath()), exc_info=True)
-            traceback.print_exc()
         else:
             self.log.error('{0} ({1}): {2}'.format(
                 step.getFullPath(), action.getActionId(), error))
 
+    def _getActionBatches(self, allActions):
+        """
+        Return the order in which to run actions, as a list of batches
+        of action indeces, where each batch belongs to one top-level step.
+
+        Args:
+            allActions (list): A list of (topIndex, step, action) tuples
+        """
+        if not self.batchActions:
+            return [[index] for index in range(len(allActions))]
+
+        self.actionGraph = ActionGraph(
+            [(step, action) for _, step, action in allActions])
+        # top-level steps are always built in order
+        stepIndeces = []
+        for index, (topIndex, _, _) in enumerate(allActions):
+            if not stepIndeces or allActions[stepIndeces[-1][0]][0] != topIndex:
+                stepIndeces.append([])
+            stepIndeces[-1].append(index)
+        batches = []
+        for indeces in stepIndeces:
+            batches.extend(self.actionGraph.getBatches(indeces))
+        self.log.info("Running {0} actions in {1} batches".format(
+            len(allActions), len(batches)))
+        return batches
+
+    def _restoreCachedBuild(self):
+        """
+        Open the cached result of this build if there is one,
+        and store the cache key for caching the result otherwise.
+
+        Returns:
+            True if the cached build was restored
+        """
+        if not self.blueprintFile or not os.path.isfile(self.blueprintFile):
+            self.log.warning(
+                "Caching requires a saved blueprint file, "
+                "building without cache")
+            return False
+        if cmds.file(q=True, modified=True):
+            # the key only identifies the saved file, and restoring
+            # a cached build would discard the unsaved changes
+            self.log.warning(
+                "Scene has unsaved changes, building without cache")
+            return False
+        keyStartTime = time.time()
+        self.cacheKey = BuildCache.getKey(self.blueprint, self.blueprintFile)
+        self.log.debug("Build cache key: {0} ({1:.3f} seconds)".format(
+            self.cacheKey, time.time() - keyStartTime))
+        if not self.cache.has(self.cacheKey):
+            return False
+        try:
+            self.cache.restore(self.cacheKey, self.blueprintFile)
+        except RuntimeError as error:
+            self.log.warning(
+                "Failed to restore cached build: {0}".format(error))
+            return False
+        rigs = getAllRigsByName([self.blueprint.rigName])
+        self.rig = rigs[0] if rigs else None
+        self.log.info("Restored cached build: {0}".format(
+            self.cache.getPath(self.cacheKey)))
+        return True
+
+    def _saveCachedBuild(self):
+        """
+        Save the result of this build to the cache, unless it failed
+        """
+        if self.errors:
+            return
+        try:
+            self.cache.put(self.cacheKey, self.blueprint.rigName,
+                           self.blueprintFile)
+        except (RuntimeError, IOError, OSError) as error:
+            self.log.warning("Failed to cache build: {0}".format(error))
+
+    def _getCheckpointHashes(self):
+        """
+        Return the step hashes for saving and restoring checkpoints,
+        or None if checkpoints cannot be used for this build.
+        """
+        if cmds.file(q=True, modified=True):
+            # the source hash only identifies the saved file, and
+            # restoring a checkpoint would discard the unsaved changes
+            self.log.warning(
+                "Scene has unsaved changes, building without checkpoints")
+            return None
+        sourceHash = BuildCheckpoints.getSourceHash(self.blueprintFile)
+        if not sourceHash:
+            self.log.warning(
+                "Checkpoints require a saved blueprint file, "
+                "building without checkpoints")
+            return None
+        return BuildCheckpoints.getStepHashes(self.blueprint, sourceHash)
+
+    def _restoreCheckpoint(self, stepHashes):
+        """
+        Restore the latest checkpoint that is valid for this build.
+
+        Returns:
+            The index of the top-level step after which the checkpoint
+            was saved, or -1 if no checkpoint was restored.
+        """
+        index = self.checkpoints.findLatest(stepHashes)
+        if index < 0:
+            return -1
+        # node references in the blueprint must be resolved again
+        # in the restored scene, they are stored by UUID
+        blueprintData = dumpBinary(self.blueprint.serialize())
+        try:
+            self.checkpoints.restore(stepHashes[index], self.blueprintFile)
+        except RuntimeError as error:
+            self.log.warning(
+                "Failed to restore checkpoint: {0}".format(error))
+            return -1
+        rigs = getAllRigsByName([self.blueprint.rigName])
+        if not rigs:
+            self.log.warning(
+                "Failed to find rig in checkpoint, building from scratch")
+            cmds.file(self.blueprintFile, open=True, force=True)
+            self._reloadBlueprint(blueprintData)
+            return -1
+        self.rig = rigs[0]
+        self._reloadBlueprint(blueprintData)
+        self.log.info("Resuming build after step: {0}".format(
+            self.blueprint.rootStep.getChildAt(index).name))
+        return index
+
+    def _reloadBlueprint(self, blueprintData):
+        """
+        Replace the blueprint with one deserialized from binary data
+        after opening a scene, so that its node references are resolved
+        in the new scene, keeping the blueprint's config.
+        """
+        blueprint = Blueprint.fromData(loadBinary(blueprintData))
+        blueprint.configFile = self.blueprint.configFile
+        blueprint.config = self.blueprint.config
+        self.blueprint = blueprint
+
+    def _saveCheckpoint(self, stepHashes, topSteps, index):
+        """
+        Save a checkpoint after a top-level step, if checkpoints
+        are enabled for that step.
+
+        Returns:
+            The step hashes to use for saving later checkpoints, or None
+            if no more checkpoints should be saved during this build.
+        """
+        if index <= self.resumeStepIndex:
+            # the step was restored, not built
+            return stepHashes
+        if self.errors:
+            # don't save the results of a failed build
+            return None
+        if (self.checkpointSteps is not None and
+                topSteps[index].name not in self.checkpointSteps):
+            return stepHashes
+        try:
+            self.checkpoints.save(stepHashes[index])
+        except (RuntimeError, IOError, OSError) as error:
+            self.log.warning("Failed to save checkpoint: {0}".format(error))
+            return None
+        return stepHashes
+
     def buildGenerator(self):
         """
         This is the main iterator for performing all build operations.
@@ -508,37 +1041,95 @@ class BlueprintBuilder(object):
 
         yield dict(index=currentActionIndex, total=totalActionCount)
 
-        # create a new rig
-        self.rig = createRigNode(self.blueprint.rigName)
-        # add some additional meta data
-        meta.updateMetaData(self.rig, RIG_METACLASS, dict(
-            version=BLUEPRINT_VERSION,
-            blueprintFile=self.blueprintFile,
-        ))
+        if self.cache and self._restoreCachedBuild():
+            self.isCacheHit = True
+            yield dict(index=0, total=0, finish=True)
+            return
+
+        stepHashes = None
+        if self.checkpoints:
+            stepHashes = self._getCheckpointHashes()
+            if stepHashes:
+                self.resumeStepIndex = self._restoreCheckpoint(stepHashes)
+
+        if self.resumeStepIndex < 0:
+            # create a new rig
+            self.rig = createRigNode(self.blueprint.rigName)
+            # add some additional meta data
+            meta.updateMetaData(self.rig, RIG_METACLASS, dict(
+                version=BLUEPRINT_VERSION,
+                blueprintFile=self.blueprintFile,
+            ))
 
         yield dict(index=currentActionIndex, total=totalActionCount)
 
-        # recursively iterate through all build actions
-        allActions = list(self.blueprint.actionIterator())
+        # recursively iterate through all build actions, grouped
+        # by top-level step, skipping steps restored from a checkpoint
+        topSteps = self.blueprint.rootStep.children
+        allActions = []
+        for topIndex, topStep in enumerate(topSteps):
+            for step in topStep.childIterator():
+                for action in step.actionIterator():
+                    allActions.append((topIndex, step, action))
         totalActionCount = len(allActions)
-        for currentActionIndex, (step, action) in enumerate(allActions):
-            # TODO: yield actions in groups so we can know how many are in each step?
-            path = step.getFullPath()
-            self.log.info(
-                '[{0}/{1}] {path}'.format(currentActionIndex + 1, totalActionCount, path=path))
-
-            # run the action
-            action.rig = self.rig
-            try:
-                action.run()
-            except Exception as error:
-                self._onError(step, action, error)
+        lastTopIndex = self.resumeStepIndex
+        for batch in self._getActionBatches(allActions):
+            topIndex = allActions[batch[0]][0]
+            if topIndex <= self.resumeStepIndex:
+                currentActionIndex += len(batch)
+                continue
+            if stepHashes and topIndex != lastTopIndex:
+                # finished all actions of the previous top-level step
+                stepHashes = self._saveCheckpoint(
+                    stepHashes, topSteps, lastTopIndex)
+            lastTopIndex = topIndex
+
+            for actionIndex in batch:
+                _, step, action = allActions[actionIndex]
+                currentActionIndex += 1
+                path = step.getFullPath()
+                self.log.info('[{0}/{1}] {path}'.format(
+                    currentActionIndex, totalActionCount, path=path))
+
+                # run the action
+                action.rig = self.rig
+                if self.profiler:
+                    self.profiler.beginAction(path, action.getActionId())
+                actionStartTime = time.time()
+                actionError = None
+                try:
+                    action.run()
+                except Exception as error:
+                    actionError = error
+                    self._onError(step, action, error)
+                duration = time.time() - actionStartTime
+                self.actionTime += duration
+                self.log.debug('{path} took {0:.3f} seconds'.format(
+                    duration, path=path), extra=dict(action=dict(
+                        path=path,
+                        actionId=action.getActionId(),
+                        duration=duration,
+                        error=str(actionError) if actionError else None,
+                    )))
+                if self.profiler:
+                    self.profiler.endAction()
 
             # return progress
-            yield dict(index=currentActionIndex, total=totalActionCount)
+            yield dict(index=currentActionIndex - 1, total=totalActionCount)
+
+        if stepHashes:
+            stepHashes = self._saveCheckpoint(
+                stepHashes, topSteps, lastTopIndex)
+        if stepHashes:
+            # only keep the checkpoints of this build
+            self.checkpoints.clean(stepHashes)
 
         # delete all blueprint nodes
         for node in Blueprint.getAllBlueprintNodes():
             pm.delete(node)
 
-        yield dict(index=currentActionIndex, total=totalActionCount, finish=True)
+        if self.cacheKey:
+            self._saveCachedBuild()
+
+        yield dict(index=max(currentActionIndex - 1, 0),
+                   total=totalActionCount, finish=True)
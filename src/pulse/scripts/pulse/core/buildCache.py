@@ -0,0 +1,270 @@
+"""
+A cache of built rigs, keyed by the contents of everything that
+went into the build, so unchanged rigs don't have to be rebuilt.
+"""
+
+import os
+import json
+import time
+import hashlib
+import logging
+import tempfile
+
+import maya.cmds as cmds
+
+from .binaryFormat import dumpBinary
+from .checkpoints import saveSceneCopy
+from .. import version
+
+__all__ = [
+    'BuildCache',
+]
+
+LOG = logging.getLogger(__name__)
+
+# hashes of file contents, indexed by (path, size, mtime)
+_FILE_HASHES = {}
+
+
+def _getFileHash(path):
+    """
+    Return a hash of the contents of a file, or None if it doesn't exist.
+    Hashes are reused until the file's size or modification time changes.
+    """
+    if not os.path.isfile(path):
+        return None
+    stat = os.stat(path)
+    statKey = (os.path.normcase(os.path.realpath(path)),
+               stat.st_size, stat.st_mtime)
+    result = _FILE_HASHES.get(statKey)
+    if result is None:
+        fileHash = hashlib.sha1()
+        with open(path, 'rb') as fp:
+            for chunk in iter(lambda: fp.read(1 << 20), b''):
+                fileHash.update(chunk)
+        result = _FILE_HASHES[statKey] = fileHash.hexdigest()
+    return result
+
+
+class BuildCache(object):
+    """
+    A directory of built rig scenes, each saved in a maya binary file
+    along with a json file of info about the entry, such as when it
+    was last used. The least recently used entries are removed when
+    the cache exceeds its size limits.
+
+    Entries are keyed by a hash of the blueprint, the contents of the
+    blueprint scene file and any other source files read by actions,
+    see `BuildAction.getSourceFiles`, and the Pulse version. Only saved
+    changes to source files are detected, so builds of a modified scene
+    don't use the cache.
+    """
+
+    def __init__(self, cacheDir=None, maxSize=2 << 30, maxEntries=20):
+        """
+        Args:
+            cacheDir (str): The directory in which to store built rigs,
+                defaults to a 'pulse_build_cache' directory in the
+                temp directory
+            maxSize (int): The maximum total size of all entries in bytes
+            maxEntries (int): The maximum number of entries
+        """
+        if not cacheDir:
+            cacheDir = os.path.join(
+                tempfile.gettempdir(), 'pulse_build_cache')
+        self.cacheDir = cacheDir
+        self.maxSize = maxSize
+        self.maxEntries = maxEntries
+
+    def __repr__(self):
+        return "<BuildCache {0}>".format(self.cacheDir)
+
+    @staticmethod
+    def getSourceFiles(blueprint, blueprintFile):
+        """
+        Return a sorted list of all source files of a build, including
+        the blueprint file and all files read by actions.
+        """
+        paths = set([blueprintFile])
+        for step, action in blueprint.actionIterator():
+            try:
+                paths.update(action.getSourceFiles())
+            except Exception as error:
+                LOG.warning("Failed to get source files of {0}: {1}".format(
+                    step.getFullPath(), error))
+        return sorted([os.path.normcase(os.path.abspath(p)) for p in paths])
+
+    @classmethod
+    def getKey(cls, blueprint, blueprintFile):
+        """
+        Return the cache key for building a blueprint.
+
+        Args:
+            blueprint (Blueprint): The blueprint being built
+            blueprintFile (str): The path of the blueprint scene
+        """
+        key = hashlib.sha1(version.__version__)
+        key.update(dumpBinary(blueprint.serialize()))
+        for path in cls.getSourceFiles(blueprint, blueprintFile):
+            key.update('|{0}|{1}'.format(path, _getFileHash(path)))
+        return key.hexdigest()
+
+    def getPath(self, key):
+        """
+        Return the path of the built rig scene for a key
+        """
+        return os.path.join(self.cacheDir, key + '.mb')
+
+    def _getInfoPath(self, key):
+        return os.path.join(self.cacheDir, key + '.json')
+
+    def _readInfo(self, key):
+        try:
+            with open(self._getInfoPath(key), 'r') as fp:
+                return json.load(fp)
+        except (IOError, ValueError):
+            return None
+
+    def _writeInfo(self, key, info):
+        with open(self._getInfoPath(key), 'w') as fp:
+            json.dump(info, fp, indent=2)
+
+    def has(self, key):
+        """
+        Return True if the cache has an entry for a key
+        """
+        return os.path.isfile(self.getPath(key))
+
+    def get(self, key):
+        """
+        Return the path of the built rig scene for a key, marking the
+        entry as recently used, or None if there is no entry.
+        """
+        if not self.has(key):
+            return None
+        info = self._readInfo(key) or dict(key=key)
+        info['lastUsed'] = time.time()
+        info['hitCount'] = info.get('hitCount', 0) + 1
+        try:
+            self._writeInfo(key, info)
+        except IOError as error:
+            LOG.warning("Failed to update cache entry: {0}".format(error))
+        return self.getPath(key)
+
+    def put(self, key, rigName=None, blueprintFile=None):
+        """
+        Save the current scene as the entry for a key, then remove
+        the least recently used entries if the cache is too large.
+
+        Returns:
+            The path of the saved scene
+        """
+        path = self.getPath(key)
+        saveSceneCopy(path)
+        now = time.time()
+        self._writeInfo(key, dict(
+            key=key,
+            rigName=rigName,
+            blueprintFile=blueprintFile,
+            version=version.__version__,
+            created=now,
+            lastUsed=now,
+            hitCount=0,
+        ))
+        LOG.debug("Cached build: {0}".format(path))
+        self.evict()
+        return path
+
+    def restore(self, key, sceneName):
+        """
+        Open the built rig scene for a key, and rename the scene
+        so that it will not be saved over the cache entry.
+
+        Returns:
+            True if the entry was restored
+        """
+        path = self.get(key)
+        if not path:
+            return False
+        cmds.file(path, open=True, force=True)
+        cmds.file(rename=sceneName)
+        LOG.debug("Restored cached build: {0}".format(path))
+        return True
+
+    def getEntries(self):
+        """
+        Return info about all entries, ordered from most
+        to least recently used.
+
+        Returns:
+            A list of dicts containing the key, rigName, blueprintFile,
+            version, created and lastUsed times, hitCount, and size
+            in bytes of each entry
+        """
+        if not os.path.isdir(self.cacheDir):
+            return []
+        entries = []
+        for fileName in os.listdir(self.cacheDir):
+            key, ext = os.path.splitext(fileName)
+            if ext != '.mb' or key.endswith('.tmp'):
+                continue
+            info = self._readInfo(key) or dict(key=key)
+            path = self.getPath(key)
+            try:
+                info['size'] = os.path.getsize(path)
+            except OSError:
+                continue
+            if 'lastUsed' not in info:
+                info['lastUsed'] = os.path.getmtime(path)
+            entries.append(info)
+        entries.sort(key=lambda info: info['lastUsed'], reverse=True)
+        return entries
+
+    def getSize(self):
+        """
+        Return the total size of all entries in bytes
+        """
+        return sum([info['size'] for info in self.getEntries()])
+
+    def remove(self, key):
+        """
+        Remove the entry for a key
+        """
+        for path in (self.getPath(key), self._getInfoPath(key)):
+            if os.path.isfile(path):
+                try:
+                    os.remove(path)
+                except OSError as error:
+                    LOG.warning(
+                        "Failed to remove cache entry: {0}".format(error))
+
+    def evict(self):
+        """
+        Remove the least recently used entries until the
+        cache is within its size limits.
+
+        Returns:
+            The keys of the removed entries
+        """
+        totalSize = 0
+        keptCount = 0
+        removed = []
+        for info in self.getEntries():
+            # always keep the most recently used entry
+            if keptCount > 0 and (totalSize + info['size'] > self.maxSize or
+                                  keptCount >= self.maxEntries):
+                self.remove(info['key'])
+                removed.append(info['key'])
+            else:
+                totalSize += info['size']
+                keptCount += 1
+        if removed:
+            LOG.debug("Evicted {0} cache entries".format(len(removed)))
+        return removed
+
+    def clear(self):
+        """
+        Remove all entries
+        """
+        for info in self.getEntries():
+            self.remove(info['key'])
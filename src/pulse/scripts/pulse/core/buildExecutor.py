@@ -0,0 +1,301 @@
+"""
+Running builds in small time slices during Maya idle events,
+keeping the UI responsive while building.
+"""
+
+import logging
+import sys
+import maya.cmds as cmds
+import maya.mel as mel
+import maya.OpenMaya as api
+
+__all__ = [
+    'BuildExecutor',
+]
+
+LOG = logging.getLogger(__name__)
+
+
+class BuildExecutor(object):
+    """
+    Runs a `BlueprintBuilder` in time slices during Maya idle events.
+    Each slice runs actions until its time budget is used up, then
+    returns control to Maya until the next idle event.
+
+    Progress is shown on Maya's main progress bar, which can be used
+    to cancel the build by pressing Escape. The build can also be
+    paused, resumed, or cancelled between slices.
+
+    Fast builds are run in one go instead, since the scene state they
+    suspend must not stay suspended while Maya is idle. Builds are
+    cancelled when another scene is opened or a new scene is created.
+
+    The executor acts as a future for the build result. Use
+    `addDoneCallback` to be notified when the build is done, or
+    `wait` to finish the build immediately.
+
+    Example:
+        >>> executor = BuildExecutor(BlueprintBuilder(blueprint))
+        >>> executor.addDoneCallback(lambda e: LOG.info(e.result()))
+        >>> executor.start()
+    """
+
+    def __init__(self, builder, sliceTime=0.05, showProgress=True):
+        """
+        Args:
+            builder (BlueprintBuilder): The builder to run, which must not
+                have been started yet
+            sliceTime (float): The time budget of each slice in seconds.
+                A slice always runs at least one action, and may run over
+                budget by the duration of the last action.
+            showProgress (bool): If true, show progress on the main
+                progress bar, when not in batch mode
+        """
+        self.builder = builder
+        self.sliceTime = sliceTime
+        self.showProgress = showProgress and not cmds.about(batch=True)
+        self.isPaused = False
+        self.sliceCount = 0
+        self._callbackId = None
+        self._sceneCallbackIds = []
+        self._progressBar = None
+        self._isDone = False
+        self._excInfo = None
+        self._doneCallbacks = []
+
+    def __repr__(self):
+        return "<BuildExecutor {0} {1}>".format(
+            self.builder.blueprint.rigName, self.getState())
+
+    def getState(self):
+        """
+        Return the state of the build, one of 'pending', 'running',
+        'paused', 'finished', 'cancelled', or 'failed'
+        """
+        if self._excInfo:
+            return 'failed'
+        if self.builder.isFinished:
+            return 'finished'
+        if self.builder.isCancelled:
+            return 'cancelled'
+        if not self.builder.isStarted:
+            return 'pending'
+        return 'paused' if self.isPaused else 'running'
+
+    def start(self):
+        """
+        Start the build, which continues during idle events.
+
+        Returns:
+            This executor
+        """
+        if self.builder.isStarted:
+            LOG.warning("Builder has already been started")
+            return self
+        self._beginProgress()
+        self._addSceneCallbacks()
+        try:
+            self.builder.start(run=False)
+        except Exception:
+            self._onDone(sys.exc_info())
+            return self
+        if self.builder.isCancelled:
+            # cancelled before building, such as by a failed check
+            self._onDone()
+        elif self.isPaused:
+            if self.builder.fastBuildContext:
+                self.builder.fastBuildContext.restore()
+        else:
+            self._continue()
+        return self
+
+    def pause(self):
+        """
+        Pause the build after the current slice. Any scene state
+        suspended by a fast build is restored while paused.
+        """
+        if not self._isDone and not self.isPaused:
+            self.isPaused = True
+            self._removeIdleCallback()
+            if self.builder.fastBuildContext:
+                self.builder.fastBuildContext.restore()
+
+    def resume(self):
+        """
+        Resume a paused build.
+        """
+        if self.isPaused and not self._isDone:
+            self.isPaused = False
+            if self.builder.isStarted:
+                if self.builder.fastBuildContext:
+                    self.builder.fastBuildContext.suspend()
+                self._continue()
+
+    def cancel(self):
+        """
+        Cancel the build. Slices only run between idle events,
+        so the build is always cancelled between actions.
+
+        Returns:
+            True if the build was cancelled
+        """
+        if self._isDone:
+            return False
+        self.builder.cancel()
+        self._onDone()
+        return True
+
+    def wait(self):
+        """
+        Run the rest of the build immediately, blocking until it is done.
+
+        Returns:
+            The result of the build, see `result`
+        """
+        if not self.builder.isStarted:
+            self.isPaused = False
+            self.start()
+        else:
+            self.resume()
+        self._runToEnd()
+        return self.result()
+
+    def runSlice(self):
+        """
+        Run the build for one time slice. Called during idle events.
+        """
+        if self._isDone:
+            return
+        self.sliceCount += 1
+        try:
+            self.builder.run(timeout=self.sliceTime)
+        except Exception:
+            self._onDone(sys.exc_info())
+            return
+        if self._isProgressCancelled():
+            self.builder.cancel()
+        self._updateProgress()
+        if self.builder.isFinished or self.builder.isCancelled:
+            self._onDone()
+
+    def done(self):
+        """
+        Return True if the build has finished, was cancelled, or failed.
+        """
+        return self._isDone
+
+    def result(self):
+        """
+        Return the builder once the build is done, re-raising any
+        unexpected error that stopped the build.
+        """
+        if not self._isDone:
+            raise RuntimeError("Build is not done yet")
+        if self._excInfo:
+            raise self._excInfo[0], self._excInfo[1], self._excInfo[2]
+        return self.builder
+
+    def exception(self):
+        """
+        Return the unexpected error that stopped the build, if any.
+        """
+        return self._excInfo[1] if self._excInfo else None
+
+    def addDoneCallback(self, func):
+        """
+        Add a function to call with this executor when the build is done.
+        Called immediately if the build is already done.
+        """
+        if self._isDone:
+            func(self)
+        else:
+            self._doneCallbacks.append(func)
+
+    def _continue(self):
+        """
+        Continue the build during idle events, or immediately for fast builds.
+        """
+        if self.builder.fastBuildContext:
+            self._runToEnd()
+        else:
+            self._addIdleCallback()
+
+    def _runToEnd(self):
+        self._removeIdleCallback()
+        while not self._isDone:
+            self.runSlice()
+
+    def _onDone(self, excInfo=None):
+        self._isDone = True
+        self._excInfo = excInfo
+        self._removeIdleCallback()
+        self._removeSceneCallbacks()
+        self._endProgress()
+        if excInfo:
+            LOG.error("Build failed: {0}".format(excInfo[1]),
+                      exc_info=excInfo)
+        callbacks = self._doneCallbacks
+        self._doneCallbacks = []
+        for func in callbacks:
+            try:
+                func(self)
+            except Exception:
+                LOG.exception("Build done callback failed")
+
+    def _addIdleCallback(self):
+        if self._callbackId is None:
+            self._callbackId = api.MEventMessage.addEventCallback(
+                'idle', self._onIdle)
+
+    def _removeIdleCallback(self):
+        if self._callbackId is not None:
+            api.MMessage.removeCallback(self._callbackId)
+            self._callbackId = None
+
+    def _onIdle(self, *args):
+        self.runSlice()
+
+    def _addSceneCallbacks(self):
+        if not self._sceneCallbackIds:
+            for message in (api.MSceneMessage.kBeforeOpen,
+                            api.MSceneMessage.kBeforeNew):
+                self._sceneCallbackIds.append(api.MSceneMessage.addCallback(
+                    message, self._onBeforeSceneChange))
+
+    def _removeSceneCallbacks(self):
+        for callbackId in self._sceneCallbackIds:
+            api.MMessage.removeCallback(callbackId)
+        self._sceneCallbackIds = []
+
+    def _onBeforeSceneChange(self, *args):
+        if self.builder.isRunning:
+            # opened by the build itself, such as when restoring a checkpoint
+            return
+        LOG.warning("Cancelling build of {0}, the scene is changing".format(
+            self.builder.blueprint.rigName))
+        self.cancel()
+
+    def _beginProgress(self):
+        if not self.showProgress:
+            return
+        self._progressBar = mel.eval('$tmp = $gMainProgressBar')
+        cmds.progressBar(
+            self._progressBar, e=True, beginProgress=True,
+            isInterruptable=True, maxValue=1,
+            status='Building {0}...'.format(self.builder.blueprint.rigName))
+
+    def _updateProgress(self):
+        if self._progressBar:
+            index, total = self.builder.progress
+            cmds.progressBar(self._progressBar, e=True,
+                             maxValue=max(total, 1), progress=index + 1)
+
+    def _isProgressCancelled(self):
+        if self._progressBar:
+            return cmds.progressBar(self._progressBar, q=True, isCancelled=True)
+        return False
+
+    def _endProgress(self):
+        if self._progressBar:
+            cmds.progressBar(self._progressBar, e=True, endProgress=True)
+            self._progressBar = None
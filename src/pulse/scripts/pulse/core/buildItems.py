@@ -3,7 +3,9 @@ import os
 import logging
 import re
 import pymetanode as meta
+import pymel.core as pm
 
+from . import deltas
 from .rigs import RIG_METACLASS
 from .serializer import UnsortableOrderedDict
 
@@ -12,37 +14,380 @@ __all__ = [
     'BuildActionData',
     'BuildActionError',
     'BuildActionProxy',
+    'BuildActionSchema',
     'BuildStep',
     'getBuildActionClass',
     'getBuildActionConfig',
+    'getBuildActionSchema',
     'getRegisteredAction',
     'getRegisteredActionConfigs',
     'getRegisteredActionIds',
     'getRegisteredActions',
     'registerAction',
+    'unregisterAction',
 ]
 
 
 LOG = logging.getLogger(__name__)
 
+# placeholder for variants that don't have a value for a variant attribute
+_NOVALUE = object()
+
+
+def _readOnly(self, *args, **kwargs):
+    raise TypeError("'{0}' object is read-only".format(type(self).__name__))
+
+
+class _EmptyList(list):
+    """
+    A read-only empty list, shared by all objects
+    that don't have any items in a list yet.
+    """
+    __slots__ = ()
+
+    append = extend = insert = pop = remove = reverse = sort = _readOnly
+    __setitem__ = __delitem__ = __setslice__ = __delslice__ = _readOnly
+    __iadd__ = __imul__ = _readOnly
+
+
+class _EmptyDict(dict):
+    """
+    A read-only empty dict, shared by all objects
+    that don't have any items in a dict yet.
+    """
+    __slots__ = ()
+
+    clear = pop = popitem = setdefault = update = _readOnly
+    __setitem__ = __delitem__ = _readOnly
+
+
+# shared empty collections, which are replaced with
+# a new list or dict when an item is first added
+_EMPTY_LIST = _EmptyList()
+_EMPTY_DICT = _EmptyDict()
+
 BUILDACTIONMAP = {}
+# the same registered actions as BUILDACTIONMAP, indexed by action class
+BUILDACTIONCLASSMAP = {}
 
 
-def _incrementName(name):
+def _splitNameNumber(name):
+    """
+    Split a name into a base name and trailing number, such that
+    incrementing the name produces `base + str(num + 1)`.
+    Names without a trailing number are given a number suffix,
+    e.g. 'MyStep' -> ('MyStep ', 0), 'MyStep2' -> ('MyStep', 2)
+    """
     numMatch = re.match('(.*?)([0-9]+$)', name)
     if numMatch:
         base, num = numMatch.groups()
-        return base + str(int(num) + 1)
+        return base, int(num)
     else:
-        return name + ' 1'
+        return name + ' ', 0
+
+
+def _copyValue(value):
+    """
+    Return a copy of an attribute value, copying any nested lists
+    and dicts. Other values, including node references, are shared.
+    """
+    if isinstance(value, list):
+        return [_copyValue(v) for v in value]
+    elif isinstance(value, dict):
+        result = value.__class__()
+        for k, v in value.items():
+            result[k] = _copyValue(v)
+        return result
+    return value
+
+
+class _CopyOnWriteAttrValues(object):
+    """
+    A dict-like collection of attribute values that is backed by one or
+    more dicts of shared values, which are never modified. Values that
+    are set are stored locally, and shared lists and dicts are copied
+    the first time they are retrieved, so that an action can modify
+    them without affecting any other actions sharing the same values.
+    """
+
+    __slots__ = ('_sharedValues', '_localValues', '_deletedNames')
+
+    def __init__(self, *sharedValues):
+        # dicts of shared values, in order of precedence
+        self._sharedValues = sharedValues
+        # values that are owned by this object
+        self._localValues = {}
+        # names of shared values that have been deleted
+        self._deletedNames = set()
+
+    def __repr__(self):
+        return repr(dict(self.items()))
+
+    def __contains__(self, name):
+        if name in self._localValues:
+            return True
+        if name in self._deletedNames:
+            return False
+        for values in self._sharedValues:
+            if name in values:
+                return True
+        return False
+
+    def __getitem__(self, name):
+        if name in self._localValues:
+            return self._localValues[name]
+        if name not in self._deletedNames:
+            for values in self._sharedValues:
+                if name in values:
+                    value = values[name]
+                    if isinstance(value, (list, dict)):
+                        value = _copyValue(value)
+                        self._localValues[name] = value
+                    return value
+        raise KeyError(name)
+
+    def __setitem__(self, name, value):
+        self._localValues[name] = value
+        self._deletedNames.discard(name)
+
+    def __delitem__(self, name):
+        if name not in self:
+            raise KeyError(name)
+        self._localValues.pop(name, None)
+        self._deletedNames.add(name)
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def __len__(self):
+        return len(self.keys())
+
+    def get(self, name, default=None):
+        if name in self:
+            return self[name]
+        return default
+
+    def keys(self):
+        names = set(self._localValues)
+        for values in self._sharedValues:
+            names.update(values)
+        return [n for n in names if n in self]
+
+    def items(self):
+        return [(n, self[n]) for n in self.keys()]
+
+
+def _serializeRawStepData(data, name):
+    """
+    Return serialized data for a step that has not been deserialized,
+    matching what `BuildStep.serialize` would return after deserializing
+    it, without constructing any BuildSteps or action proxies.
+
+    Args:
+        data (dict): Serialized BuildStep data
+        name (str): The name of the step, see `_getRawChildNames`
+    """
+    result = UnsortableOrderedDict()
+    result['name'] = name
+    if 'action' in data:
+        result['action'] = _serializeRawActionData(data['action'])
+    elif data.get('children'):
+        result['children'] = _serializeRawChildrenData(data['children'])
+    return result
+
+
+def _serializeRawChildrenData(childrenData):
+    """
+    Return serialized data for a list of children that have not
+    been deserialized. See `_serializeRawStepData`.
+    """
+    return [_serializeRawStepData(c, n) for c, n
+            in zip(childrenData, _getRawChildNames(childrenData))]
+
 
+def _getRawChildNames(childrenData):
+    """
+    Return the names that a list of children will have once they are
+    deserialized and added to a parent, including any changes made
+    to ensure that the names are unique among siblings.
 
-def _copyData(data, refNode=None):
+    Args:
+        childrenData (list of dict): Serialized BuildStep data
+    """
+    # use an empty step to allocate names exactly as a parent would
+    parent = BuildStep()
+    parent._childrenByName = {}
+    names = []
+    for data in childrenData:
+        name = (data['name'] or 'BuildStep').strip()
+        if name in parent._childrenByName:
+            name = parent._getUniqueChildName(name)
+        parent._childrenByName[name] = None
+        names.append(name)
+    return names
+
+
+def _serializeRawActionData(data):
     """
-    Performs a deep copy of the given data using pymetanode to
-    encode and decode the values.
+    Return serialized data for an action proxy that has not been
+    deserialized, matching what `BuildActionProxy.serialize` would return.
+
+    Args:
+        data (dict): Serialized BuildActionProxy data
     """
-    return meta.decodeMetaData(meta.encodeMetaData(data), refNode)
+    result = UnsortableOrderedDict()
+    result['id'] = data['id']
+    schema = getBuildActionSchema(data['id'])
+    attrNames = schema.attrNames if schema else []
+    for attrName in attrNames:
+        if attrName in data:
+            result[attrName] = data[attrName]
+
+    variantAttrs = data.get('variantAttrs', [])
+    if variantAttrs:
+        result['variantAttrs'] = variantAttrs
+    variants = data.get('variants')
+    if variants:
+        variantAttrNames = [a for a in attrNames if a in variantAttrs]
+        result['variants'] = [
+            UnsortableOrderedDict([(a, v[a]) for a in variantAttrNames if a in v])
+            for v in variants]
+    return result
+
+
+def _isBool(value, attr):
+    return value is True or value is False
+
+
+def _isInt(value, attr):
+    return isinstance(value, (int, long))
+
+
+def _isNumber(value, attr):
+    return isinstance(value, (int, long, float))
+
+
+def _isString(value, attr):
+    return isinstance(value, basestring)
+
+
+def _isStringList(value, attr):
+    return isinstance(value, list) and all(
+        [isinstance(v, basestring) for v in value])
+
+
+def _isOption(value, attr):
+    return (isinstance(value, (int, long)) and
+            0 <= value < len(attr.get('options', [])))
+
+
+def _isNode(value, attr):
+    return value is None or isinstance(value, pm.nt.DependNode)
+
+
+def _isNodeList(value, attr):
+    return isinstance(value, list) and all(
+        [isinstance(v, pm.nt.DependNode) for v in value])
+
+
+# functions for validating attribute values by attribute type,
+# called with (value, attr config)
+ATTR_TYPE_VALIDATORS = {
+    'bool': _isBool,
+    'int': _isInt,
+    'float': _isNumber,
+    'string': _isString,
+    'stringlist': _isStringList,
+    'option': _isOption,
+    'node': _isNode,
+    'nodelist': _isNodeList,
+}
+
+
+class BuildActionSchema(object):
+    """
+    A compiled form of a BuildAction config that provides fast access
+    to attribute configs, default values, and value validation.
+    Created once when an action is registered, and shared by all
+    action data, proxies and actions of that action id.
+    """
+
+    def __init__(self, config):
+        self.config = config
+        # list of all attr configs, in order
+        self.attrs = config.get('attrs', [])
+        # list of all attr names, in order
+        self.attrNames = [a['name'] for a in self.attrs]
+        # map of attr names to attr configs
+        self.attrsByName = dict([(a['name'], a) for a in self.attrs])
+        # names of attrs that reference scene nodes
+        self.nodeAttrNames = [a['name'] for a in self.attrs
+                              if a.get('type') in ('node', 'nodelist')]
+
+        # default values by attr name, and names of
+        # attrs that default to a new empty list
+        self._defaultValues = {}
+        self._listAttrNames = set()
+        # validator functions by attr name
+        self._validators = {}
+        for attr in self.attrs:
+            name = attr['name']
+            attrType = attr.get('type')
+            if 'value' in attr:
+                self._defaultValues[name] = attr['value']
+            elif attrType and 'list' in attrType:
+                self._listAttrNames.add(name)
+            elif attrType == 'bool':
+                self._defaultValues[name] = False
+            elif attrType in ['int', 'float']:
+                self._defaultValues[name] = 0
+            elif attrType == 'string':
+                self._defaultValues[name] = ''
+            if attrType in ATTR_TYPE_VALIDATORS:
+                self._validators[name] = ATTR_TYPE_VALIDATORS[attrType]
+
+    def __repr__(self):
+        return "<BuildActionSchema '{0}'>".format(self.config.get('id'))
+
+    def hasAttr(self, attrName):
+        """
+        Return True if the action has an attribute
+        """
+        return attrName in self.attrsByName
+
+    def getAttrConfig(self, attrName):
+        """
+        Return the config for an attribute, or None if it doesn't exist
+        """
+        return self.attrsByName.get(attrName)
+
+    def getAttrDefaultValue(self, attrName):
+        """
+        Return the default value for an attribute
+
+        Args:
+            attrName (str): The name of a BuildAction attribute
+        """
+        if attrName in self._listAttrNames:
+            return []
+        return self._defaultValues.get(attrName)
+
+    def isAttrValueValid(self, attrName, value):
+        """
+        Return True if a value matches the type of an attribute.
+        Values for attributes of unknown types are always valid.
+
+        Args:
+            attrName (str): The name of a BuildAction attribute
+            value: The potential value of the attribute
+        """
+        attr = self.attrsByName.get(attrName)
+        if attr is None:
+            return False
+        validator = self._validators.get(attrName)
+        if validator is None:
+            return True
+        return validator(value, attr)
 
 
 def getRegisteredAction(actionId):
@@ -71,18 +416,30 @@ def getBuildActionConfig(actionId):
         return action['config']
 
 
-def _getBuildActionConfigForClass(actionClass):
+def getBuildActionSchema(actionId):
     """
-    Return the config that is associated with a BuildAction class.
-    Performs the search by looking for a matching class and returning
-    its paired config, instead of looking for the config by id.
+    Return the BuildActionSchema of a BuildAction by action id
+
+    Args:
+        actionId (str): A BuildAction id
+    """
+    action = getRegisteredAction(actionId)
+    if action:
+        return action['schema']
+
+
+def _getRegisteredActionForClass(actionClass):
+    """
+    Return the registered action that is associated with a BuildAction
+    class, instead of looking for the action by id.
 
     Args:
         actionClass: A BuildAction class
+
+    Returns:
+        A dict containing {'config':dict, 'class':class}
     """
-    for v in BUILDACTIONMAP.values():
-        if v['class'] is actionClass:
-            return v['config']
+    return BUILDACTIONCLASSMAP.get(actionClass)
 
 
 def getBuildActionClass(actionId):
@@ -111,7 +468,7 @@ def getRegisteredActions():
     Returns:
         A dict of {str: {'config': dict, 'class': BuildAction class}}
     """
-    return {k: v for k, v in BUILDACTIONMAP}
+    return dict(BUILDACTIONMAP)
 
 
 def getRegisteredActionConfigs():
@@ -136,6 +493,7 @@ def registerAction(actionConfig, actionClass):
     action = {
         'config': actionConfig,
         'class': actionClass,
+        'schema': BuildActionSchema(actionConfig),
     }
     actionId = actionConfig['id']
     if actionId in BUILDACTIONMAP:
@@ -143,11 +501,27 @@ def registerAction(actionConfig, actionClass):
         return
 
     BUILDACTIONMAP[actionId] = action
+    if actionClass not in BUILDACTIONCLASSMAP:
+        BUILDACTIONCLASSMAP[actionClass] = action
 
 
 def unregisterAction(actionId):
+    """
+    Unregister a BuildAction by id
+
+    Args:
+        actionId (str): A BuildAction id
+    """
     if actionId in BUILDACTIONMAP:
-        del BUILDACTIONMAP[actionId]
+        action = BUILDACTIONMAP.pop(actionId)
+        actionClass = action['class']
+        if BUILDACTIONCLASSMAP.get(actionClass) is action:
+            del BUILDACTIONCLASSMAP[actionClass]
+            # fall back to any other action registered with the same class
+            for otherAction in BUILDACTIONMAP.values():
+                if otherAction['class'] is actionClass:
+                    BUILDACTIONCLASSMAP[actionClass] = otherAction
+                    break
 
 
 class BuildStep(object):
@@ -160,17 +534,25 @@ class BuildStep(object):
     # TODO (bsayre): consider adding method to change the action type of the current proxy,
     #       whilst preserving or transferring as much attr data as possible
 
+    # blueprints can contain many thousands of steps, so use
+    # slots and shared empty collections to keep steps small
+    __slots__ = ('_name', '_parent', '_children', '_childrenData',
+                 '_childrenByName', '_nameSuffixes', '_pathIndex',
+                 '_actionProxy', '_serializedData')
+
     @staticmethod
-    def fromData(data):
+    def fromData(data, lazy=False):
         """
         Return a new BuildStep instance created
         from serialized data.
 
         Args:
             data (dict): Serialized BuildStep data
+            lazy (bool): If True, defer deserializing children
+                until they are accessed, see `deserialize`
         """
         newStep = BuildStep()
-        newStep.deserialize(data)
+        newStep.deserialize(data, lazy=lazy)
         return newStep
 
     def __init__(self, name=None, actionProxy=None, actionId=None):
@@ -179,14 +561,29 @@ class BuildStep(object):
         # the parent BuildStep
         self._parent = None
         # list of child BuildSteps
-        self._children = []
+        self._children = _EMPTY_LIST
+        # serialized data of children that have not been deserialized yet
+        self._childrenData = None
+        # map of names to child BuildSteps, for fast lookup by name
+        self._childrenByName = _EMPTY_DICT
+        # map of child names to (base, start number, last number) of the
+        # names that were found to be in use when making a name unique
+        self._nameSuffixes = _EMPTY_DICT
+        # map of relative paths to all deserialized descendant BuildSteps,
+        # only kept for steps without a parent, see `getChildByPath`
+        self._pathIndex = None
         # the BuildActionProxy for this step
         self._actionProxy = actionProxy
+        # the cached result of `serialize`, None when the step is dirty
+        self._serializedData = None
 
         # auto-create a basic BuildActionProxy if an actionId was given
         if actionId:
             self._actionProxy = BuildActionProxy(actionId)
 
+        if self._actionProxy:
+            self._actionProxy.setOwner(self)
+
         # set the name, potentially defaulting to the action's name
         self.setName(name)
 
@@ -210,8 +607,11 @@ class BuildStep(object):
                 newName = 'BuildStep'
         # strip name and ensure its unique among siblings
         if self._name != newName:
+            self._unregisterName()
             self._name = newName.strip()
             self.ensureUniqueName()
+            self._registerName()
+            self.markDirty()
 
     def setNameFromAction(self):
         """
@@ -235,15 +635,20 @@ class BuildStep(object):
         Args:
             actionProxy (BuildActionProxy): The new action proxy
         """
-        if self._children:
+        if self._children or self._childrenData:
             LOG.warning("Cannot set a BuildActionProxy on a step with children. "
                         "Clear all children first")
             return
 
         self._actionProxy = actionProxy
+        if self._actionProxy:
+            self._actionProxy.setOwner(self)
         if updateName and self._actionProxy:
+            self._unregisterName()
             self._name = self._actionProxy.getDisplayName()
             self.ensureUniqueName()
+            self._registerName()
+        self.markDirty()
 
     @property
     def canHaveChildren(self):
@@ -258,27 +663,227 @@ class BuildStep(object):
             return
 
         if self._parent is not newParent:
+            self._unregisterName()
             self._parent = newParent
             if self._parent:
+                # only steps without a parent keep a path index
+                self._pathIndex = None
                 self.ensureUniqueName()
+                self._registerName()
+                self._parent.markDirty()
 
     @property
     def children(self):
+        self._materializeChildren()
+        if self._children is _EMPTY_LIST:
+            # don't expose the shared read-only list
+            return []
+        return self._children
+
+    def _getChildList(self):
+        """
+        Return the list of children for modification, replacing
+        the shared empty list with a new list if needed.
+        """
+        self._materializeChildren()
+        if self._children is _EMPTY_LIST:
+            self._children = []
         return self._children
 
+    def _materializeChildren(self):
+        """
+        Deserialize any children that were deferred by a lazy deserialize.
+        """
+        if self._childrenData is not None:
+            childrenData = self._childrenData
+            self._childrenData = None
+            self._children = [BuildStep.fromData(
+                c, lazy=True) for c in childrenData] or _EMPTY_LIST
+            # attach children without using `setParent` or marking them
+            # dirty when made unique, since the cached data of this step
+            # already includes the children with their unique names.
+            # The children start out dirty, see `markDirty`
+            for child in self._children:
+                child._parent = self
+                if self._childrenByName.get(child._name, child) is not child:
+                    child._name = self._getUniqueChildName(child._name)
+                child._registerName()
+
     def __repr__(self):
         return "<BuildStep '{0}'>".format(self.getDisplayName())
 
+    def isDirty(self):
+        """
+        Return True if this step has been modified since it was last serialized.
+        """
+        return self._serializedData is None
+
+    def markDirty(self):
+        """
+        Clear the cached serialized data of this step and all its parents.
+        Called automatically whenever the step, its action proxy,
+        or its children are modified.
+        """
+        # always walk up to the root, since children materialized by a
+        # lazy deserialize start out dirty below a clean parent
+        step = self
+        while step is not None:
+            step._serializedData = None
+            step = step._parent
+
     def ensureUniqueName(self):
         """
         Change this step's name to ensure that
         it is unique among siblings.
         """
         if self._parent:
-            siblings = [c for c in self._parent.children if not (c is self)]
-            siblingNames = [s.name for s in siblings]
-            while self._name in siblingNames:
-                self._name = _incrementName(self._name)
+            siblingsByName = self._parent._childrenByName
+            if siblingsByName.get(self._name, self) is not self:
+                self._name = self._parent._getUniqueChildName(self._name)
+                self.markDirty()
+
+    def _getUniqueChildName(self, name):
+        """
+        Return a unique name for a new child of this step by incrementing
+        the trailing number of a name until it is not used by any children.
+
+        The numbers found to be in use are remembered for each name,
+        so that adding many steps with the same name takes linear
+        rather than quadratic time.
+        """
+        if name in self._nameSuffixes:
+            base, startNum, num = self._nameSuffixes[name]
+        else:
+            base, startNum = _splitNameNumber(name)
+            num = startNum
+        while True:
+            num += 1
+            newName = base + str(num)
+            if newName not in self._childrenByName:
+                break
+        if self._nameSuffixes is _EMPTY_DICT:
+            self._nameSuffixes = {}
+        self._nameSuffixes[name] = (base, startNum, num)
+        return newName
+
+    def _releaseChildName(self, name):
+        """
+        Update the remembered name suffixes after a
+        child name is no longer in use.
+        """
+        base, num = _splitNameNumber(name)
+        if base + str(num) != name:
+            # not a name that can be produced by `_getUniqueChildName`
+            return
+        for key, (keyBase, startNum, lastNum) in self._nameSuffixes.items():
+            if keyBase == base and startNum < num <= lastNum:
+                self._nameSuffixes[key] = (keyBase, startNum, num - 1)
+
+    def _getRootAndPath(self):
+        """
+        Return the top-most parent of this step, and the
+        path to this step relative to that parent.
+        """
+        names = []
+        step = self
+        while step._parent is not None:
+            names.append(step._name)
+            step = step._parent
+        return step, '/'.join(reversed(names))
+
+    def _iterPaths(self, path):
+        """
+        Generator that yields (path, step) for this step and all
+        deserialized children, recursively.
+
+        Args:
+            path (str): The path of this step
+        """
+        stack = [(path, self)]
+        while stack:
+            path, step = stack.pop()
+            yield path, step
+            for child in step._children:
+                stack.append(('{0}/{1}'.format(path, child._name), child))
+
+    def _buildPathIndex(self):
+        """
+        Return a dict of relative paths to all deserialized descendants.
+        """
+        pathIndex = {}
+        for child in self._children:
+            pathIndex.update(child._iterPaths(child._name))
+        return pathIndex
+
+    def _registerName(self):
+        """
+        Add this step and its children to the name map of its
+        parent and the path index of its top-most parent.
+        """
+        if self._parent is None:
+            return
+        if self._parent._childrenByName is _EMPTY_DICT:
+            self._parent._childrenByName = {}
+        self._parent._childrenByName[self._name] = self
+        root, path = self._getRootAndPath()
+        if root._pathIndex is not None:
+            root._pathIndex.update(self._iterPaths(path))
+
+    def _unregisterName(self):
+        """
+        Remove this step and its children from the name map of its
+        parent and the path index of its top-most parent.
+        """
+        if self._parent is None:
+            return
+        siblingsByName = self._parent._childrenByName
+        if siblingsByName.get(self._name) is self:
+            del siblingsByName[self._name]
+            self._parent._releaseChildName(self._name)
+        root, path = self._getRootAndPath()
+        if root._pathIndex is not None:
+            for stepPath, _ in self._iterPaths(path):
+                root._pathIndex.pop(stepPath, None)
+
+    def getIndexErrors(self):
+        """
+        Check that the child name maps and path index of this step
+        and all its deserialized children are up to date.
+
+        Returns:
+            A list of str describing each problem found,
+            empty if the indexes are consistent.
+        """
+        errors = []
+        if self._parent is None and self._pathIndex is not None:
+            expected = self._buildPathIndex()
+            for path, step in expected.items():
+                if self._pathIndex.get(path) is not step:
+                    errors.append(
+                        "Path index is missing step: {0}".format(path))
+            for path in self._pathIndex:
+                if path not in expected:
+                    errors.append(
+                        "Path index has a stale path: {0}".format(path))
+
+        stack = [self]
+        while stack:
+            step = stack.pop()
+            if step._parent is not None and step._pathIndex is not None:
+                errors.append("{0} has a path index but also has a "
+                              "parent".format(step))
+            childrenByName = {}
+            for child in step._children:
+                if child._parent is not step:
+                    errors.append("{0} has the wrong parent".format(child))
+                if child._name in childrenByName:
+                    errors.append("{0} has a duplicate name".format(child))
+                childrenByName[child._name] = child
+            if childrenByName != step._childrenByName:
+                errors.append(
+                    "{0} has an out of date child name map".format(step))
+            stack.extend(step._children)
+        return errors
 
     def getDisplayName(self):
         """
@@ -342,10 +947,15 @@ class BuildStep(object):
         if not self.canHaveChildren:
             return
 
+        # deferred children were never deserialized, just discard them
+        self._childrenData = None
         for step in self._children:
             step.setParent(None)
 
-        self._children = []
+        self._children = _EMPTY_LIST
+        self._childrenByName = _EMPTY_DICT
+        self._nameSuffixes = _EMPTY_DICT
+        self.markDirty()
 
     def addChild(self, step):
         if not self.canHaveChildren:
@@ -358,20 +968,25 @@ class BuildStep(object):
             raise TypeError(
                 'Expected BuildStep, got {0}'.format(type(step).__name__))
 
-        self._children.append(step)
+        self._getChildList().append(step)
         step.setParent(self)
+        self.markDirty()
 
     def addChildren(self, steps):
-        for step in steps:
-            self.addChild(step)
+        """
+        Add multiple child steps. See `insertChildren`.
+        """
+        self.insertChildren(self.numChildren(), steps)
 
     def removeChild(self, step):
         if not self.canHaveChildren:
             return
 
+        self._materializeChildren()
         if step in self._children:
             self._children.remove(step)
             step.setParent(None)
+            self.markDirty()
 
     def removeChildren(self, index, count):
         for _ in range(count):
@@ -381,11 +996,13 @@ class BuildStep(object):
         if not self.canHaveChildren:
             return
 
+        self._materializeChildren()
         if index < 0 or index >= len(self._children):
             return
 
         self._children[index].setParent(None)
         del self._children[index]
+        self.markDirty()
 
     def insertChild(self, index, step):
         if not self.canHaveChildren:
@@ -395,19 +1012,49 @@ class BuildStep(object):
             raise TypeError(
                 'Expected BuildStep, got {0}'.format(type(step).__name__))
 
-        self._children.insert(index, step)
+        self._getChildList().insert(index, step)
         step.setParent(self)
+        self.markDirty()
+
+    def insertChildren(self, index, steps):
+        """
+        Insert multiple child steps at an index. Steps are given unique
+        names in order, with the same results as inserting them one at
+        a time, but in linear time for any number of steps.
+
+        Args:
+            index (int): The index at which to insert the steps
+            steps (list of BuildStep): The steps to insert
+        """
+        if not self.canHaveChildren:
+            return
+
+        steps = list(steps)
+        for step in steps:
+            if step is self:
+                raise ValueError('Cannot add step as child of itself')
+            if not isinstance(step, BuildStep):
+                raise TypeError(
+                    'Expected BuildStep, got {0}'.format(type(step).__name__))
+
+        self._getChildList()[index:index] = steps
+        for step in steps:
+            step.setParent(self)
+        self.markDirty()
 
     def numChildren(self):
         if not self.canHaveChildren:
             return 0
 
+        if self._childrenData is not None:
+            return len(self._childrenData)
         return len(self._children)
 
     def getChildAt(self, index):
         if not self.canHaveChildren:
             return
 
+        self._materializeChildren()
         return self._children[index]
 
     def getChildIndex(self, step):
@@ -417,6 +1064,7 @@ class BuildStep(object):
         if not self.canHaveChildren:
             return -1
 
+        self._materializeChildren()
         return self._children.index(step)
 
     def getChildByName(self, name):
@@ -426,9 +1074,8 @@ class BuildStep(object):
         if not self.canHaveChildren:
             return
 
-        for step in self._children:
-            if step.name == name:
-                return step
+        self._materializeChildren()
+        return self._childrenByName.get(name)
 
     def getChildByPath(self, path):
         """
@@ -437,13 +1084,22 @@ class BuildStep(object):
         if not self.canHaveChildren:
             return
 
-        if '/' in path:
-            childName, grandChildPath = path.split('/', 1)
-            child = self.getChildByName(childName)
-            if child:
-                return child.getChildByPath(grandChildPath)
-        else:
-            return self.getChildByName(path)
+        if self._parent is None:
+            # steps without a parent keep an index of all descendants
+            if self._pathIndex is None:
+                self._pathIndex = self._buildPathIndex()
+            step = self._pathIndex.get(path)
+            if step is not None:
+                return step
+
+        # resolve one name at a time, which also deserializes
+        # lazy children and adds them to the path index
+        step = self
+        for name in path.split('/'):
+            step = step.getChildByName(name)
+            if step is None:
+                return
+        return step
 
     def childIterator(self):
         """
@@ -452,6 +1108,7 @@ class BuildStep(object):
         yield self
 
         if self.canHaveChildren:
+            self._materializeChildren()
             for child in self._children:
                 for step in child.childIterator():
                     yield step
@@ -463,25 +1120,43 @@ class BuildStep(object):
 
     def serialize(self):
         """
-        Return this BuildStep as a serialized dict object
+        Return this BuildStep as a serialized dict object.
+
+        The result is cached until the step is modified, and only the
+        modified parts of the hierarchy are serialized again. The returned
+        data is shared with the cache and must not be modified.
         """
+        if self._serializedData is None:
+            self._serializedData = self._serialize()
+        return self._serializedData
+
+    def _serialize(self):
         data = UnsortableOrderedDict()
         data['name'] = self._name
         if self._actionProxy:
             data['action'] = self._actionProxy.serialize()
 
         if self.numChildren() > 0:
-            # TODO: perform a recursion loop check
-            data['children'] = [c.serialize() for c in self._children]
+            if self._childrenData is not None:
+                # pass through children that haven't been deserialized
+                data['children'] = _serializeRawChildrenData(
+                    self._childrenData)
+            else:
+                # TODO: perform a recursion loop check
+                data['children'] = [c.serialize() for c in self._children]
 
         return data
 
-    def deserialize(self, data):
+    def deserialize(self, data, lazy=False):
         """
         Load configuration of this BuildStep from data
 
         Args:
             data: A dict containing serialized data for this step
+            lazy (bool): If True, children are kept as serialized data and
+                only deserialized when first accessed, e.g. using `children`,
+                `getChildAt`, `getChildByPath`, or `childIterator`. Children
+                that are never accessed are serialized directly from their data.
         """
         self.setName(data['name'])
         if 'action' in data:
@@ -490,18 +1165,22 @@ class BuildStep(object):
             self.setActionProxy(newActionProxy, updateName=False)
         else:
             self._actionProxy = None
+        self.markDirty()
 
         # TODO: warn if throwing away children in a rare case that
         #       both a proxy and children existed (maybe data was manually created).
         if self.canHaveChildren:
             # detach any existing children
             self.clearChildren()
-            # deserialize all children, and connect them to this parent
-            self._children = [BuildStep.fromData(
-                c) for c in data.get('children', [])]
-            for child in self._children:
-                if child:
-                    child.setParent(self)
+            if lazy:
+                self._childrenData = data.get('children') or None
+            else:
+                # deserialize all children, and connect them to this parent
+                self._children = [BuildStep.fromData(
+                    c) for c in data.get('children', [])] or _EMPTY_LIST
+                for child in self._children:
+                    if child:
+                        child.setParent(self)
 
 
 class BuildActionError(Exception):
@@ -520,11 +1199,22 @@ class BuildActionData(object):
     # TODO: add another base class with less cluttered namespace
     #       for use as the base of BuildActions
 
+    # subclasses that don't define slots, such as BuildActions,
+    # still have a __dict__ for any other instance attributes
+    __slots__ = ('_actionId', 'configFile', '_config', '_schema',
+                 '_attrValues', '_owner', '_serializedData')
+
     def __init__(self, actionId=None):
         self._actionId = actionId
         self.configFile = None
         self._config = None
-        self._attrValues = {}
+        # the BuildActionSchema for the action, set along with the config
+        self._schema = None
+        self._attrValues = _EMPTY_DICT
+        # the object that owns this data, notified when it is modified
+        self._owner = None
+        # the cached result of `serialize`, None when the data is dirty
+        self._serializedData = None
 
         if self._actionId:
             self.retrieveActionConfig()
@@ -548,6 +1238,37 @@ class BuildActionData(object):
     def isActionIdValid(self):
         return self._actionId is not None
 
+    def getOwner(self):
+        """
+        Return the object that owns this data, e.g. the BuildStep of
+        an action proxy, or the action proxy of a variant.
+        """
+        return self._owner
+
+    def setOwner(self, owner):
+        """
+        Set the object that owns this data. The owner must implement
+        `markDirty`, which is called when this data is modified.
+        """
+        self._owner = owner
+
+    def isDirty(self):
+        """
+        Return True if this data has been modified since it was last serialized.
+        """
+        return self._serializedData is None
+
+    def markDirty(self):
+        """
+        Clear the cached serialized data of this object and its owners.
+        Called automatically whenever the data is modified.
+        """
+        self._serializedData = None
+        # the owner may be clean even if this data is already dirty,
+        # such as the step of a lazily deserialized action proxy
+        if self._owner is not None:
+            self._owner.markDirty()
+
     def getActionId(self):
         """
         Return the id of the BuildAction
@@ -566,9 +1287,11 @@ class BuildActionData(object):
         Get the config for the current actionId and store it on this data
         """
         self._config = getBuildActionConfig(self._actionId)
+        self._schema = getBuildActionSchema(self._actionId)
         if self._config is None:
             LOG.warning(
                 "Failed to find action config for {0}".format(self._actionId))
+        self.markDirty()
 
     def numAttrs(self):
         """
@@ -583,7 +1306,9 @@ class BuildActionData(object):
         Returns:
             A list of dict representing all attr configs
         """
-        return self.config['attrs']
+        if self._schema is None:
+            return self.config['attrs']
+        return self._schema.attrs
 
     def getAttrNames(self):
         """
@@ -592,8 +1317,8 @@ class BuildActionData(object):
         if not self.hasConfig():
             return
 
-        for attr in self.config['attrs']:
-            yield attr['name']
+        for attrName in self._schema.attrNames:
+            yield attrName
 
     def hasAttrConfig(self, attrName):
         """
@@ -619,9 +1344,7 @@ class BuildActionData(object):
         if not self.hasConfig():
             return
 
-        for attr in self.config['attrs']:
-            if attr['name'] == attrName:
-                return attr
+        return self._schema.attrsByName.get(attrName)
 
     def getAttrDefaultValue(self, attr):
         """
@@ -633,18 +1356,20 @@ class BuildActionData(object):
         if not self.hasConfig():
             return
 
-        if 'value' in attr:
-            return attr['value']
-        else:
-            attrType = attr['type']
-            if 'list' in attrType:
-                return []
-            elif attrType == 'bool':
-                return False
-            elif attrType in ['int', 'float']:
-                return 0
-            elif attrType == 'string':
-                return ''
+        return self._schema.getAttrDefaultValue(attr['name'])
+
+    def isAttrValueValid(self, attrName, value):
+        """
+        Return True if a value matches the type of an attribute.
+
+        Args:
+            attrName (str): The name of a BuildAction attribute
+            value: The potential value of the attribute
+        """
+        if not self.hasConfig():
+            return False
+
+        return self._schema.isAttrValueValid(attrName, value)
 
     def hasAttrValue(self, attrName):
         """
@@ -683,24 +1408,47 @@ class BuildActionData(object):
         if value is None:
             self.delAttrValue(attrName)
         else:
+            if self._attrValues is _EMPTY_DICT:
+                self._attrValues = {}
             self._attrValues[attrName] = value
+            self.markDirty()
 
     def delAttrValue(self, attrName):
         if attrName in self._attrValues:
             del self._attrValues[attrName]
+            self.markDirty()
 
     def serialize(self):
         """
-        Return this BuildActionData as a serialized dict object
+        Return this BuildActionData as a serialized dict object.
+
+        The result is cached until the data is modified. The returned
+        data is shared with the cache and must not be modified.
         """
+        if self._serializedData is None:
+            self._serializedData = self._serialize()
+        return self._serializedData
+
+    def _serialize(self):
         data = UnsortableOrderedDict()
         data['id'] = self._actionId
         if self.hasConfig():
-            for attr in self.getAttrs():
-                if self.hasAttrValue(attr['name']):
-                    data[attr['name']] = self._attrValues[attr['name']]
+            attrValues = self._attrValues
+            for attrName in self.getAttrNames():
+                if attrName in attrValues:
+                    data[attrName] = attrValues[attrName]
         return data
 
+    def _getActionValues(self):
+        """
+        Return a shallow copy of the attribute values
+        to use when creating BuildActions.
+        """
+        if self.hasConfig():
+            return dict([(n, self._attrValues[n]) for n in self.getAttrNames()
+                         if n in self._attrValues])
+        return dict(self._attrValues)
+
     def deserialize(self, data):
         """
         Set all values on this BuildActionData from data
@@ -714,11 +1462,14 @@ class BuildActionData(object):
         if self._actionId:
             self.retrieveActionConfig()
 
+        # replace all existing values
+        self._attrValues = {}
+
         # load values for all action attrs
         if self.hasConfig():
-            for attr in self.getAttrs():
-                if attr['name'] in data:
-                    self._attrValues[attr['name']] = data[attr['name']]
+            for attrName in self.getAttrNames():
+                if attrName in data:
+                    self._attrValues[attrName] = data[attrName]
 
         elif len(data) > 1:
             # if config didn't load, don't throw away the attribute values
@@ -728,24 +1479,111 @@ class BuildActionData(object):
             for k, v in data.items():
                 self._attrValues[k] = v
 
+        self.markDirty()
+
+
+class _VariantAttrValues(object):
+    """
+    A dict-like view of the attribute values of one variant,
+    which are stored in columns by a BuildActionProxy.
+    """
+
+    __slots__ = ('_proxy', '_index')
+
+    def __init__(self, proxy, index):
+        self._proxy = proxy
+        self._index = index
+
+    def __repr__(self):
+        return repr(dict(self.items()))
+
+    def __contains__(self, name):
+        column = self._proxy._variantValues.get(name)
+        return column is not None and column[self._index] is not _NOVALUE
+
+    def __getitem__(self, name):
+        column = self._proxy._variantValues.get(name)
+        if column is None or column[self._index] is _NOVALUE:
+            raise KeyError(name)
+        return column[self._index]
+
+    def __setitem__(self, name, value):
+        column = self._proxy._variantValues.get(name)
+        if column is None:
+            LOG.warning("Cannot set value for {0}, it is not a "
+                        "variant attribute".format(name))
+            return
+        column[self._index] = value
+
+    def __delitem__(self, name):
+        if name not in self:
+            raise KeyError(name)
+        self._proxy._variantValues[name][self._index] = _NOVALUE
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def __len__(self):
+        return len(self.keys())
+
+    def get(self, name, default=None):
+        if name in self:
+            return self[name]
+        return default
+
+    def keys(self):
+        return [n for n in self._proxy._variantAttrs if n in self]
+
+    def items(self):
+        return [(n, self[n]) for n in self.keys()]
+
 
 class BuildActionDataVariant(BuildActionData):
     """
-    Contains a partial set of attribute values.
+    Contains a partial set of attribute values, for one
+    variant of a BuildActionProxy.
+
+    Variant values are stored by the proxy in one list per variant
+    attribute, and a variant provides access to the values at one
+    index of those lists. Variants are created by the proxy as needed,
+    and refer to a variant by index, so should not be kept after
+    variants are inserted or removed.
     """
 
-    # TODO: prevent setting an attribute thats not in the variant
+    __slots__ = ('_index',)
 
-    def __init__(self, actionId=None):
-        super(BuildActionDataVariant, self).__init__(actionId=actionId)
-        # names of all attributes that are in this variant
-        self._variantAttrs = []
+    def __init__(self, proxy, index):
+        super(BuildActionDataVariant, self).__init__()
+        self._actionId = proxy._actionId
+        self._config = proxy._config
+        self._schema = proxy._schema
+        self._owner = proxy
+        # the index of this variant in the proxy
+        self._index = index
+        self._attrValues = _VariantAttrValues(proxy, index)
+
+    def __repr__(self):
+        return "<{0} '{1}' [{2}]>".format(
+            self.__class__.__name__, self.getActionId(), self._index)
+
+    def getIndex(self):
+        """
+        Return the index of this variant in its proxy
+        """
+        return self._index
+
+    def retrieveActionConfig(self):
+        # the config is always shared with the proxy
+        pass
+
+    def markDirty(self):
+        self._owner._markVariantDirty(self._index)
 
     def getVariantAttrs(self):
         """
         Return the list of all variant attribute names
         """
-        return self._variantAttrs
+        return self._owner.getVariantAttrs()
 
     def getAttrs(self):
         """
@@ -754,7 +1592,9 @@ class BuildActionDataVariant(BuildActionData):
         Returns:
             A list of dict representing all attr configs
         """
-        return [a for a in self.config['attrs'] if a['name'] in self.getVariantAttrs()]
+        variantAttrs = self.getVariantAttrs()
+        return [a for a in super(BuildActionDataVariant, self).getAttrs()
+                if a['name'] in variantAttrs]
 
     def getAttrNames(self):
         """
@@ -763,9 +1603,10 @@ class BuildActionDataVariant(BuildActionData):
         if not self.hasConfig():
             return
 
-        for attr in self.config['attrs']:
-            if attr['name'] in self.getVariantAttrs():
-                yield attr['name']
+        variantAttrs = self.getVariantAttrs()
+        for attrName in self._schema.attrNames:
+            if attrName in variantAttrs:
+                yield attrName
 
     def isVariantAttr(self, attrName):
         """
@@ -777,73 +1618,34 @@ class BuildActionDataVariant(BuildActionData):
         """
         return attrName in self.getVariantAttrs()
 
-    def setIsVariantAttr(self, attrName, isVariant):
+    def serialize(self):
         """
-        Set whether an attr is variant or not.
-
-        Args:
-            attrName (str): The name of a BuildAction attribute
-            isVariant (bool): Whether the attribute should be variant or not
+        Return this variant as a serialized dict object, including
+        the action id and variant attrs. See `serializeValues`.
         """
-        if isVariant:
-            self.addVariantAttr(attrName)
-        else:
-            self.removeVariantAttr(attrName)
+        data = self._serialize()
+        data['variantAttrs'] = list(self.getVariantAttrs())
+        return data
 
-    def addVariantAttr(self, attrName):
+    def serializeValues(self):
         """
-        Add an attribute to this variant.
-
-        Args:
-            attrName (str): The name of a BuildAction attribute
+        Return the serialized attribute values of this variant, without
+        the action id and variant attrs, which are stored on the proxy.
+        The returned data is shared with the proxy and must not be modified.
         """
-        if attrName in self._variantAttrs:
-            return
-
-        if not self.hasAttrConfig(attrName):
-            return
-
-        self._variantAttrs.append(attrName)
-        self._variantAttrs.sort()
+        return self._owner._serializeVariantAt(self._index)
 
-    def removeVariantAttr(self, attrName):
+    def deserialize(self, data):
         """
-        Remove an attribute from the list of variant attributes,
-        copying the value from the first variant into the default set
-        of attr values if applicable.
+        Set the values of this variant from data
 
         Args:
-            attrName (str): The name of an action attribute
+            data: A dict containing serialized values for this variant
         """
-        if attrName not in self._variantAttrs:
-            return
-
-        self._variantAttrs.remove(attrName)
-
-        if self.hasAttrValue(attrName):
-            self.delAttrValue(attrName)
-
-    def clearVariantAttrs(self):
-        """
-        Remove all variant attributes, copying the values
-        from the first variant into the default set of attr values
-        if applicable.
-        """
-        attrNames = self._variantAttrs[:]
-        for attrName in attrNames:
-            self.removeVariantAttr(attrName)
-
-    def serialize(self):
-        data = super(BuildActionDataVariant, self).serialize()
-        data['variantAttrs'] = self._variantAttrs
-        return data
-
-    def deserialize(self, data):
-        # must deserialize attrs first before attempting
-        # to set values in super deserialize
-        self._variantAttrs = data.get('variantAttrs', [])
-
-        super(BuildActionDataVariant, self).deserialize(data)
+        for attrName in self.getVariantAttrs():
+            if attrName in data:
+                self._attrValues[attrName] = data[attrName]
+        self.markDirty()
 
 
 class BuildActionProxy(BuildActionData):
@@ -857,16 +1659,28 @@ class BuildActionProxy(BuildActionData):
     values that are unique per variant need to be set, and the
     remaining attributes will be the same on all actions.
 
+    Variant values are stored in one list per variant attribute,
+    and are accessed per variant using `getVariant`, or for all
+    variants at once using `getVariantValues` and `setVariantValues`.
+
     The proxy provides a method `actionIterator` which performs the
     actual construction of BuildActions for use at build time.
     """
 
+    __slots__ = ('_variantAttrs', '_variantCount', '_variantValues',
+                 '_serializedVariants')
+
     def __init__(self, actionId=None):
         super(BuildActionProxy, self).__init__(actionId=actionId)
         # names of all attributes that are unique per variant
-        self._variantAttrs = []
-        # all BuildActionDataVariant instances in this proxy
-        self._variants = []
+        self._variantAttrs = _EMPTY_LIST
+        # the number of variants in this proxy
+        self._variantCount = 0
+        # lists of values for each variant attribute, with one item
+        # per variant, which is _NOVALUE if the variant has no value
+        self._variantValues = _EMPTY_DICT
+        # the cached serialized values of each variant, None when dirty
+        self._serializedVariants = _EMPTY_LIST
 
     def getDisplayName(self):
         """
@@ -934,9 +1748,13 @@ class BuildActionProxy(BuildActionData):
             return
 
         # add attr to variant attrs list
+        if self._variantAttrs is _EMPTY_LIST:
+            self._variantAttrs = []
+        if self._variantValues is _EMPTY_DICT:
+            self._variantValues = {}
         self._variantAttrs.append(attrName)
-        for variant in self._variants:
-            variant.addVariantAttr(attrName)
+        self._variantValues[attrName] = [_NOVALUE] * self._variantCount
+        self.markDirty()
 
         # if no variants exist, add one
         if self.numVariants() == 0:
@@ -947,10 +1765,8 @@ class BuildActionProxy(BuildActionData):
         if self.hasAttrValue(attrName):
             value = self.getAttrValue(attrName)
             self.delAttrValue(attrName)
-
-            for variant in self._variants:
-                if not variant.hasAttrValue(attrName):
-                    variant.setAttrValue(attrName, value)
+            self._variantValues[attrName][:] = [value] * self._variantCount
+            self._markAllVariantsDirty()
 
     def removeVariantAttr(self, attrName):
         """
@@ -966,22 +1782,23 @@ class BuildActionProxy(BuildActionData):
 
         # remove from attributes list
         self._variantAttrs.remove(attrName)
+        values = self._variantValues.pop(attrName)
+        if not self._variantAttrs:
+            self._variantAttrs = _EMPTY_LIST
+            self._variantValues = _EMPTY_DICT
+        self._markAllVariantsDirty()
 
         # transfer first variant value to the invariant values
-        if len(self._variants):
-            firstVariant = self._variants[0]
-            if firstVariant.hasAttrValue(attrName):
-                value = firstVariant.getAttrValue(attrName)
-                self.setAttrValue(attrName, value)
-
-        # remove attr from variant instances
-        for variant in self._variants:
-            variant.removeVariantAttr(attrName)
+        if values and values[0] is not _NOVALUE:
+            self.setAttrValue(attrName, values[0])
 
     def getVariantAttrs(self):
         """
         Return the list of all variant attribute names
         """
+        if self._variantAttrs is _EMPTY_LIST:
+            # don't expose the shared read-only list
+            return []
         return self._variantAttrs
 
     def clearVariantAttrs(self):
@@ -994,50 +1811,77 @@ class BuildActionProxy(BuildActionData):
         for attrName in attrNames:
             self.removeVariantAttr(attrName)
 
-    def _createVariant(self):
+    def _markVariantDirty(self, index):
+        """
+        Clear the cached serialized data of a variant and this proxy.
+        """
+        self._serializedVariants[index] = None
+        self.markDirty()
+
+    def _markAllVariantsDirty(self):
+        self._serializedVariants = [None] * self._variantCount or _EMPTY_LIST
+        self.markDirty()
+
+    def _getVariantIndex(self, index):
         """
-        Return a new BuildActionDataVariant instance
-        for use with this action proxy.
+        Return a positive variant index, raising an IndexError
+        if the index is out of range.
         """
-        variant = BuildActionDataVariant(actionId=self._actionId)
-        for attrName in self._variantAttrs:
-            variant.addVariantAttr(attrName)
-        return variant
+        if index < 0:
+            index += self._variantCount
+        if index < 0 or index >= self._variantCount:
+            raise IndexError('variant index out of range')
+        return index
 
     def getVariant(self, index):
         """
         Return the BuildActionDataVariant instance at an index
         """
-        return self._variants[index]
+        return BuildActionDataVariant(self, self._getVariantIndex(index))
 
     def getOrCreateVariant(self, index):
-        if index >= 0:
-            while self.numVariants() <= index:
-                self.addVariant()
+        if index >= 0 and self._variantCount <= index:
+            self._insertVariants(self._variantCount,
+                                 index + 1 - self._variantCount)
         return self.getVariant(index)
 
     def numVariants(self):
         """
         Return how many variants exist on this action proxy
         """
-        return len(self._variants)
+        return self._variantCount
+
+    def _insertVariants(self, index, count):
+        """
+        Insert a number of variants without any attribute values.
+        """
+        if count <= 0:
+            return
+        for values in self._variantValues.values():
+            values[index:index] = [_NOVALUE] * count
+        if self._serializedVariants is _EMPTY_LIST:
+            self._serializedVariants = []
+        self._serializedVariants[index:index] = [None] * count
+        self._variantCount += count
+        self.markDirty()
 
     def addVariant(self):
         """
-        Add a variant of attribute values. Does nothing if there
-        are no variant attributes.
+        Add a variant of attribute values.
         """
-        self._variants.append(self._createVariant())
+        self._insertVariants(self._variantCount, 1)
 
     def insertVariant(self, index):
         """
-        Insert a variant of attribute values. Does nothing if there
-        are no variant attributes.
+        Insert a variant of attribute values.
 
         Args:
             index (int): The index at which to insert the new variant
         """
-        self._variants.insert(index, self._createVariant())
+        # match the behavior of list.insert
+        if index < 0:
+            index = max(index + self._variantCount, 0)
+        self._insertVariants(min(index, self._variantCount), 1)
 
     def removeVariantAt(self, index):
         """
@@ -1046,46 +1890,205 @@ class BuildActionProxy(BuildActionData):
         Args:
             index (int): The index at which to remove the variant
         """
-        count = len(self._variants)
+        count = self._variantCount
         if index >= -count and index < count:
-            del self._variants[index]
+            for values in self._variantValues.values():
+                del values[index]
+            del self._serializedVariants[index]
+            self._variantCount -= 1
+            self.markDirty()
 
     def clearVariants(self):
         """
         Remove all variant instances.
         Does not clear the list of variant attributes.
         """
-        self._variants = []
+        for values in self._variantValues.values():
+            del values[:]
+        self._serializedVariants = _EMPTY_LIST
+        self._variantCount = 0
+        self.markDirty()
 
-    def serialize(self):
-        data = super(BuildActionProxy, self).serialize()
+    def getVariantValues(self, attrName):
+        """
+        Return a list of the values of a variant attribute for all
+        variants, with None for variants that don't have a value.
+
+        Args:
+            attrName (str): The name of a variant attribute
+        """
+        values = self._variantValues.get(attrName)
+        if values is None:
+            return []
+        return [None if v is _NOVALUE else v for v in values]
+
+    def setVariantValues(self, attrName, values):
+        """
+        Set the values of a variant attribute for multiple variants at
+        once, starting with the first variant. Variants are added as
+        needed, and a value of None removes the value from a variant.
+
+        Args:
+            attrName (str): The name of a variant attribute
+            values (list): The values for each variant
+        """
+        if attrName not in self._variantValues:
+            LOG.warning("Cannot set variant values for {0}, it is not "
+                        "a variant attribute".format(attrName))
+            return
+
+        values = [_NOVALUE if v is None else v for v in values]
+        if not values:
+            return
+        if len(values) > self._variantCount:
+            self._insertVariants(
+                self._variantCount, len(values) - self._variantCount)
+        self._variantValues[attrName][:len(values)] = values
+        self._serializedVariants[:len(values)] = [None] * len(values)
+        self.markDirty()
+
+    def _getVariantAttrNames(self):
+        """
+        Return the names of all variant attributes that are in the
+        config, in the order they are serialized.
+        """
+        if not self.hasConfig():
+            return []
+        return [n for n in self._schema.attrNames if n in self._variantValues]
+
+    def _serializeVariantAt(self, index):
+        """
+        Return the serialized attribute values of a variant,
+        caching the result until the variant is modified.
+        """
+        data = self._serializedVariants[index]
+        if data is None:
+            data = UnsortableOrderedDict()
+            for attrName in self._getVariantAttrNames():
+                value = self._variantValues[attrName][index]
+                if value is not _NOVALUE:
+                    data[attrName] = value
+            self._serializedVariants[index] = data
+        return data
+
+    def _serialize(self):
+        data = super(BuildActionProxy, self)._serialize()
         if self._variantAttrs:
-            data['variantAttrs'] = self._variantAttrs
-        if self._variants:
-            data['variants'] = [
-                self.serializeVariant(v) for v in self._variants]
+            # copied, since the cached data must not change
+            data['variantAttrs'] = list(self._variantAttrs)
+        if self._variantCount:
+            data['variants'] = [self._serializeVariantAt(i)
+                                for i in xrange(self._variantCount)]
         return data
 
     def deserialize(self, data):
         super(BuildActionProxy, self).deserialize(data)
-        self._variantAttrs = data.get('variantAttrs', [])
-        self._variants = [
-            self.deserializeVariant(v) for v in data.get('variants', [])]
+        self._variantAttrs = list(data.get('variantAttrs', [])) or _EMPTY_LIST
+        variantsData = data.get('variants', [])
+        self._variantCount = len(variantsData)
+        self._variantValues = dict([
+            (attrName, [v.get(attrName, _NOVALUE) for v in variantsData])
+            for attrName in self._variantAttrs]) or _EMPTY_DICT
+        self._serializedVariants = [None] * self._variantCount or _EMPTY_LIST
+        self.markDirty()
+
+    def applyDelta(self, delta, reverse=False):
+        """
+        Apply a delta of changes to the serialized data of this proxy,
+        such as one created using `pulse.core.diffData`.
+
+        Changes to attribute values are applied directly to the values,
+        and any other changes, such as to the variant attributes, are
+        applied by patching and deserializing all data of the proxy.
+
+        Args:
+            delta (list): A delta of this proxy's serialized data
+            reverse (bool): If True, undo the changes of the delta
+
+        Raises:
+            ValueError: If the data of this proxy does not match the delta
+        """
+        if reverse:
+            delta = deltas.reverseDelta(delta)
+
+        changes = [self._getValueChange(change) for change in delta]
+        if None in changes:
+            self.deserialize(deltas.patchData(self.serialize(), delta))
+            return
+
+        for variantIndex, attrName, change in changes:
+            if variantIndex == 'column':
+                self.setVariantValues(attrName, [
+                    None if v is deltas.NOVALUE else _copyValue(v)
+                    for v in change])
+                continue
+
+            if variantIndex is None:
+                actionData = self
+            else:
+                actionData = self.getVariant(variantIndex)
+            if change[0] == 'value':
+                value = change[1]
+                value = None if value is deltas.NOVALUE else _copyValue(value)
+            else:
+                # a change within the value, e.g. to an item of a list
+                value = deltas.patchData(
+                    actionData.getAttrValue(attrName), [change])
+            actionData.setAttrValue(attrName, value)
+
+    def _getValueChange(self, change):
+        """
+        Return (variantIndex, attrName, change) for a change from a delta
+        that only modifies the value of an attribute, or None if the
+        change modifies anything else. The variant index is None for
+        invariant values, and 'column' for a change to all variants.
+        """
+        op, path, key, oldValue, newValue = change
+        if not self.hasConfig():
+            return
+        if path[:1] == ('variants',):
+            if op == 'column' and len(path) == 1:
+                if (key in self._variantValues and
+                        len(newValue) == self._variantCount):
+                    return 'column', key, newValue
+                return
+            if (len(path) < 2 or not isinstance(path[1], (int, long)) or
+                    not 0 <= path[1] < self._variantCount):
+                return
+            variantIndex = path[1]
+            path = path[2:]
+            isVariant = True
+        else:
+            variantIndex = None
+            isVariant = False
+
+        if path:
+            attrName = path[0]
+            change = (op, path[1:], key, oldValue, newValue)
+        elif op == 'set':
+            attrName = key
+            change = ('value', newValue)
+        else:
+            return
+        if (not self._schema.hasAttr(attrName) or
+                (attrName in self._variantValues) != isVariant):
+            return
+        return variantIndex, attrName, change
 
     def serializeVariant(self, variant):
-        data = variant.serialize()
-        # prune unnecessary data from the variant for optimization
-        del data['id']
-        del data['variantAttrs']
-        return data
+        return variant.serializeValues()
 
-    def deserializeVariant(self, data):
-        variant = BuildActionDataVariant()
-        # add necessary additional data for deserializing the variant
-        data['id'] = self._actionId
-        data['variantAttrs'] = self._variantAttrs
-        variant.deserialize(data)
-        return variant
+    def _getVariantActionValues(self, index):
+        """
+        Return the attribute values of a variant to
+        use when creating BuildActions.
+        """
+        result = {}
+        for attrName in self._getVariantAttrNames():
+            value = self._variantValues[attrName][index]
+            if value is not _NOVALUE:
+                result[attrName] = value
+        return result
 
     def actionIterator(self):
         """
@@ -1101,18 +2104,18 @@ class BuildActionProxy(BuildActionData):
                         LOG.warning("Found invariant value for a variant attr: "
                                     "{0}.{1}".format(self.getActionId(), attrName))
 
-                # create and yield new build actions for each variant
-                mainData = self.serialize()
-                for variant in self._variants:
-                    # TODO: update serialization to ensure variants only return
-                    #       data for the attributes they're supposed to modify
-                    data = variant.serialize()
-                    data.update(_copyData(mainData))
-                    newAction = BuildAction.fromData(data)
-                    yield newAction
+                # create and yield new build actions for each variant,
+                # all sharing the same invariant values. values are
+                # snapshotted so later edits don't affect the actions
+                mainValues = self._getActionValues()
+                for index in xrange(self._variantCount):
+                    yield BuildAction.fromSharedValues(
+                        self._actionId, mainValues,
+                        self._getVariantActionValues(index))
             else:
                 # no variants, just create one action
-                yield BuildAction.fromData(_copyData(self.serialize()))
+                yield BuildAction.fromSharedValues(
+                    self._actionId, self._getActionValues())
 
 
 class BuildAction(BuildActionData):
@@ -1123,6 +2126,12 @@ class BuildAction(BuildActionData):
     provide functionality when checking and building the rig.
     """
 
+    # whether `validate` accesses the scene, validators that only check
+    # attribute values can run concurrently, see `BlueprintChecker`.
+    # The truth value of a node checks that it exists, so such validators
+    # must compare nodes to None instead
+    validateUsesScene = True
+
     @staticmethod
     def fromActionId(actionId):
         """
@@ -1138,6 +2147,26 @@ class BuildAction(BuildActionData):
         else:
             LOG.error("Failed to find BuildAction class: {0}".format(actionId))
 
+    @staticmethod
+    def fromSharedValues(actionId, *sharedValues):
+        """
+        Create and return a BuildAction that uses shared attribute values.
+        The values are not copied or modified, any mutable values are only
+        copied once they are accessed, see `_CopyOnWriteAttrValues`.
+
+        Args:
+            actionId (str): A BuildAction id
+            *sharedValues (dict): Dicts of attribute values, in order
+                of precedence, that should not be modified
+        """
+        actionClass = getBuildActionClass(actionId)
+        if actionClass:
+            item = actionClass()
+            item._attrValues = _CopyOnWriteAttrValues(*sharedValues)
+            return item
+        else:
+            LOG.error("Failed to find BuildAction class: {0}".format(actionId))
+
     @staticmethod
     def fromData(data):
         """
@@ -1172,9 +2201,11 @@ class BuildAction(BuildActionData):
         self.rig = None
 
         # pull action name from the class name
-        self._config = _getBuildActionConfigForClass(self.__class__)
-        if self._config:
-            self._actionId = self.config['id']
+        action = _getRegisteredActionForClass(self.__class__)
+        if action:
+            self._config = action['config']
+            self._schema = action['schema']
+            self._actionId = self._config['id']
         else:
             LOG.warning("Constructed an unregistered BuildAction: {0}, "
                         "cannot retrieve config".format(self.__class__.__name__))
@@ -1184,12 +2215,12 @@ class BuildAction(BuildActionData):
         return "<{0}>".format(self.__class__.__name__)
 
     def __getattr__(self, name):
-        attrConfig = self.getAttrConfig(name)
-        if attrConfig:
+        schema = self._schema
+        if schema is not None and name in schema.attrsByName:
             if name in self._attrValues:
                 return self._attrValues[name]
             else:
-                return self.getAttrDefaultValue(attrConfig)
+                return schema.getAttrDefaultValue(name)
         else:
             raise AttributeError(
                 "'{0}' object has no attribute '{1}'".format(type(self).__name__, name))
@@ -1233,6 +2264,69 @@ class BuildAction(BuildActionData):
             return
         meta.updateMetaData(self.rig, RIG_METACLASS, data)
 
+    def getSceneDependencies(self):
+        """
+        Return the scene nodes and other resources that this action reads
+        and writes, used to determine which actions depend on each other.
+
+        By default, uses the optional 'inputs' and 'outputs' lists of the
+        action config, which contain attribute names or resource names,
+        where '*' is the whole scene. Node attributes that are not declared
+        are both read and written. Actions that declare nothing and have
+        no node attributes affect the whole scene.
+
+        Returns:
+            A tuple of (inputs, outputs) lists, containing
+            nodes and str resource names
+        """
+        schema = self._schema
+        if schema is None:
+            return [], ['*']
+        declaredInputs = schema.config.get('inputs')
+        declaredOutputs = schema.config.get('outputs')
+        if (declaredInputs is None and declaredOutputs is None and
+                not schema.nodeAttrNames):
+            return [], ['*']
+
+        declaredInputs = declaredInputs or []
+        declaredOutputs = declaredOutputs or []
+        inputs = []
+        outputs = []
+        for names, result in ((declaredInputs, inputs),
+                              (declaredOutputs, outputs)):
+            for name in names:
+                if name in schema.attrsByName:
+                    result.extend(self._getNodeValues(name))
+                else:
+                    result.append(name)
+        for name in schema.nodeAttrNames:
+            if name not in declaredInputs and name not in declaredOutputs:
+                nodes = self._getNodeValues(name)
+                inputs.extend(nodes)
+                outputs.extend(nodes)
+        return inputs, outputs
+
+    def getSourceFiles(self):
+        """
+        Return the paths of any files that this action reads, such as
+        imported scenes or weights files, used to determine when a cached
+        build is out of date, see `BuildCache`. Should be implemented in
+        subclasses that read files.
+
+        Returns:
+            A list of str file paths
+        """
+        return []
+
+    def _getNodeValues(self, attrName):
+        """
+        Return a list of the nodes referenced by a node or nodelist attribute
+        """
+        value = getattr(self, attrName)
+        if isinstance(value, list):
+            return [v for v in value if v is not None]
+        return [value] if value is not None else []
+
     def validate(self):
         """
         Validate this build action. Should be implemented
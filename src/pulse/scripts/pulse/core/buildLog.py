@@ -0,0 +1,197 @@
+"""
+Writing build logs on a background thread, so that slow
+log files don't add latency to each build action.
+"""
+
+import copy
+import json
+import logging
+import threading
+
+try:
+    import queue
+except ImportError:
+    import Queue as queue
+
+__all__ = [
+    'BuildLogWriter',
+    'JsonLinesHandler',
+    'ParentLogHandler',
+]
+
+LOG = logging.getLogger(__name__)
+
+
+class _QueueHandler(logging.Handler):
+    """
+    Sends log records to a queue, formatting their messages first
+    so that they don't depend on any state that may change later.
+
+    Matches `logging.handlers.QueueHandler` in Python 3.
+    """
+
+    def __init__(self, queue):
+        logging.Handler.__init__(self)
+        self.queue = queue
+
+    def prepare(self, record):
+        msg = self.format(record)
+        # copy the record, other handlers may still receive the original
+        record = copy.copy(record)
+        record.message = msg
+        record.msg = msg
+        record.args = None
+        record.exc_info = None
+        record.exc_text = None
+        return record
+
+    def emit(self, record):
+        try:
+            self.queue.put_nowait(self.prepare(record))
+        except Exception:
+            self.handleError(record)
+
+
+class _QueueListener(object):
+    """
+    Dispatches log records from a queue to handlers on a background thread.
+
+    Matches `logging.handlers.QueueListener` in Python 3,
+    always respecting the level of each handler.
+    """
+
+    _sentinel = None
+
+    def __init__(self, queue, *handlers, **kwargs):
+        self.queue = queue
+        self.handlers = handlers
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._monitor)
+        self._thread.daemon = True
+        self._thread.start()
+
+    def handle(self, record):
+        for handler in self.handlers:
+            if record.levelno >= handler.level:
+                handler.handle(record)
+
+    def _monitor(self):
+        while True:
+            record = self.queue.get()
+            if record is self._sentinel:
+                break
+            self.handle(record)
+
+    def stop(self):
+        self.queue.put_nowait(self._sentinel)
+        self._thread.join()
+        self._thread = None
+
+
+try:
+    from logging.handlers import QueueHandler, QueueListener
+except ImportError:
+    QueueHandler = _QueueHandler
+    QueueListener = _QueueListener
+
+
+class JsonLinesHandler(logging.FileHandler):
+    """
+    Writes one json object per line for each record that has
+    an 'action' attribute, such as those logged by `BlueprintBuilder`
+    after running each action. All other records are ignored.
+    """
+
+    def __init__(self, filename, mode='a', delay=True):
+        logging.FileHandler.__init__(self, filename, mode, delay=delay)
+
+    def filter(self, record):
+        if not isinstance(getattr(record, 'action', None), dict):
+            return False
+        return logging.FileHandler.filter(self, record)
+
+    def format(self, record):
+        return json.dumps(record.action, sort_keys=True)
+
+
+class ParentLogHandler(logging.Handler):
+    """
+    Passes records to the parent of a logger that doesn't propagate,
+    so that only records of this handler's level are handled by the
+    parent loggers, such as those that print to the console.
+    """
+
+    def __init__(self, logger, level=logging.WARNING):
+        logging.Handler.__init__(self, level)
+        self.logger = logger
+
+    def emit(self, record):
+        parent = self.logger.parent
+        if parent is not None and parent.isEnabledFor(record.levelno):
+            parent.handle(record)
+
+
+class BuildLogWriter(object):
+    """
+    Writes the log of a build to a text file, and optionally a json
+    lines file of action results, on a background thread.
+
+    Attach `handler` to the build logger, then call `start` before
+    building and `stop` afterwards, which waits for all records to
+    be written and closes the files.
+    """
+
+    def __init__(self, logFile, jsonFile=None):
+        """
+        Args:
+            logFile (str): The path of the text log file
+            jsonFile (str): The path of an optional json lines file,
+                see `JsonLinesHandler`
+        """
+        self.logFile = logFile
+        self.jsonFile = jsonFile
+
+        fileHandler = logging.FileHandler(logFile, delay=True)
+        fileHandler.setLevel(logging.DEBUG)
+        fileHandler.setFormatter(logging.Formatter(
+            '%(asctime)s %(levelname)s %(name)s: %(message)s'))
+        self.handlers = [fileHandler]
+        if jsonFile:
+            self.handlers.append(JsonLinesHandler(jsonFile))
+
+        self.queue = queue.Queue()
+        # the handler to attach to the build logger
+        self.handler = QueueHandler(self.queue)
+        self.listener = None
+
+    @property
+    def isRunning(self):
+        return self.listener is not None
+
+    def start(self):
+        """
+        Start writing records on a background thread.
+        """
+        if self.listener:
+            return
+        try:
+            self.listener = QueueListener(
+                self.queue, *self.handlers, respect_handler_level=True)
+        except TypeError:
+            # python 3.4 and earlier
+            self.listener = QueueListener(self.queue, *self.handlers)
+        self.listener.start()
+
+    def stop(self):
+        """
+        Write all remaining records, stop the background thread,
+        and close all files.
+        """
+        if not self.listener:
+            return
+        self.listener.stop()
+        self.listener = None
+        for handler in self.handlers:
+            handler.close()
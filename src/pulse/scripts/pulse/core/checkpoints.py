@@ -0,0 +1,169 @@
+"""
+Scene snapshots saved during a build, used to resume later builds
+of the same blueprint from the first step that changed.
+"""
+
+import os
+import hashlib
+import logging
+import tempfile
+
+import maya.cmds as cmds
+
+from .binaryFormat import dumpBinary
+from .. import version
+
+__all__ = [
+    'BuildCheckpoints',
+    'saveSceneCopy',
+]
+
+LOG = logging.getLogger(__name__)
+
+
+def saveSceneCopy(path):
+    """
+    Save a copy of the current scene as a maya binary file,
+    without changing the scene's name.
+    """
+    dirName = os.path.dirname(path)
+    if not os.path.isdir(dirName):
+        os.makedirs(dirName)
+    sceneName = cmds.file(q=True, sceneName=True)
+    # write to a temp file first, so a failed save
+    # never leaves a partial file behind
+    tempPath = path + '.tmp.mb'
+    cmds.file(rename=tempPath)
+    try:
+        cmds.file(save=True, type='mayaBinary', force=True)
+    finally:
+        if sceneName:
+            cmds.file(rename=sceneName)
+        # the scene still contains unsaved changes
+        cmds.file(modified=True)
+    if os.path.isfile(path):
+        os.remove(path)
+    os.rename(tempPath, path)
+
+
+class BuildCheckpoints(object):
+    """
+    A directory of scene snapshots for one rig, saved after top-level
+    steps of a build. Each snapshot is keyed by a hash of the source
+    scene and the blueprint steps up to and including that step, so a
+    snapshot is only restored when nothing that was built before it
+    has changed.
+
+    The source scene is identified by the path, size and modification
+    time of its file, so any unsaved changes to the scene are not
+    detected, and builds of a modified scene don't use checkpoints.
+    """
+
+    def __init__(self, rigName, cacheDir=None):
+        """
+        Args:
+            rigName (str): The name of the rig being built
+            cacheDir (str): The directory in which to store snapshots
+                of all rigs, defaults to a 'pulse_checkpoints'
+                directory in the temp directory
+        """
+        if not cacheDir:
+            cacheDir = os.path.join(
+                tempfile.gettempdir(), 'pulse_checkpoints')
+        self.rigDir = os.path.join(cacheDir, rigName)
+
+    @staticmethod
+    def getSourceHash(sceneFile):
+        """
+        Return a hash identifying the current state of a scene file,
+        or None if the file doesn't exist.
+        """
+        if not sceneFile or not os.path.isfile(sceneFile):
+            return None
+        stat = os.stat(sceneFile)
+        key = '{0}|{1}|{2}'.format(
+            os.path.normcase(os.path.realpath(sceneFile)),
+            stat.st_size, stat.st_mtime)
+        return hashlib.sha1(key).hexdigest()
+
+    @staticmethod
+    def getStepHashes(blueprint, sourceHash):
+        """
+        Return a list of hashes, one for each top-level step of a
+        blueprint, that identify the state of the scene after the step
+        has been built.
+
+        Args:
+            blueprint (Blueprint): The blueprint being built
+            sourceHash (str): The hash of the source scene,
+                see `getSourceHash`
+        """
+        prefixHash = hashlib.sha1('{0}|{1}|{2}'.format(
+            version.__version__, blueprint.rigName, sourceHash))
+        hashes = []
+        for step in blueprint.rootStep.children:
+            prefixHash.update(dumpBinary(step.serialize()))
+            hashes.append(prefixHash.copy().hexdigest())
+        return hashes
+
+    def getPath(self, stepHash):
+        """
+        Return the path of the snapshot for a step hash
+        """
+        return os.path.join(self.rigDir, stepHash + '.mb')
+
+    def findLatest(self, stepHashes):
+        """
+        Return the index of the last step hash that has a snapshot,
+        or -1 if there is none.
+        """
+        for index in reversed(range(len(stepHashes))):
+            if os.path.isfile(self.getPath(stepHashes[index])):
+                return index
+        return -1
+
+    def save(self, stepHash):
+        """
+        Save a snapshot of the current scene, without
+        changing the scene's name.
+        """
+        path = self.getPath(stepHash)
+        saveSceneCopy(path)
+        LOG.debug("Saved checkpoint: {0}".format(path))
+
+    def restore(self, stepHash, sceneName):
+        """
+        Open a snapshot, and rename the scene so that it
+        will not be saved over the snapshot.
+
+        Args:
+            stepHash (str): The step hash of the snapshot
+            sceneName (str): The name to give the restored scene
+        """
+        path = self.getPath(stepHash)
+        cmds.file(path, open=True, force=True)
+        cmds.file(rename=sceneName)
+        LOG.debug("Restored checkpoint: {0}".format(path))
+
+    def clean(self, keepHashes):
+        """
+        Delete all snapshots of the rig other than those for the given
+        step hashes, so that only the snapshots of the latest build
+        are kept.
+        """
+        if not os.path.isdir(self.rigDir):
+            return
+        keepFiles = set([stepHash + '.mb' for stepHash in keepHashes])
+        for fileName in os.listdir(self.rigDir):
+            if fileName not in keepFiles:
+                try:
+                    os.remove(os.path.join(self.rigDir, fileName))
+                except OSError as error:
+                    LOG.warning(
+                        "Failed to remove checkpoint: {0}".format(error))
+
+    def clear(self):
+        """
+        Delete all snapshots of the rig
+        """
+        self.clean([])
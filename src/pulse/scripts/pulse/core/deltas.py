@@ -0,0 +1,400 @@
+"""
+Structural diffs of serialized blueprint data, and a bounded
+journal of diffs for use by undoable commands.
+
+A delta is a list of changes, each a tuple of
+(op, path, key, oldValue, newValue):
+
+    set         container at path has key changed from oldValue to
+                newValue, either of which may be NOVALUE for a dict key
+                that is added or removed
+    splice      list at path has the items oldValue at index key
+                replaced with the items newValue
+    column      list of dicts at path has key changed in every dict,
+                from the list oldValue to the list newValue, which
+                contain one value (or NOVALUE) per dict
+
+where path is a tuple of the keys and indeces leading to the container.
+Only the parts of the data that changed are stored, and deltas
+can be applied in either direction using `patchData`.
+"""
+
+import sys
+import logging
+from collections import OrderedDict
+
+__all__ = [
+    'diffData',
+    'getDataSize',
+    'patchData',
+    'reverseDelta',
+    'UndoJournal',
+]
+
+LOG = logging.getLogger(__name__)
+
+
+class _NoValue(object):
+    """
+    Placeholder for a dict key that doesn't exist
+    """
+
+    def __repr__(self):
+        return 'NOVALUE'
+
+    def __reduce__(self):
+        return 'NOVALUE'
+
+
+NOVALUE = _NoValue()
+
+
+def _copyData(value):
+    """
+    Return a copy of serialized data, so that a delta is not
+    affected by later modifications of the original data.
+    """
+    if isinstance(value, list):
+        return [_copyData(v) for v in value]
+    elif isinstance(value, dict):
+        result = value.__class__()
+        for k, v in value.items():
+            result[k] = _copyData(v)
+        return result
+    return value
+
+
+def diffData(oldData, newData):
+    """
+    Return a delta of the changes needed to turn oldData into newData.
+
+    Dicts are compared by key, lists of the same length are compared
+    by index, and lists of different lengths are compared by trimming
+    any common items from the start and end, and replacing the rest.
+    When a key changes in many dicts of a list, such as a variant
+    attribute, the change is stored as one column of values.
+
+    Args:
+        oldData: Serialized data made of dicts, lists, and other values
+        newData: Serialized data made of dicts, lists, and other values
+
+    Returns:
+        A list of changes, empty if the data is the same
+    """
+    delta = []
+    _diffValues(delta, (), oldData, newData)
+    return delta
+
+
+def _diffValues(delta, path, oldValue, newValue):
+    if isinstance(oldValue, dict) and isinstance(newValue, dict):
+        for key, value in oldValue.items():
+            if key in newValue:
+                _diffItem(delta, path, key, value, newValue[key])
+            else:
+                delta.append(('set', path, key, _copyData(value), NOVALUE))
+        for key, value in newValue.items():
+            if key not in oldValue:
+                delta.append(('set', path, key, NOVALUE, _copyData(value)))
+
+    elif isinstance(oldValue, list) and isinstance(newValue, list):
+        if len(oldValue) == len(newValue):
+            if _isDictList(oldValue) and _isDictList(newValue):
+                _diffDictList(delta, path, oldValue, newValue)
+            else:
+                for index, (oldItem, newItem) in enumerate(
+                        zip(oldValue, newValue)):
+                    _diffItem(delta, path, index, oldItem, newItem)
+        else:
+            # trim common items, and replace the remaining range
+            start = 0
+            count = min(len(oldValue), len(newValue))
+            while start < count and _isSame(oldValue[start], newValue[start]):
+                start += 1
+            oldEnd = len(oldValue)
+            newEnd = len(newValue)
+            while (oldEnd > start and newEnd > start and
+                   _isSame(oldValue[oldEnd - 1], newValue[newEnd - 1])):
+                oldEnd -= 1
+                newEnd -= 1
+            delta.append(('splice', path, start,
+                          _copyData(oldValue[start:oldEnd]),
+                          _copyData(newValue[start:newEnd])))
+
+
+def _diffItem(delta, path, key, oldValue, newValue):
+    if _isSame(oldValue, newValue):
+        return
+    if ((isinstance(oldValue, dict) and isinstance(newValue, dict)) or
+            (isinstance(oldValue, list) and isinstance(newValue, list))):
+        _diffValues(delta, path + (key,), oldValue, newValue)
+    else:
+        delta.append(('set', path, key,
+                      _copyData(oldValue), _copyData(newValue)))
+
+
+def _isDictList(value):
+    return len(value) > 1 and all([isinstance(v, dict) for v in value])
+
+
+def _diffDictList(delta, path, oldValue, newValue):
+    """
+    Diff two lists of dicts of the same length, storing keys
+    that changed in at least half of the dicts as columns.
+    """
+    changedKeys = {}
+    for index, (oldItem, newItem) in enumerate(zip(oldValue, newValue)):
+        if oldItem is newItem:
+            continue
+        for key in set(oldItem) | set(newItem):
+            if not _isSame(oldItem.get(key, NOVALUE),
+                           newItem.get(key, NOVALUE)):
+                changedKeys.setdefault(key, []).append(index)
+
+    rowKeys = [set() for _ in oldValue]
+    for key, indeces in sorted(changedKeys.items()):
+        if len(indeces) * 2 >= len(oldValue):
+            delta.append(('column', path, key,
+                          [_copyData(v.get(key, NOVALUE)) for v in oldValue],
+                          [_copyData(v.get(key, NOVALUE)) for v in newValue]))
+        else:
+            for index in indeces:
+                rowKeys[index].add(key)
+
+    for index, keys in enumerate(rowKeys):
+        oldItem = oldValue[index]
+        newItem = newValue[index]
+        for key in sorted(keys):
+            oldItemValue = oldItem.get(key, NOVALUE)
+            newItemValue = newItem.get(key, NOVALUE)
+            if oldItemValue is NOVALUE or newItemValue is NOVALUE:
+                delta.append(('set', path + (index,), key,
+                              _copyData(oldItemValue),
+                              _copyData(newItemValue)))
+            else:
+                _diffItem(delta, path + (index,), key,
+                          oldItemValue, newItemValue)
+
+
+def _isSame(oldValue, newValue):
+    # serialized data is often shared, so check identity first
+    if oldValue is newValue:
+        return True
+    if type(oldValue) is not type(newValue):
+        # avoid treating e.g. True and 1 as the same value
+        return False
+    return oldValue == newValue
+
+
+def reverseDelta(delta):
+    """
+    Return a delta that undoes the changes of another delta.
+    """
+    return [(op, path, key, newValue, oldValue)
+            for op, path, key, oldValue, newValue in reversed(delta)]
+
+
+def patchData(data, delta, reverse=False):
+    """
+    Return a copy of data with the changes of a delta applied.
+
+    The data is not modified, only the containers along the path to
+    each change are copied, and the rest of the data is shared.
+
+    Args:
+        data: Serialized data to patch
+        delta (list): A delta created by `diffData`
+        reverse (bool): If True, undo the changes of the delta
+
+    Raises:
+        ValueError: If the data does not match the delta
+    """
+    if reverse:
+        delta = reverseDelta(delta)
+
+    root = [data]
+    # ids of containers that have already been copied
+    copiedIds = set()
+
+    def getContainer(path):
+        parent = root
+        key = 0
+        for nextKey in path:
+            parent = _getCopiedItem(parent, key, copiedIds)
+            key = nextKey
+        return _getCopiedItem(parent, key, copiedIds)
+
+    for op, path, key, oldValue, newValue in delta:
+        try:
+            container = getContainer(path)
+        except (KeyError, IndexError, TypeError):
+            raise ValueError(
+                "Data does not match delta, path not found: {0}".format(path))
+
+        if op == 'set':
+            if isinstance(container, dict):
+                if newValue is NOVALUE:
+                    container.pop(key, None)
+                else:
+                    container[key] = _copyData(newValue)
+            elif 0 <= key < len(container):
+                container[key] = _copyData(newValue)
+            else:
+                raise ValueError(
+                    "Data does not match delta, index out of "
+                    "range: {0}[{1}]".format(path, key))
+
+        elif op == 'splice':
+            end = key + len(oldValue)
+            if not isinstance(container, list) or end > len(container):
+                raise ValueError(
+                    "Data does not match delta, cannot splice "
+                    "{0}[{1}:{2}]".format(path, key, end))
+            container[key:end] = _copyData(newValue)
+
+        elif op == 'column':
+            if (not isinstance(container, list) or
+                    len(container) != len(newValue)):
+                raise ValueError(
+                    "Data does not match delta, cannot set column "
+                    "{0}[*][{1}]".format(path, key))
+            for index, value in enumerate(newValue):
+                item = _getCopiedItem(container, index, copiedIds)
+                if value is NOVALUE:
+                    item.pop(key, None)
+                else:
+                    item[key] = _copyData(value)
+
+        else:
+            raise ValueError("Invalid delta op: {0}".format(op))
+
+    return root[0]
+
+
+def _getCopiedItem(container, key, copiedIds):
+    """
+    Return an item from a container, replacing it with
+    a shallow copy first if it hasn't been copied already.
+    """
+    value = container[key]
+    if id(value) not in copiedIds:
+        if isinstance(value, dict):
+            value = value.__class__(value)
+        elif isinstance(value, list):
+            value = list(value)
+        else:
+            raise TypeError("Expected a dict or list")
+        container[key] = value
+        copiedIds.add(id(value))
+    return value
+
+
+def getDataSize(data):
+    """
+    Return the approximate size in bytes of serialized data,
+    including all nested values.
+    """
+    size = 0
+    seen = set()
+    stack = [data]
+    while stack:
+        value = stack.pop()
+        if id(value) in seen:
+            continue
+        seen.add(id(value))
+        size += sys.getsizeof(value)
+        if isinstance(value, dict):
+            stack.extend(value.keys())
+            stack.extend(value.values())
+        elif isinstance(value, (list, tuple)):
+            stack.extend(value)
+    return size
+
+
+class UndoJournal(object):
+    """
+    A bounded collection of deltas, recorded by undoable commands.
+
+    Commands store only the id of their entry, and retrieve the delta
+    when undoing or redoing. Commands may also record other compact undo
+    data, such as an encoded attribute value. When the journal exceeds
+    its maximum number of entries or total size, the oldest entries are
+    discarded, and commands whose entries are gone fail to undo.
+    """
+
+    def __init__(self, maxEntries=1000, maxSize=64 * 1024 * 1024):
+        """
+        Args:
+            maxEntries (int): The maximum number of deltas to keep
+            maxSize (int): The maximum approximate size in bytes
+                of all deltas to keep
+        """
+        self.maxEntries = maxEntries
+        self.maxSize = maxSize
+        # map of entry ids to (delta, size), oldest first
+        self._entries = OrderedDict()
+        self._nextId = 1
+        self._size = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, entryId):
+        return entryId in self._entries
+
+    def getSize(self):
+        """
+        Return the approximate size in bytes of all deltas in the journal
+        """
+        return self._size
+
+    def record(self, delta):
+        """
+        Add a delta to the journal, discarding old entries if needed.
+
+        Args:
+            delta (list): A delta created by `diffData`, or any
+                other serialized undo data
+
+        Returns:
+            The int id of the new entry
+        """
+        entryId = self._nextId
+        self._nextId += 1
+        size = getDataSize(delta)
+        self._entries[entryId] = (delta, size)
+        self._size += size
+        self._trim()
+        return entryId
+
+    def get(self, entryId):
+        """
+        Return the delta of an entry, or None if it has been discarded.
+        """
+        entry = self._entries.get(entryId)
+        if entry is not None:
+            return entry[0]
+
+    def discard(self, entryId):
+        """
+        Remove an entry from the journal, if it exists.
+        """
+        entry = self._entries.pop(entryId, None)
+        if entry is not None:
+            self._size -= entry[1]
+
+    def clear(self):
+        """
+        Remove all entries from the journal.
+        """
+        self._entries.clear()
+        self._size = 0
+
+    def _trim(self):
+        # always keep the newest entry, even if it is too large
+        while len(self._entries) > 1 and (
+                len(self._entries) > self.maxEntries or
+                self._size > self.maxSize):
+            entryId, (_, size) = self._entries.popitem(last=False)
+            self._size -= size
+            LOG.debug("Discarded undo journal entry {0}".format(entryId))
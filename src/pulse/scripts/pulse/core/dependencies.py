@@ -0,0 +1,264 @@
+"""
+Analysis of the dependencies between the actions of a blueprint.
+"""
+
+import logging
+
+__all__ = [
+    'ActionGraph',
+]
+
+LOG = logging.getLogger(__name__)
+
+
+def _getNodeKey(node):
+    """
+    Return a key for a node as a tuple of the names in its full path,
+    so that the keys of ancestors are a prefix of the keys of descendants.
+    """
+    if hasattr(node, 'longName'):
+        name = node.longName()
+    else:
+        name = str(node)
+    return tuple(name.strip('|').split('|'))
+
+
+class _KeyAccesses(object):
+    """
+    The accesses of an action graph to a single key.
+    """
+
+    __slots__ = ('lastWrite', 'reads')
+
+    def __init__(self):
+        # index of the last action that wrote the key
+        self.lastWrite = None
+        # indeces of actions that read the key since the last write
+        self.reads = []
+
+
+class ActionGraph(object):
+    """
+    A dependency graph of the actions of a blueprint.
+
+    An action depends on an earlier action if one of them writes a node or
+    resource that the other reads or writes, see
+    `BuildAction.getSceneDependencies`. Writing a node also affects its
+    descendants and ancestors in the DAG hierarchy. Actions that affect
+    the whole scene depend on all earlier actions, and all later actions
+    depend on them.
+
+    Actions are referenced by their index in the build order.
+    """
+
+    @classmethod
+    def fromBlueprint(cls, blueprint):
+        """
+        Create an ActionGraph of all actions in a Blueprint.
+        """
+        return cls(blueprint.actionIterator())
+
+    def __init__(self, actions):
+        """
+        Args:
+            actions: A list of (BuildStep, BuildAction) tuples in build
+                order, as returned by `Blueprint.actionIterator`
+        """
+        self.actions = list(actions)
+        # sorted list of the indeces each action depends on
+        self.dependencies = []
+        # sorted list of the indeces that depend on each action
+        self._dependents = None
+        self._build()
+
+    def __len__(self):
+        return len(self.actions)
+
+    def _build(self):
+        # accesses to keys since the last action that affects the whole scene
+        accesses = {}
+        # accesses to the descendants of each key, by key
+        descendantAccesses = {}
+        # indeces of actions since the last action that affects the scene
+        sinceBarrier = []
+        lastBarrier = None
+
+        for index, (step, action) in enumerate(self.actions):
+            try:
+                inputs, outputs = action.getSceneDependencies()
+            except Exception as error:
+                LOG.warning("Failed to get dependencies of {0}: {1}".format(
+                    step.getFullPath(), error))
+                inputs, outputs = [], ['*']
+
+            if '*' in inputs or '*' in outputs:
+                deps = set(sinceBarrier)
+                if lastBarrier is not None:
+                    deps.add(lastBarrier)
+                self.dependencies.append(sorted(deps))
+                accesses = {}
+                descendantAccesses = {}
+                sinceBarrier = []
+                lastBarrier = index
+                continue
+
+            # the keys this action accesses, and whether it writes them
+            keys = {}
+            for item in inputs:
+                keys.setdefault(self._getKey(item), False)
+            for item in outputs:
+                keys[self._getKey(item)] = True
+
+            deps = set()
+            if lastBarrier is not None:
+                deps.add(lastBarrier)
+            for key, isWrite in keys.items():
+                self._addKeyDependencies(
+                    deps, key, isWrite, accesses, descendantAccesses)
+            deps.discard(index)
+            self.dependencies.append(sorted(deps))
+
+            for key, isWrite in keys.items():
+                keyAccesses = accesses.get(key)
+                if keyAccesses is None:
+                    keyAccesses = accesses[key] = _KeyAccesses()
+                if isWrite:
+                    keyAccesses.lastWrite = index
+                    keyAccesses.reads = []
+                    # later accesses to descendants depend on this write
+                    descendantAccesses.pop(key, None)
+                else:
+                    keyAccesses.reads.append(index)
+                for i in range(1, len(key)):
+                    descendantAccesses.setdefault(key[:i], []).append(
+                        (index, isWrite))
+            sinceBarrier.append(index)
+
+    def _getKey(self, item):
+        if isinstance(item, basestring):
+            # resources are not part of the node hierarchy
+            return ('resource:' + item,)
+        return _getNodeKey(item)
+
+    def _addKeyDependencies(self, deps, key, isWrite, accesses,
+                            descendantAccesses):
+        # the key itself and its ancestors
+        for i in range(1, len(key) + 1):
+            keyAccesses = accesses.get(key[:i])
+            if keyAccesses is None:
+                continue
+            if keyAccesses.lastWrite is not None:
+                deps.add(keyAccesses.lastWrite)
+            if isWrite:
+                deps.update(keyAccesses.reads)
+        # descendants of the key
+        for index, otherIsWrite in descendantAccesses.get(key, []):
+            if isWrite or otherIsWrite:
+                deps.add(index)
+
+    def getDependencies(self, index):
+        """
+        Return the indeces of the actions that an action depends on.
+        """
+        return self.dependencies[index]
+
+    def getDependents(self, index):
+        """
+        Return the indeces of the actions that depend on an action.
+        """
+        if self._dependents is None:
+            self._dependents = [[] for _ in self.actions]
+            for i, deps in enumerate(self.dependencies):
+                for dep in deps:
+                    self._dependents[dep].append(i)
+        return self._dependents[index]
+
+    def getCriticalPath(self, weights=None):
+        """
+        Return the longest chain of dependent actions, which
+        determines the minimum time needed to build them.
+
+        Args:
+            weights (list of float): The cost of each action, such as its
+                wall time from a `BuildProfiler`, defaults to 1 for each
+
+        Returns:
+            A list of action indeces, in build order
+        """
+        if not self.actions:
+            return []
+        totals = []
+        previous = []
+        for index, deps in enumerate(self.dependencies):
+            weight = weights[index] if weights is not None else 1
+            best = None
+            for dep in deps:
+                if best is None or totals[dep] > totals[best]:
+                    best = dep
+            totals.append(weight + (totals[best] if best is not None else 0))
+            previous.append(best)
+
+        index = max(range(len(totals)), key=lambda i: totals[i])
+        path = []
+        while index is not None:
+            path.append(index)
+            index = previous[index]
+        path.reverse()
+        return path
+
+    def getIndependentGroups(self):
+        """
+        Return groups of actions that have no dependencies on any
+        actions in other groups, and could be built separately.
+
+        Returns:
+            A list of lists of action indeces, in build order
+        """
+        # union-find of connected actions
+        parents = list(range(len(self.actions)))
+
+        def find(index):
+            while parents[index] != index:
+                parents[index] = parents[parents[index]]
+                index = parents[index]
+            return index
+
+        for index, deps in enumerate(self.dependencies):
+            for dep in deps:
+                rootA = find(index)
+                rootB = find(dep)
+                if rootA != rootB:
+                    parents[max(rootA, rootB)] = min(rootA, rootB)
+
+        groups = {}
+        for index in range(len(self.actions)):
+            groups.setdefault(find(index), []).append(index)
+        return [groups[root] for root in sorted(groups)]
+
+    def getBatches(self, indeces=None):
+        """
+        Return batches of actions that are independent of each other,
+        where each batch only depends on the actions of earlier batches.
+
+        Args:
+            indeces (list of int): The indeces of the actions to include,
+                defaults to all actions. Dependencies on actions that are
+                not included are assumed to be satisfied.
+
+        Returns:
+            A list of lists of action indeces, in build order
+        """
+        if indeces is None:
+            indeces = range(len(self.actions))
+        levels = {}
+        batches = []
+        for index in indeces:
+            level = 0
+            for dep in self.dependencies[index]:
+                if dep in levels:
+                    level = max(level, levels[dep] + 1)
+            levels[index] = level
+            if level == len(batches):
+                batches.append([])
+            batches[level].append(index)
+        return batches
@@ -7,7 +7,7 @@ import pymel.core as pm
 import pymetanode as meta
 
 from .blueprints import Blueprint
-from .rigs import isRig
+from .rigs import isRig, getAllRigs
 
 __all__ = [
     'Event',
@@ -59,6 +59,8 @@ class MayaCallbackEvents(object):
         # list of objects that are subscribed to any events
         # used to determine if maya callbacks should be registered
         self._subscribers = []
+        # the number of times callbacks have been paused without resuming
+        self._pauseCount = 0
 
     def __del__(self):
         self._unregisterMayaCallbacks()
@@ -68,6 +70,8 @@ class MayaCallbackEvents(object):
         Register all Maya callbacks for this dispatcher.
         Does nothing if callbacks are already registered.
         """
+        if self._pauseCount > 0:
+            return
         if not self._areMayaCallbacksRegistered:
             self._areMayaCallbacksRegistered = True
             self._callbackIDs = list(self._addMayaCallbacks())
@@ -97,6 +101,45 @@ class MayaCallbackEvents(object):
             LOG.debug('{0}._unregisterMayaCallbacks'.format(
                 self.__class__.__name__))
 
+    def isPaused(self):
+        return self._pauseCount > 0
+
+    def pauseMayaCallbacks(self):
+        """
+        Temporarily unregister all Maya callbacks, such as during a build,
+        until `resumeMayaCallbacks` is called. Pauses can be nested.
+        """
+        self._pauseCount += 1
+        if self._pauseCount == 1 and self._areMayaCallbacksRegistered:
+            self._unregisterMayaCallbacks()
+            self._onPaused()
+
+    def resumeMayaCallbacks(self):
+        """
+        Register Maya callbacks again after they were paused,
+        if there are any subscribers.
+        """
+        if self._pauseCount == 0:
+            return
+        self._pauseCount -= 1
+        if self._pauseCount == 0 and self._subscribers:
+            self._registerMayaCallbacks()
+            self._onResumed()
+
+    def _onPaused(self):
+        """
+        Called after callbacks were unregistered by a pause. Override
+        in subclasses to record any state needed when resuming.
+        """
+        pass
+
+    def _onResumed(self):
+        """
+        Called after callbacks were registered again when resuming. Override
+        in subclasses to dispatch any events that were missed while paused.
+        """
+        pass
+
     def addSubscriber(self, subscriber):
         """
         Add a subscriber to this event dispatcher
@@ -143,6 +186,8 @@ class RigLifecycleEvents(MayaCallbackEvents):
         super(RigLifecycleEvents, self).__init__()
         self.onRigCreated = Event()
         self.onRigDeleted = Event()
+        # the rigs that existed when callbacks were paused
+        self._pausedRigs = None
 
     # override
     def _addMayaCallbacks(self):
@@ -153,6 +198,21 @@ class RigLifecycleEvents(MayaCallbackEvents):
             self._onNodeRemoved, 'transform')
         return (addId, removeId)
 
+    # override
+    def _onPaused(self):
+        self._pausedRigs = set(getAllRigs())
+
+    # override
+    def _onResumed(self):
+        # rigs deleted while paused no longer exist to be passed
+        # to onRigDeleted, so only creation is dispatched
+        pausedRigs = self._pausedRigs or set()
+        self._pausedRigs = None
+        for rig in getAllRigs():
+            if rig not in pausedRigs:
+                LOG.debug("onRigCreated('{0}')".format(rig))
+                self.onRigCreated(rig)
+
     def _onNodeAdded(self, node, *args):
         """
         Args:
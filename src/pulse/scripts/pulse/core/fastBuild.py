@@ -0,0 +1,123 @@
+"""
+Suspending scene features that slow down builds, such as
+undo recording, viewport refresh and Pulse's own callbacks.
+"""
+
+import logging
+import time
+import maya.cmds as cmds
+
+__all__ = [
+    'FastBuildContext',
+]
+
+LOG = logging.getLogger(__name__)
+
+
+class FastBuildContext(object):
+    """
+    Suspends undo, viewport refresh, Pulse's Maya callbacks and
+    evaluation manager graph rebuilds until restored, returning the
+    scene to its previous state afterwards.
+
+    Can be used as a context manager, or by calling `suspend` and
+    `restore` manually, such as when a build spans multiple calls.
+    Restoring is safe to call more than once.
+
+    Disabling undo clears the undo queue, since undoing earlier changes
+    after the destructive edits of a build would not be safe. Nothing
+    done while suspended can be undone.
+    """
+
+    def __init__(self, log=None):
+        self.log = log if log else LOG
+        self.isSuspended = False
+        # the time taken to suspend and restore, in seconds
+        self.suspendTime = 0
+        self.restoreTime = 0
+        # the features that were suspended
+        self.suspended = []
+        self._undoState = None
+        self._evaluationMode = None
+        self._events = None
+
+    def __enter__(self):
+        self.suspend()
+        return self
+
+    def __exit__(self, excType, excValue, tb):
+        self.restore()
+
+    def suspend(self):
+        """
+        Suspend all features that slow down building.
+        """
+        if self.isSuspended:
+            return
+        startTime = time.time()
+        self.isSuspended = True
+        self.suspended = []
+
+        self._undoState = cmds.undoInfo(q=True, state=True)
+        if self._undoState:
+            # flushes the undo queue
+            cmds.undoInfo(state=False)
+            self.suspended.append('undo')
+
+        if not cmds.about(batch=True):
+            cmds.refresh(suspend=True)
+            self.suspended.append('refresh')
+
+        # imported here since events depends on blueprints
+        from .events import RigLifecycleEvents
+        self._events = RigLifecycleEvents.getShared()
+        self._events.pauseMayaCallbacks()
+        self.suspended.append('callbacks')
+
+        # switching to DG evaluation defers graph rebuilds
+        # until the original mode is restored
+        if hasattr(cmds, 'evaluationManager'):
+            mode = cmds.evaluationManager(q=True, mode=True)[0]
+            if mode != 'off':
+                self._evaluationMode = mode
+                cmds.evaluationManager(mode='off')
+                self.suspended.append('evaluation')
+
+        self.suspendTime = time.time() - startTime
+        self.log.info("Fast build suspended {0} in {1:.3f} seconds".format(
+            ', '.join(self.suspended), self.suspendTime))
+
+    def restore(self):
+        """
+        Restore all features that were suspended.
+        """
+        if not self.isSuspended:
+            return
+        startTime = time.time()
+        self.isSuspended = False
+        errors = []
+
+        def restoreFeature(func, *args, **kwargs):
+            # keep restoring the rest if anything fails
+            try:
+                func(*args, **kwargs)
+            except Exception as error:
+                errors.append(error)
+
+        if self._evaluationMode:
+            restoreFeature(cmds.evaluationManager, mode=self._evaluationMode)
+            self._evaluationMode = None
+        if self._events:
+            restoreFeature(self._events.resumeMayaCallbacks)
+            self._events = None
+        if 'refresh' in self.suspended:
+            restoreFeature(cmds.refresh, suspend=False)
+        if self._undoState:
+            restoreFeature(cmds.undoInfo, state=True)
+            self._undoState = None
+
+        self.restoreTime = time.time() - startTime
+        for error in errors:
+            self.log.error("Failed to restore scene state: {0}".format(error))
+        self.log.info("Fast build restored {0} in {1:.3f} seconds".format(
+            ', '.join(self.suspended), self.restoreTime))
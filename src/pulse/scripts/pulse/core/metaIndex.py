@@ -0,0 +1,350 @@
+"""
+A shared in-memory index of the nodes in the scene that have
+Pulse metadata, so they can be found without rescanning the scene.
+"""
+
+import logging
+from collections import OrderedDict
+import maya.OpenMaya as api
+import pymel.core as pm
+import pymetanode as meta
+
+__all__ = [
+    'findIndexedMetaNodes',
+    'getIndexedMetaData',
+    'MetaIndex',
+    'updateIndexedMetaNode',
+]
+
+LOG = logging.getLogger(__name__)
+
+
+def findIndexedMetaNodes(className):
+    """
+    Return a list of all nodes with a metaclass, like
+    `meta.findMetaNodes`, using the shared `MetaIndex`.
+    """
+    return MetaIndex.getShared().findMetaNodes(className)
+
+
+def getIndexedMetaData(node, className):
+    """
+    Return the metadata of a node for a metaclass, like
+    `meta.getMetaData`, using the shared `MetaIndex`.
+    The result is shared, and must not be modified.
+    """
+    return MetaIndex.getShared().getMetaData(node, className)
+
+
+def updateIndexedMetaNode(node):
+    """
+    Update the shared `MetaIndex` after the metaclasses of
+    a node have changed. Should be called after setting or removing
+    metadata of any indexed metaclass on an existing node.
+    """
+    if MetaIndex.INSTANCE:
+        MetaIndex.INSTANCE.updateNode(node)
+
+
+def _getMObject(node):
+    if isinstance(node, api.MObject):
+        return node
+    if hasattr(node, '__apimobject__'):
+        return node.__apimobject__()
+    return meta.getMObject(node)
+
+
+class _IndexedNode(object):
+    """
+    A node in a MetaIndex, and the metaclasses it has.
+    """
+
+    __slots__ = ('handle', 'classNames', 'pyNode', 'data', 'callbackId')
+
+    def __init__(self, handle):
+        self.handle = handle
+        self.classNames = set()
+        # the node as a PyNode, created when first needed
+        self.pyNode = None
+        # cached metadata, indexed by metaclass
+        self.data = {}
+        # the id of the attribute changed callback for the node
+        self.callbackId = None
+
+    def getPyNode(self):
+        if self.pyNode is None:
+            self.pyNode = pm.PyNode(self.handle.object())
+        return self.pyNode
+
+
+class MetaIndex(object):
+    """
+    An index of scene nodes by metaclass, with cached metadata.
+
+    Each metaclass is indexed with a single scene scan the first time
+    it is queried, then kept current using Maya callbacks:
+
+    - Nodes that are added to the scene are checked for metaclasses
+      the next time the index is queried.
+    - Nodes that are removed from the scene are removed from the index.
+    - Indexed nodes are checked again when attributes are added to or
+      removed from them, and their cached metadata is cleared when
+      any of their attributes change.
+    - Undo, redo, opening, importing and referencing files
+      invalidate the index, which is rebuilt when next queried.
+
+    Callbacks can't detect metadata being added to a node that was
+    already in the scene, so code that does should call `updateNode`,
+    see `updateIndexedMetaNode`. Batch scripts that make many changes
+    with callbacks disabled can call `rebuild` afterwards.
+    """
+
+    # the shared index instance
+    INSTANCE = None
+
+    # scene messages that invalidate the index, and
+    # whether they start or end loading nodes
+    SCENE_MESSAGES = [
+        ('kBeforeOpen', True),
+        ('kAfterOpen', False),
+        ('kBeforeNew', True),
+        ('kAfterNew', False),
+        ('kBeforeImport', True),
+        ('kAfterImport', False),
+        ('kBeforeCreateReference', True),
+        ('kAfterCreateReference', False),
+        ('kBeforeLoadReference', True),
+        ('kAfterLoadReference', False),
+    ]
+
+    @classmethod
+    def getShared(cls):
+        """
+        Return the shared index, creating it and enabling its callbacks
+        if it doesn't exist yet.
+        """
+        if not cls.INSTANCE:
+            cls.INSTANCE = cls()
+            cls.INSTANCE.enable()
+        return cls.INSTANCE
+
+    def __init__(self):
+        # all indexed nodes, by MObjectHandle hash code
+        self._nodes = {}
+        # hash codes of indexed nodes, by metaclass
+        self._nodesByClass = {}
+        # handles of nodes to check the next time the index is queried
+        self._pending = []
+        # whether nodes are being loaded from a file
+        self._isLoading = False
+        self._callbackIds = []
+        self.isEnabled = False
+        # the number of full scene scans performed, for diagnostics
+        self.scanCount = 0
+
+    def __repr__(self):
+        return "<MetaIndex {0} node(s), {1} class(es)>".format(
+            len(self._nodes), len(self._nodesByClass))
+
+    def enable(self):
+        """
+        Register Maya callbacks to keep the index current.
+        """
+        if self.isEnabled:
+            return
+        self.isEnabled = True
+        self.invalidate()
+        ids = [
+            api.MDGMessage.addNodeAddedCallback(self._onNodeAdded),
+            api.MDGMessage.addNodeRemovedCallback(self._onNodeRemoved),
+            api.MEventMessage.addEventCallback('Undo', self._onInvalidated),
+            api.MEventMessage.addEventCallback('Redo', self._onInvalidated),
+        ]
+        for msgName, isLoading in self.SCENE_MESSAGES:
+            msg = getattr(api.MSceneMessage, msgName)
+            func = self._onLoadStarted if isLoading else self._onLoadFinished
+            ids.append(api.MSceneMessage.addCallback(msg, func))
+        self._callbackIds = ids
+
+    def disable(self):
+        """
+        Remove all Maya callbacks and clear the index. While disabled,
+        the index is only updated by calling `rebuild` or `updateNode`.
+        """
+        if not self.isEnabled:
+            return
+        self.isEnabled = False
+        for callbackId in self._callbackIds:
+            api.MMessage.removeCallback(callbackId)
+        self._callbackIds = []
+        self.invalidate()
+
+    def invalidate(self):
+        """
+        Clear the index, so that each metaclass is scanned
+        again the next time it is queried.
+        """
+        for entry in self._nodes.values():
+            self._removeNodeCallback(entry)
+        self._nodes = {}
+        self._nodesByClass = {}
+        self._pending = []
+
+    def rebuild(self):
+        """
+        Rebuild the index for all metaclasses that have been queried,
+        scanning the scene immediately.
+        """
+        classNames = list(self._nodesByClass.keys())
+        self.invalidate()
+        for className in classNames:
+            self._scanClass(className)
+
+    def findMetaNodes(self, className):
+        """
+        Return a list of all nodes with a metaclass
+
+        Args:
+            className (str): The metaclass to find
+        """
+        self._update(className)
+        result = []
+        for code in self._nodesByClass[className]:
+            entry = self._nodes[code]
+            if entry.handle.isValid():
+                result.append(entry.getPyNode())
+        return result
+
+    def getMetaData(self, node, className):
+        """
+        Return the metadata of a node for a metaclass, decoding it
+        only when it has changed since it was last read. The result
+        is shared, and must not be modified.
+
+        Args:
+            node: A PyNode, str node name, or MObject
+            className (str): The metaclass of the data
+        """
+        self._update(className)
+        mobject = _getMObject(node)
+        entry = self._nodes.get(api.MObjectHandle(mobject).hashCode())
+        if entry is None or className not in entry.classNames:
+            return meta.getMetaData(node, className)
+        if className not in entry.data:
+            entry.data[className] = meta.getMetaData(mobject, className)
+        return entry.data[className]
+
+    def updateNode(self, node):
+        """
+        Check the metaclasses of a node again the next time the index
+        is queried, and clear its cached metadata.
+
+        Args:
+            node: A PyNode, str node name, or MObject
+        """
+        handle = api.MObjectHandle(_getMObject(node))
+        entry = self._nodes.get(handle.hashCode())
+        if entry:
+            entry.data = {}
+        self._pending.append(handle)
+
+    def _update(self, className):
+        """
+        Process pending nodes, and scan for a metaclass
+        if it is not indexed yet.
+        """
+        if self._pending:
+            pending = self._pending
+            self._pending = []
+            for handle in pending:
+                self._updateNode(handle)
+        if className not in self._nodesByClass:
+            self._scanClass(className)
+
+    def _scanClass(self, className):
+        self.scanCount += 1
+        codes = self._nodesByClass[className] = OrderedDict()
+        for node in meta.findMetaNodes(className):
+            handle = api.MObjectHandle(node.__apimobject__())
+            entry = self._getOrCreateEntry(handle)
+            if entry.pyNode is None:
+                entry.pyNode = node
+            entry.classNames.add(className)
+            codes[handle.hashCode()] = True
+
+    def _getOrCreateEntry(self, handle):
+        code = handle.hashCode()
+        entry = self._nodes.get(code)
+        if entry is None:
+            entry = self._nodes[code] = _IndexedNode(handle)
+            if self.isEnabled:
+                entry.callbackId = api.MNodeMessage.addAttributeChangedCallback(
+                    handle.object(), self._onAttributeChanged)
+        return entry
+
+    def _updateNode(self, handle):
+        """
+        Update the metaclasses of a node for all indexed metaclasses.
+        """
+        code = handle.hashCode()
+        if not handle.isValid():
+            self._removeNode(code)
+            return
+        mobject = handle.object()
+        classNames = set([c for c in self._nodesByClass
+                          if meta.hasMetaClass(mobject, c)])
+        entry = self._nodes.get(code)
+        if entry is None:
+            if not classNames:
+                return
+            entry = self._getOrCreateEntry(handle)
+        for className in entry.classNames - classNames:
+            self._nodesByClass[className].pop(code, None)
+        for className in classNames - entry.classNames:
+            self._nodesByClass[className][code] = True
+        entry.classNames = classNames
+        entry.data = {}
+        if not classNames:
+            self._removeNode(code)
+
+    def _removeNode(self, code):
+        entry = self._nodes.pop(code, None)
+        if entry is None:
+            return
+        self._removeNodeCallback(entry)
+        for className in entry.classNames:
+            self._nodesByClass[className].pop(code, None)
+
+    def _removeNodeCallback(self, entry):
+        if entry.callbackId is not None:
+            api.MMessage.removeCallback(entry.callbackId)
+            entry.callbackId = None
+
+    def _onNodeAdded(self, node, *args):
+        if not self._isLoading and self._nodesByClass:
+            self._pending.append(api.MObjectHandle(node))
+
+    def _onNodeRemoved(self, node, *args):
+        if self._nodes:
+            self._removeNode(api.MObjectHandle(node).hashCode())
+
+    def _onAttributeChanged(self, msg, plug, otherPlug, *args):
+        code = api.MObjectHandle(plug.node()).hashCode()
+        entry = self._nodes.get(code)
+        if entry is None:
+            return
+        entry.data = {}
+        if msg & (api.MNodeMessage.kAttributeAdded |
+                  api.MNodeMessage.kAttributeRemoved):
+            self._pending.append(entry.handle)
+
+    def _onInvalidated(self, *args):
+        self.invalidate()
+
+    def _onLoadStarted(self, *args):
+        self._isLoading = True
+        self.invalidate()
+
+    def _onLoadFinished(self, *args):
+        self._isLoading = False
+        self.invalidate()
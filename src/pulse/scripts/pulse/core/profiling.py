@@ -0,0 +1,232 @@
+"""
+Per-action profiling of blueprint builds.
+"""
+
+import os
+import gc
+import json
+import logging
+import timeit
+
+import maya.OpenMaya as api
+
+try:
+    import tracemalloc
+except ImportError:
+    tracemalloc = None
+
+__all__ = [
+    'BuildProfiler',
+]
+
+LOG = logging.getLogger(__name__)
+
+
+def _getCpuTime():
+    """
+    Return the user and system cpu time of this process in seconds
+    """
+    times = os.times()
+    return times[0] + times[1]
+
+
+class BuildProfiler(object):
+    """
+    Records the wall time, cpu time, number of DG nodes created
+    and deleted, and Python allocations of each action in a build.
+
+    Allocations are measured in bytes using tracemalloc when available,
+    otherwise as the change in the number of objects tracked by the
+    garbage collector, which is slower to measure.
+
+    Usage:
+        profiler.start()
+        for step, action in actions:
+            profiler.beginAction(step.getFullPath(), action.getActionId())
+            action.run()
+            profiler.endAction()
+        profiler.stop()
+        profiler.writeResults(basePath)
+    """
+
+    def __init__(self):
+        # list of dicts containing the results of each action
+        self.results = []
+        self.isRunning = False
+        self._startTime = None
+        self._current = None
+        self._callbackIDs = []
+        self._nodesCreated = 0
+        self._nodesDeleted = 0
+        self._stopTracemalloc = False
+
+    def getAllocUnits(self):
+        """
+        Return the units of the allocation deltas, 'bytes' or 'objects'
+        """
+        return 'bytes' if tracemalloc else 'objects'
+
+    def start(self):
+        """
+        Start profiling, registering the callbacks used to count nodes
+        """
+        if self.isRunning:
+            return
+        self.isRunning = True
+        self._startTime = timeit.default_timer()
+        self._callbackIDs = [
+            api.MDGMessage.addNodeAddedCallback(self._onNodeAdded),
+            api.MDGMessage.addNodeRemovedCallback(self._onNodeRemoved),
+        ]
+        if tracemalloc and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._stopTracemalloc = True
+
+    def stop(self):
+        """
+        Stop profiling and remove all callbacks
+        """
+        if not self.isRunning:
+            return
+        if self._current:
+            self.endAction()
+        self.isRunning = False
+        for cbId in self._callbackIDs:
+            api.MMessage.removeCallback(cbId)
+        self._callbackIDs = []
+        if self._stopTracemalloc:
+            tracemalloc.stop()
+            self._stopTracemalloc = False
+
+    def _onNodeAdded(self, node, *args):
+        self._nodesCreated += 1
+
+    def _onNodeRemoved(self, node, *args):
+        self._nodesDeleted += 1
+
+    def _getAllocCount(self):
+        if tracemalloc:
+            return tracemalloc.get_traced_memory()[0]
+        return len(gc.get_objects())
+
+    def beginAction(self, path, actionId):
+        """
+        Start measuring an action.
+
+        Args:
+            path (str): The full path of the action's BuildStep
+            actionId (str): The id of the action
+        """
+        if self._current:
+            self.endAction()
+        self._current = dict(
+            path=path,
+            actionId=actionId,
+            start=timeit.default_timer(),
+            cpuStart=_getCpuTime(),
+            nodesCreated=self._nodesCreated,
+            nodesDeleted=self._nodesDeleted,
+            alloc=self._getAllocCount(),
+        )
+
+    def endAction(self):
+        """
+        Finish measuring the current action and record its results.
+        """
+        current = self._current
+        if not current:
+            return
+        self._current = None
+        endTime = timeit.default_timer()
+        self.results.append(dict(
+            path=current['path'],
+            actionId=current['actionId'],
+            start=current['start'] - self._startTime,
+            wallTime=endTime - current['start'],
+            cpuTime=_getCpuTime() - current['cpuStart'],
+            nodesCreated=self._nodesCreated - current['nodesCreated'],
+            nodesDeleted=self._nodesDeleted - current['nodesDeleted'],
+            allocDelta=self._getAllocCount() - current['alloc'],
+        ))
+
+    def getTraceData(self):
+        """
+        Return the results as Chrome trace event data, which can
+        be viewed using chrome://tracing or other trace viewers.
+        """
+        pid = os.getpid()
+        events = []
+        for result in self.results:
+            events.append(dict(
+                name=result['path'],
+                cat=result['actionId'],
+                ph='X',
+                ts=int(result['start'] * 1000000),
+                dur=int(result['wallTime'] * 1000000),
+                pid=pid,
+                tid=0,
+                args=dict(
+                    actionId=result['actionId'],
+                    cpuTime=result['cpuTime'],
+                    nodesCreated=result['nodesCreated'],
+                    nodesDeleted=result['nodesDeleted'],
+                    allocDelta=result['allocDelta'],
+                    allocUnits=self.getAllocUnits(),
+                ),
+            ))
+        return dict(traceEvents=events, displayTimeUnit='ms')
+
+    def getSummary(self):
+        """
+        Return a table of the results as a string,
+        sorted by wall time, slowest first.
+        """
+        headers = ['wall (s)', 'cpu (s)', 'created', 'deleted',
+                   'alloc ({0})'.format(self.getAllocUnits()),
+                   'action', 'path']
+        rows = []
+        for result in sorted(self.results, key=lambda r: -r['wallTime']):
+            rows.append([
+                '{0:.4f}'.format(result['wallTime']),
+                '{0:.4f}'.format(result['cpuTime']),
+                str(result['nodesCreated']),
+                str(result['nodesDeleted']),
+                str(result['allocDelta']),
+                result['actionId'],
+                result['path'],
+            ])
+        rows.append([
+            '{0:.4f}'.format(sum([r['wallTime'] for r in self.results])),
+            '{0:.4f}'.format(sum([r['cpuTime'] for r in self.results])),
+            str(sum([r['nodesCreated'] for r in self.results])),
+            str(sum([r['nodesDeleted'] for r in self.results])),
+            str(sum([r['allocDelta'] for r in self.results])),
+            '', 'total ({0} actions)'.format(len(self.results)),
+        ])
+
+        widths = [max([len(headers[i])] + [len(row[i]) for row in rows])
+                  for i in range(len(headers))]
+        lines = []
+        for row in [headers] + rows:
+            lines.append('  '.join(
+                [v.ljust(w) for v, w in zip(row, widths)]).rstrip())
+        return '\n'.join(lines)
+
+    def writeResults(self, basePath):
+        """
+        Write the trace event json and summary table files.
+
+        Args:
+            basePath (str): The path of the output files without
+                an extension, '.json' and '.txt' will be added
+
+        Returns:
+            A tuple of (traceFile, summaryFile) paths
+        """
+        traceFile = basePath + '.json'
+        summaryFile = basePath + '.txt'
+        with open(traceFile, 'w') as fp:
+            json.dump(self.getTraceData(), fp)
+        with open(summaryFile, 'w') as fp:
+            fp.write(self.getSummary() + '\n')
+        return traceFile, summaryFile
@@ -6,6 +6,7 @@ import pymel.core as pm
 import pymetanode as meta
 
 from ..cameras import saveCameras, restoreCameras
+from .metaIndex import findIndexedMetaNodes, updateIndexedMetaNode
 
 __all__ = [
     'getAllRigs',
@@ -39,7 +40,7 @@ def getAllRigs():
     """
     Return a list of all rigs in the scene
     """
-    return meta.findMetaNodes(RIG_METACLASS)
+    return findIndexedMetaNodes(RIG_METACLASS)
 
 
 def getAllRigsByName(names):
@@ -99,6 +100,7 @@ def createRigNode(name):
         node.attr(a).setKeyable(False)
     # set initial meta data for the rig
     meta.setMetaData(node, RIG_METACLASS, {'name': name})
+    updateIndexedMetaNode(node)
     return node
 
 
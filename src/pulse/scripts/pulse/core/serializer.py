@@ -1,6 +1,9 @@
 
 
+import importlib
+import logging
 from collections import OrderedDict
+import maya.cmds as cmds
 import pymetanode as meta
 import pymel.core as pm
 
@@ -15,16 +18,45 @@ from pulse.vendor.yaml.resolver import Resolver
 from pulse.vendor.yaml.scanner import Scanner
 from pulse.vendor.yaml.serializer import Serializer
 
+# the libyaml C extension is bound to the top-level yaml package
+# it was built with, not the vendored one, so its loader and dumper
+# classes must come from that package as well
+try:
+    libyaml = importlib.import_module('yaml')
+except ImportError:
+    libyaml = None
+else:
+    if not getattr(libyaml, '__with_libyaml__', False):
+        libyaml = None
+
 __all__ = [
+    'CPulseDumper',
+    'CPulseLoader',
+    'CRawPulseLoader',
     'DagNodeTag',
     'deserializeAttrValue',
+    'dumpYaml',
+    'getNodesByUUID',
+    'getPulseDumper',
+    'getPulseLoader',
+    'isLibYamlEnabled',
+    'loadYaml',
     'PulseDumper',
     'PulseLoader',
+    'RawPulseLoader',
+    'resolveNodeReferences',
     'serializeAttrValue',
+    'UnresolvedNode',
     'UnsortableList',
     'UnsortableOrderedDict',
 ]
 
+LOG = logging.getLogger(__name__)
+
+# cached result of the libyaml compatibility check,
+# None until `isLibYamlEnabled` is first called
+_LIBYAML_ENABLED = None
+
 
 class PulseDumper(Emitter, Serializer, SafeRepresenter, Resolver):
 
@@ -56,6 +88,32 @@ class PulseLoader(Reader, Scanner, Parser, Composer, SafeConstructor, Resolver):
         Resolver.__init__(self)
 
 
+if libyaml is not None:
+
+    class CPulseDumper(libyaml.CSafeDumper):
+        """
+        A PulseDumper that uses the libyaml C emitter
+        """
+        pass
+
+    class CPulseLoader(libyaml.CSafeLoader):
+        """
+        A PulseLoader that uses the libyaml C parser
+        """
+        pass
+
+    class CRawPulseLoader(libyaml.CSafeLoader):
+        """
+        A RawPulseLoader that uses the libyaml C parser
+        """
+        pass
+
+else:
+    CPulseDumper = None
+    CPulseLoader = None
+    CRawPulseLoader = None
+
+
 class UnsortableList(list):
     def sort(self, *args, **kwargs):
         pass
@@ -66,11 +124,6 @@ class UnsortableOrderedDict(OrderedDict):
         return UnsortableList(OrderedDict.items(self, *args, **kwargs))
 
 
-PulseDumper.add_representer(
-    UnsortableOrderedDict,
-    PulseDumper.represent_dict)
-
-
 class DagNodeTag(yaml.YAMLObject):
     """
     Maya Node reference tag for yaml
@@ -93,10 +146,256 @@ class DagNodeTag(yaml.YAMLObject):
             return dumper.represent_scalar(cls.yaml_tag, 'null')
 
 
-PulseLoader.add_constructor(
-    DagNodeTag.yaml_tag, DagNodeTag.from_yaml)
-PulseDumper.add_multi_representer(
-    pm.nt.DagNode, DagNodeTag.to_yaml)
+class UnresolvedNode(object):
+    """
+    A node reference by UUID that has not been resolved to a node
+    in the scene. Allows converting blueprint data between formats
+    without the referenced nodes having to exist.
+    """
+
+    def __init__(self, uuid):
+        self.uuid = uuid
+
+    def __repr__(self):
+        return "UnresolvedNode('{0}')".format(self.uuid)
+
+    def __eq__(self, other):
+        return isinstance(other, UnresolvedNode) and other.uuid == self.uuid
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    def __hash__(self):
+        return hash(self.uuid)
+
+    @classmethod
+    def from_yaml(cls, loader, node):
+        if node.value == 'null':
+            return None
+        else:
+            return cls(node.value)
+
+    @classmethod
+    def to_yaml(cls, dumper, data):
+        return dumper.represent_scalar(DagNodeTag.yaml_tag, data.uuid)
+
+
+class RawPulseLoader(PulseLoader):
+    """
+    A PulseLoader that leaves node references unresolved,
+    loading them as UnresolvedNode instances.
+    """
+    pass
+
+
+def _representUnsortedDict(dumper, data):
+    # mappings given as a list of pairs are never sorted, while
+    # plain dicts are still sorted the same way by all yaml versions
+    return dumper.represent_mapping(
+        u'tag:yaml.org,2002:map', list(OrderedDict.items(data)))
+
+
+def _addRepresenters(dumperClass):
+    dumperClass.add_representer(
+        UnsortableOrderedDict,
+        _representUnsortedDict)
+    dumperClass.add_multi_representer(
+        pm.nt.DagNode, DagNodeTag.to_yaml)
+    dumperClass.add_representer(
+        UnresolvedNode, UnresolvedNode.to_yaml)
+
+
+def _addConstructors(loaderClass):
+    loaderClass.add_constructor(
+        DagNodeTag.yaml_tag, DagNodeTag.from_yaml)
+
+
+_addRepresenters(PulseDumper)
+_addConstructors(PulseLoader)
+RawPulseLoader.add_constructor(
+    DagNodeTag.yaml_tag, UnresolvedNode.from_yaml)
+if CPulseDumper is not None:
+    _addRepresenters(CPulseDumper)
+    _addConstructors(CPulseLoader)
+    CRawPulseLoader.add_constructor(
+        DagNodeTag.yaml_tag, UnresolvedNode.from_yaml)
+
+
+def getNodesByUUID(uuids):
+    """
+    Return a dict of scene nodes indexed by UUID, found with a single
+    scene query. UUIDs that don't match any node are not included.
+
+    Args:
+        uuids (list of str): The UUIDs of the nodes to find
+    """
+    uuids = list(set(uuids))
+    if not uuids:
+        # ls with no arguments would list every node
+        return {}
+    names = cmds.ls(uuids, long=True) or []
+    if not names:
+        return {}
+    # map the found nodes back to their UUIDs, ignoring any
+    # that were matched by name instead of by UUID
+    requested = set(uuids)
+    namesByUUID = {}
+    for name, nodeUUID in zip(names, cmds.ls(names, uuid=True)):
+        if nodeUUID in requested and nodeUUID not in namesByUUID:
+            namesByUUID[nodeUUID] = name
+    return dict([(u, pm.PyNode(n)) for u, n in namesByUUID.items()])
+
+
+def resolveNodeReferences(data):
+    """
+    Replace all UnresolvedNode references in serialized data with
+    the scene nodes they reference, or None if the node doesn't exist.
+    All nodes are found at once using `getNodesByUUID`, and any
+    references that could not be resolved are logged together.
+
+    Dicts and lists are modified in place.
+
+    Args:
+        data: Serialized data made of dicts, lists, and other values
+
+    Returns:
+        A tuple of (data, unresolvedUUIDs), where data is the resolved
+        data, and unresolvedUUIDs is a sorted list of UUIDs that could
+        not be found
+    """
+    if isinstance(data, UnresolvedNode):
+        nodes = getNodesByUUID([data.uuid])
+        node = nodes.get(data.uuid)
+        unresolved = [data.uuid] if node is None else []
+        _logUnresolved(unresolved)
+        return node, unresolved
+
+    # collect the (container, key, uuid) of every reference
+    refs = []
+    stack = [data]
+    while stack:
+        value = stack.pop()
+        if isinstance(value, dict):
+            items = value.iteritems()
+        elif isinstance(value, list):
+            items = enumerate(value)
+        else:
+            continue
+        for key, item in items:
+            if isinstance(item, UnresolvedNode):
+                refs.append((value, key, item.uuid))
+            elif isinstance(item, (dict, list)):
+                stack.append(item)
+    if not refs:
+        return data, []
+
+    nodes = getNodesByUUID([nodeUUID for _, _, nodeUUID in refs])
+    unresolved = set()
+    for container, key, nodeUUID in refs:
+        node = nodes.get(nodeUUID)
+        if node is None:
+            unresolved.add(nodeUUID)
+        container[key] = node
+    unresolved = sorted(unresolved)
+    _logUnresolved(unresolved)
+    return data, unresolved
+
+
+def _logUnresolved(uuids):
+    if uuids:
+        LOG.warning("Failed to find {0} referenced node(s): {1}".format(
+            len(uuids), ', '.join(uuids)))
+
+
+def _checkLibYaml():
+    """
+    Return True if the libyaml loader and dumper are available and
+    produce exactly the same results as the pure python implementation.
+    The C extension comes from a different yaml package than the
+    vendored one, which may not format data exactly the same way.
+    """
+    if CPulseDumper is None or CPulseLoader is None:
+        return False
+
+    data = UnsortableOrderedDict()
+    data['version'] = '1.0.0'
+    data['name'] = 'Root'
+    data['values'] = [1, 2.5, True, None, 'a b', u'\u00e9']
+    data['nested'] = UnsortableOrderedDict([('z', {}), ('a', [[]])])
+    data['plain'] = {'z': 1, 'b': {'y': [], 'c': 'x'}, 'a': None}
+    kwargs = dict(default_flow_style=False)
+    try:
+        pyText = yaml.dump(data, Dumper=PulseDumper, **kwargs)
+        cText = yaml.dump(data, Dumper=CPulseDumper, **kwargs)
+        if cText != pyText:
+            return False
+        text = pyText + 'node: !node null\n'
+        if yaml.load(text, Loader=CPulseLoader) != yaml.load(text, Loader=PulseLoader):
+            return False
+    except Exception as e:
+        LOG.debug("libyaml is not compatible, using pure python yaml: "
+                  "{0}".format(e))
+        return False
+    return True
+
+
+def isLibYamlEnabled():
+    """
+    Return True if the libyaml C loader and dumper will
+    be used for reading and writing Pulse yaml data.
+    """
+    global _LIBYAML_ENABLED
+    if _LIBYAML_ENABLED is None:
+        _LIBYAML_ENABLED = _checkLibYaml()
+    return _LIBYAML_ENABLED
+
+
+def getPulseLoader():
+    """
+    Return the fastest available yaml Loader class
+    for reading Pulse data.
+    """
+    return CPulseLoader if isLibYamlEnabled() else PulseLoader
+
+
+def getPulseDumper():
+    """
+    Return the fastest available yaml Dumper class
+    for writing Pulse data.
+    """
+    return CPulseDumper if isLibYamlEnabled() else PulseDumper
+
+
+def loadYaml(stream, resolveNodes=True):
+    """
+    Load Pulse data from a yaml string or stream, using
+    libyaml when it is available.
+
+    Args:
+        stream: A str or file-like object containing yaml
+        resolveNodes (bool): If False, node references are loaded
+            as UnresolvedNode instances instead of scene nodes
+    """
+    # node references are resolved all at once after loading
+    loader = CRawPulseLoader if isLibYamlEnabled() else RawPulseLoader
+    data = yaml.load(stream, Loader=loader)
+    if resolveNodes:
+        data = resolveNodeReferences(data)[0]
+    return data
+
+
+def dumpYaml(data, stream=None):
+    """
+    Dump Pulse data to yaml, using libyaml when it is available.
+    The output is the same regardless of the dumper used.
+
+    Args:
+        data: The data to serialize
+        stream: An optional file-like object to write to. If not
+            given, the yaml is returned as a str.
+    """
+    return yaml.dump(data, stream, default_flow_style=False,
+                     Dumper=getPulseDumper())
 
 
 def serializeAttrValue(value):
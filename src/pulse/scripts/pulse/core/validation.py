@@ -0,0 +1,168 @@
+"""
+Checking the actions of a blueprint for problems before building.
+"""
+
+import logging
+import time
+from multiprocessing.pool import ThreadPool
+
+from .buildItems import BuildAction, getRegisteredAction
+
+__all__ = [
+    'BlueprintChecker',
+    'CheckResults',
+]
+
+LOG = logging.getLogger(__name__)
+
+
+def _hasValidator(action):
+    """
+    Return True if an action implements `BuildAction.validate`
+    """
+    return getattr(type(action).validate, '__func__', None) is not \
+        BuildAction.validate.__func__
+
+
+def _runValidator(action):
+    """
+    Validate an action and return the error that occurred, if any.
+    """
+    try:
+        action.validate()
+    except Exception as error:
+        return error
+
+
+class CheckResults(object):
+    """
+    The problems found by a `BlueprintChecker`.
+    """
+
+    def __init__(self):
+        # list of (stepPath, actionId, error) for every problem found
+        self.errors = []
+        # the number of actions that were checked
+        self.actionCount = 0
+        self.elapsedTime = 0
+
+    def __repr__(self):
+        return "<CheckResults {0} error(s)>".format(len(self.errors))
+
+    def hasErrors(self):
+        return len(self.errors) > 0
+
+    def getErrorsByPath(self):
+        """
+        Return a dict of the error messages of each step that
+        has problems, indexed by step path.
+        """
+        result = {}
+        for path, actionId, error in self.errors:
+            result.setdefault(path, []).append(str(error))
+        return result
+
+    def logErrors(self, log=None):
+        """
+        Log every problem found, along with the step path and action id.
+        """
+        if log is None:
+            log = LOG
+        for path, actionId, error in self.errors:
+            log.error('{0} ({1}): {2}'.format(path, actionId, error))
+
+
+class BlueprintChecker(object):
+    """
+    Checks all actions of a Blueprint by calling `BuildAction.validate`.
+
+    Validators of actions that don't access the scene, see
+    `BuildAction.validateUsesScene`, are run concurrently on a pool
+    of threads, while the validators that access the scene are run
+    on the main thread in the meantime.
+    """
+
+    def __init__(self, blueprint, maxWorkers=4):
+        """
+        Args:
+            blueprint (Blueprint): The blueprint to check
+            maxWorkers (int): The maximum number of threads to use for
+                validators that don't access the scene, if 0 or less,
+                all validators run on the main thread
+        """
+        self.blueprint = blueprint
+        self.maxWorkers = maxWorkers
+
+    def _getActions(self, results):
+        """
+        Return a list of (stepPath, action) for all actions to validate,
+        recording errors for steps that have an invalid action id.
+        """
+        actions = []
+        for step in self.blueprint.rootStep.childIterator():
+            proxy = step.actionProxy
+            if proxy is None:
+                continue
+            path = step.getFullPath()
+            if getRegisteredAction(proxy.getActionId()) is None:
+                results.errors.append((
+                    path, proxy.getActionId(),
+                    'Unknown action id: {0}'.format(proxy.getActionId())))
+                continue
+            for action in step.actionIterator():
+                results.actionCount += 1
+                if _hasValidator(action):
+                    actions.append((path, action))
+        return actions
+
+    def run(self):
+        """
+        Check the blueprint and return the results.
+
+        Returns:
+            A `CheckResults` containing all problems found
+        """
+        startTime = time.time()
+        results = CheckResults()
+        actions = self._getActions(results)
+
+        # indeces of the actions to validate on the main thread or pool
+        sceneIndeces = []
+        freeIndeces = []
+        for index, (path, action) in enumerate(actions):
+            if action.validateUsesScene or self.maxWorkers <= 0:
+                sceneIndeces.append(index)
+            else:
+                freeIndeces.append(index)
+
+        pool = None
+        asyncResult = None
+        if freeIndeces:
+            workerCount = min(self.maxWorkers, len(freeIndeces))
+            pool = ThreadPool(workerCount)
+            chunkSize = max(1, len(freeIndeces) // (workerCount * 4))
+            asyncResult = pool.map_async(
+                _runValidator, [actions[i][1] for i in freeIndeces], chunkSize)
+
+        try:
+            # validators that access the scene run on the main thread
+            # while the others are running on the pool
+            errors = [_runValidator(actions[i][1]) for i in sceneIndeces]
+            if asyncResult:
+                errors.extend(asyncResult.get())
+        finally:
+            if pool:
+                pool.close()
+                pool.join()
+
+        # report problems in build order
+        errorsByIndex = dict(zip(sceneIndeces + freeIndeces, errors))
+        for index, (path, action) in enumerate(actions):
+            error = errorsByIndex[index]
+            if error is not None:
+                results.errors.append((path, action.getActionId(), error))
+
+        results.elapsedTime = time.time() - startTime
+        LOG.debug("Checked {0} actions in {1:.3f}s, {2} error(s)".format(
+            results.actionCount, results.elapsedTime, len(results.errors)))
+        return results
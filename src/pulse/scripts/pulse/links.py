@@ -14,6 +14,7 @@ import pymel.core as pm
 import pymetanode as meta
 
 import pulse.nodes
+from pulse.core.metaIndex import findIndexedMetaNodes, updateIndexedMetaNode
 
 __all__ = [
     'cleanupLinks',
@@ -32,6 +33,7 @@ def link(leader, follower):
     Link the follower to a leader
     """
     meta.setMetaData(follower, className=LINK_METACLASS, data=leader)
+    updateIndexedMetaNode(follower)
 
 
 def unlink(node):
@@ -39,6 +41,7 @@ def unlink(node):
     Remove a link from a node
     """
     meta.removeMetaData(node, className=LINK_METACLASS)
+    updateIndexedMetaNode(node)
 
 
 def getLink(node):
@@ -52,14 +55,14 @@ def getAllLinkedNodes():
     """
     Return all nodes in the scene that are linked
     """
-    return meta.findMetaNodes(className=LINK_METACLASS)
+    return findIndexedMetaNodes(LINK_METACLASS)
 
 
 def cleanupLinks():
     """
     Cleanup all nodes in the scene that have broken links
     """
-    nodes = meta.findMetaNodes(className=LINK_METACLASS)
+    nodes = getAllLinkedNodes()
     for node in nodes:
         if not getLink(node):
             unlink(node)
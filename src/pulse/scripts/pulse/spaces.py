@@ -7,6 +7,8 @@ import pymetanode as meta
 
 import pulse.nodes
 import pulse.utilnodes
+from pulse.core.metaIndex import (
+    findIndexedMetaNodes, getIndexedMetaData, updateIndexedMetaNode)
 
 __all__ = [
     'addDynamicSpace',
@@ -32,7 +34,7 @@ def getAllSpaces():
     """
     Return a list of all space nodes
     """
-    return meta.findMetaNodes(SPACE_METACLASS)
+    return findIndexedMetaNodes(SPACE_METACLASS)
 
 
 def getAllSpacesIndexedByName():
@@ -42,7 +44,7 @@ def getAllSpacesIndexedByName():
     allSpaceNodes = getAllSpaces()
     result = {}
     for spaceNode in allSpaceNodes:
-        spaceData = meta.getMetaData(spaceNode, SPACE_METACLASS)
+        spaceData = getIndexedMetaData(spaceNode, SPACE_METACLASS)
         result[spaceData['name']] = spaceNode
     return result
 
@@ -61,7 +63,7 @@ def getAllSpaceConstraints():
     """
     Return a list of all space constrained nodes
     """
-    return meta.findMetaNodes(SPACECONSTRAINT_METACLASS)
+    return findIndexedMetaNodes(SPACECONSTRAINT_METACLASS)
 
 
 def isSpaceConstraint(node):
@@ -86,6 +88,7 @@ def createSpace(node, name):
         'name': name,
     }
     meta.setMetaData(node, SPACE_METACLASS, data)
+    updateIndexedMetaNode(node)
 
 
 def prepareSpaceConstraint(node, follower, spaceNames):
@@ -149,6 +152,7 @@ def prepareSpaceConstraint(node, follower, spaceNames):
         data[metaKey] = addNode
 
     meta.setMetaData(node, SPACECONSTRAINT_METACLASS, data)
+    updateIndexedMetaNode(node)
 
     # setup space switching attr
     if not node.hasAttr(SPACESWITCH_ATTR):
@@ -7,6 +7,7 @@ from vendor.mayacoretools import preservedSelection
 
 from . import nodes
 from . import joints
+from .core.metaIndex import findIndexedMetaNodes, updateIndexedMetaNode
 
 __all__ = [
     'applyMirrorSettings',
@@ -74,7 +75,7 @@ def getAllMirrorNodes():
     """
     Return all nodes that have mirroring data
     """
-    return meta.findMetaNodes(MIRROR_METACLASS)
+    return findIndexedMetaNodes(MIRROR_METACLASS)
 
 
 def isMirrorNode(node):
@@ -103,6 +104,7 @@ def validateMirrorNode(node):
         LOG.debug("{0} paired node not found, "
                   "removing mirroring data".format(node))
         meta.removeMetaData(node, MIRROR_METACLASS)
+        updateIndexedMetaNode(node)
         return False
     else:
         othersOther = getPairedNode(otherNode, False)
@@ -110,6 +112,7 @@ def validateMirrorNode(node):
             LOG.debug("{0} pairing is unreciprocated, "
                       "removing mirror data".format(node))
             meta.removeMetaData(node, MIRROR_METACLASS)
+            updateIndexedMetaNode(node)
             return False
     return True
 
@@ -187,6 +190,7 @@ def setMirroringData(node, otherNode):
         'otherNode': otherNode,
     }
     meta.setMetaData(node, MIRROR_METACLASS, data, undoable=True)
+    updateIndexedMetaNode(node)
 
 
 def getPairedNode(node, validate=True):
@@ -222,6 +226,7 @@ def removeMirroringData(node):
         node: A PyNode, MObject, or node name
     """
     meta.removeMetaData(node, MIRROR_METACLASS)
+    updateIndexedMetaNode(node)
 
 
 # Transformations
@@ -390,9 +390,8 @@ class BatchAttrForm(QtWidgets.QFrame):
         if not attrPath:
             return
 
-        for i, value in enumerate(values):
-            strValue = serializeAttrValue(value)
-            cmds.pulseSetActionAttr(attrPath, strValue, v=i)
+        strValue = serializeAttrValue(list(values))
+        cmds.pulseSetActionAttr(attrPath, strValue, allVariants=True)
 
 
 class DefaultAttrForm(ActionAttrForm):
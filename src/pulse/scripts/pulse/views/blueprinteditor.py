@@ -39,6 +39,13 @@ class BlueprintEditorWidget(QtWidgets.QWidget):
             0, QtWidgets.QFormLayout.FieldRole, self.rigNameText)
         layout.addLayout(formLayout1)
 
+        self.binaryFormatCheck = QtWidgets.QCheckBox(self)
+        self.binaryFormatCheck.setText("Save Blueprint As Binary")
+        self.binaryFormatCheck.setChecked(
+            bool(self.blueprintModel.useBinaryFormat))
+        self.binaryFormatCheck.toggled.connect(self.binaryFormatToggled)
+        layout.addWidget(self.binaryFormatCheck)
+
         initBtn = QtWidgets.QPushButton(self)
         initBtn.setText("Initialize Blueprint")
         initBtn.clicked.connect(self.initBlueprint)
@@ -65,6 +72,9 @@ class BlueprintEditorWidget(QtWidgets.QWidget):
     def rigNameTextChanged(self):
         self.blueprintModel.setRigName(self.rigNameText.text())
 
+    def binaryFormatToggled(self, checked):
+        self.blueprintModel.useBinaryFormat = checked
+
     def initBlueprint(self):
         self.blueprintModel.initializeBlueprint()
 
@@ -6,6 +6,7 @@ import pymel.core as pm
 import pulse
 from pulse.vendor.Qt import QtCore, QtWidgets, QtGui
 from pulse.core import RigEventsMixin
+from pulse.prefs import optionVarProperty
 from .core import PulseWindow
 from .core import BlueprintUIModel
 
@@ -20,11 +21,23 @@ LOG = logging.getLogger(__name__)
 
 class BuildToolbarWidget(QtWidgets.QWidget, RigEventsMixin):
 
+    # whether to save and resume from build checkpoints
+    useCheckpoints = optionVarProperty(
+        'pulse.build.useCheckpoints', False)
+    # whether to suspend undo, refresh and callbacks while building
+    useFastBuild = optionVarProperty(
+        'pulse.build.useFastBuild', False)
+    # whether to reuse cached results of identical builds
+    useCache = optionVarProperty(
+        'pulse.build.useCache', False)
+
     def __init__(self, parent=None):
         super(BuildToolbarWidget, self).__init__(parent=parent)
 
         self.rigExists = len(pulse.getAllRigs()) > 0
         self.isStateDirty = False
+        # the executor of the current build, if building
+        self.buildExecutor = None
 
         self.blueprintModel = BlueprintUIModel.getDefaultModel()
 
@@ -73,6 +86,45 @@ class BuildToolbarWidget(QtWidgets.QWidget, RigEventsMixin):
         self.buildBtn.clicked.connect(self.runBuild)
         layout.addWidget(self.buildBtn)
 
+        self.checkpointsCheck = QtWidgets.QCheckBox(parent)
+        self.checkpointsCheck.setText("Checkpoints")
+        self.checkpointsCheck.setToolTip(
+            "Save scene snapshots during the build, and resume "
+            "from the first changed step when rebuilding")
+        self.checkpointsCheck.setChecked(self.useCheckpoints)
+        self.checkpointsCheck.toggled.connect(self.setUseCheckpoints)
+        layout.addWidget(self.checkpointsCheck)
+
+        self.fastBuildCheck = QtWidgets.QCheckBox(parent)
+        self.fastBuildCheck.setText("Fast Build")
+        self.fastBuildCheck.setToolTip(
+            "Disable undo, viewport refresh and callbacks while building. "
+            "Clears the undo queue")
+        self.fastBuildCheck.setChecked(self.useFastBuild)
+        self.fastBuildCheck.toggled.connect(self.setUseFastBuild)
+        layout.addWidget(self.fastBuildCheck)
+
+        self.cacheCheck = QtWidgets.QCheckBox(parent)
+        self.cacheCheck.setText("Cache")
+        self.cacheCheck.setToolTip(
+            "Open the cached result of an identical earlier build "
+            "instead of building")
+        self.cacheCheck.setChecked(self.useCache)
+        self.cacheCheck.toggled.connect(self.setUseCache)
+        layout.addWidget(self.cacheCheck)
+
+        self.pauseBtn = QtWidgets.QPushButton(parent)
+        self.pauseBtn.setText("Pause")
+        self.pauseBtn.setMaximumWidth(80)
+        self.pauseBtn.clicked.connect(self.togglePauseBuild)
+        layout.addWidget(self.pauseBtn)
+
+        self.cancelBtn = QtWidgets.QPushButton(parent)
+        self.cancelBtn.setText("Cancel")
+        self.cancelBtn.setMaximumWidth(80)
+        self.cancelBtn.clicked.connect(self.cancelBuild)
+        layout.addWidget(self.cancelBtn)
+
         self.openBPBtn = QtWidgets.QPushButton(parent)
         self.openBPBtn.setText("Open Blueprint")
         self.openBPBtn.clicked.connect(self.openBlueprintAndReload)
@@ -87,9 +139,25 @@ class BuildToolbarWidget(QtWidgets.QWidget, RigEventsMixin):
         self.isStateDirty = False
         self.setEnabled(True)
         self.rigExists = len(pulse.getAllRigs()) > 0
-        self.checkBtn.setVisible(not self.rigExists)
-        self.buildBtn.setVisible(not self.rigExists)
-        self.openBPBtn.setVisible(self.rigExists)
+        # while building, only the build can be paused or cancelled,
+        # the rest of the toolbar stays disabled
+        isBuilding = self.buildExecutor is not None
+        self.saveBtn.setEnabled(not isBuilding)
+        self.loadBtn.setEnabled(not isBuilding)
+        self.checkBtn.setVisible(not self.rigExists and not isBuilding)
+        self.buildBtn.setVisible(not self.rigExists and not isBuilding)
+        self.checkpointsCheck.setVisible(not self.rigExists)
+        self.checkpointsCheck.setEnabled(not isBuilding)
+        self.fastBuildCheck.setVisible(not self.rigExists)
+        self.fastBuildCheck.setEnabled(not isBuilding)
+        self.cacheCheck.setVisible(not self.rigExists)
+        self.cacheCheck.setEnabled(not isBuilding)
+        self.pauseBtn.setVisible(isBuilding)
+        self.pauseBtn.setText(
+            "Resume" if isBuilding and self.buildExecutor.isPaused
+            else "Pause")
+        self.cancelBtn.setVisible(isBuilding)
+        self.openBPBtn.setVisible(self.rigExists and not isBuilding)
 
     def onStateDirty(self):
         if not self.isStateDirty:
@@ -115,21 +183,68 @@ class BuildToolbarWidget(QtWidgets.QWidget, RigEventsMixin):
         pulse.openFirstRigBlueprint()
         self.blueprintModel.loadFromFile()
 
+    def setUseCheckpoints(self, enabled):
+        self.useCheckpoints = enabled
+
+    def setUseFastBuild(self, enabled):
+        self.useFastBuild = enabled
+
+    def setUseCache(self, enabled):
+        self.useCache = enabled
+
     def runCheck(self):
         if self.blueprintModel.blueprint is not None:
-            pass
+            results = pulse.BlueprintChecker(
+                self.blueprintModel.blueprint).run()
+            results.logErrors(LOG)
+            errorCount = len(results.errors)
+            if errorCount:
+                pm.inViewMessage(
+                    amg='Check Found {0} error(s)'.format(errorCount),
+                    pos='topCenter', backColor=0xaa8336,
+                    fade=True, fadeStayTime=3000)
+            else:
+                pm.inViewMessage(amg='Check Passed', pos='topCenter',
+                                 fade=True)
 
     def runBuild(self):
+        if self.buildExecutor is not None:
+            LOG.warning("A build is already running")
+            return
         if self.blueprintModel.blueprint is not None:
             # self.model.reloadBlueprint()
             blueprintFile = str(pm.sceneName())
             builder = pulse.BlueprintBuilder(
                 self.blueprintModel.blueprint,
                 blueprintFile=blueprintFile,
-                debug=True)
-            builder.start()
-            # self.model.reloadBlueprint()
-            cmds.evalDeferred(self.onStateDirty)
+                debug=True,
+                checkpoints=self.useCheckpoints,
+                fastBuild=self.useFastBuild,
+                cache=self.useCache,
+                check=True)
+            # build during idle events to keep the UI responsive
+            self.buildExecutor = pulse.BuildExecutor(builder)
+            self.buildExecutor.addDoneCallback(self.onBuildDone)
+            self.cleanState()
+            self.buildExecutor.start()
+
+    def togglePauseBuild(self):
+        if self.buildExecutor is None:
+            return
+        if self.buildExecutor.isPaused:
+            self.buildExecutor.resume()
+        else:
+            self.buildExecutor.pause()
+        self.cleanState()
+
+    def cancelBuild(self):
+        if self.buildExecutor is not None:
+            self.buildExecutor.cancel()
+
+    def onBuildDone(self, executor):
+        self.buildExecutor = None
+        # self.model.reloadBlueprint()
+        cmds.evalDeferred(self.onStateDirty)
 
 
 class BuildToolbarWindow(PulseWindow):
@@ -1,6 +1,7 @@
 
 import os
 import logging
+from collections import OrderedDict
 import maya.cmds as cmds
 import pymel.core as pm
 import maya.OpenMayaUI as mui
@@ -9,7 +10,9 @@ import pymetanode as meta
 
 import pulse
 from pulse.vendor.Qt import QtCore, QtWidgets, QtGui
-from pulse.core import Blueprint, BuildStep
+from pulse.core import Blueprint, BuildStep, BINARY_BLUEPRINT_EXT
+from pulse.core import UndoJournal, reverseDelta
+from pulse.prefs import optionVarProperty
 from .utils import dpiScale
 
 __all__ = [
@@ -183,12 +186,19 @@ class BlueprintUIModel(QtCore.QObject):
     # TODO: add more generic blueprint property data model
     rigNameChanged = QtCore.Signal(str)
 
+    # whether to save blueprints in the binary format instead of yaml
+    useBinaryFormat = optionVarProperty(
+        'pulse.editor.useBinaryBlueprints', False)
+
     def __init__(self, parent=None):
         super(BlueprintUIModel, self).__init__(parent=parent)
 
         # the blueprint of this model
         self.blueprint = Blueprint()
 
+        # deltas of changes made by undoable commands
+        self.undoJournal = UndoJournal()
+
         # the tree item model and selection model for BuildItems
         self.buildStepTreeModel = BuildStepTreeModel(self.blueprint)
         self.buildStepSelectionModel = BuildStepSelectionModel(
@@ -203,15 +213,40 @@ class BlueprintUIModel(QtCore.QObject):
         """
         return False
 
-    def getBlueprintFilepath(self):
+    def getBlueprintFilepath(self, binary=None):
         """
         Return the filepath for the Blueprint being edited
+
+        Args:
+            binary (bool): If True, return the path of the binary blueprint
+                file, if False the yaml file. Defaults to `useBinaryFormat`.
         """
         sceneName = pm.sceneName()
         if not sceneName:
             return None
 
-        filepath = os.path.splitext(sceneName)[0] + '.yaml'
+        if binary is None:
+            binary = self.useBinaryFormat
+        ext = BINARY_BLUEPRINT_EXT if binary else '.yaml'
+        filepath = os.path.splitext(sceneName)[0] + ext
+        return filepath
+
+    def getExistingBlueprintFilepath(self):
+        """
+        Return the filepath of the Blueprint file to load. Prefers
+        the file of the current format, but will fall back to the other
+        format if it is the only one that exists, or if it is newer.
+        """
+        filepath = self.getBlueprintFilepath()
+        if not filepath:
+            return None
+
+        otherFilepath = self.getBlueprintFilepath(
+            binary=not self.useBinaryFormat)
+        if os.path.isfile(otherFilepath):
+            if (not os.path.isfile(filepath) or
+                    os.path.getmtime(otherFilepath) > os.path.getmtime(filepath)):
+                return otherFilepath
         return filepath
 
     def saveToFile(self, suppressWarnings=False):
@@ -232,13 +267,14 @@ class BlueprintUIModel(QtCore.QObject):
         """
         Load the Blueprint from the file associated with this model
         """
-        filepath = self.getBlueprintFilepath()
+        filepath = self.getExistingBlueprintFilepath()
         if not filepath:
             if not suppressWarnings:
                 LOG.warning("Scene is not saved")
             return
 
-        success = self.blueprint.loadFromFile(filepath)
+        # steps are deserialized as they are shown in the UI
+        success = self.blueprint.loadFromFile(filepath, lazy=True)
         self.emitAllModelResets()
 
         if not success:
@@ -298,6 +334,121 @@ class BlueprintUIModel(QtCore.QObject):
         index = self.buildStepTreeModel.indexByStepPath(stepPath)
         self.buildStepTreeModel.dataChanged.emit(index, index, [])
 
+    def getStepDeltaData(self, stepPath):
+        """
+        Return serialized data for a step, without its children,
+        for creating deltas of changes to the step.
+        See `applyStepDelta`.
+        """
+        step = self.blueprint.getStepByPath(stepPath)
+        if not step:
+            LOG.error("Could not find step: {0}".format(stepPath))
+            return
+
+        data = {'name': step.name}
+        if step.isAction():
+            data['action'] = step.actionProxy.serialize()
+        return data
+
+    def applyStepDelta(self, stepPath, delta, reverse=False):
+        """
+        Apply a delta of changes to a step, where the delta was
+        created by diffing the results of `getStepDeltaData`.
+
+        Args:
+            stepPath (str): The path to the step to modify
+            delta (list): A delta created by `pulse.core.diffData`
+            reverse (bool): If True, undo the changes of the delta
+
+        Returns:
+            The new path (str) of the step, or None if
+            the operation failed.
+        """
+        if self.isReadOnly():
+            return
+
+        step = self.blueprint.getStepByPath(stepPath)
+        if not step:
+            LOG.error("applyStepDelta: failed to find step: {0}".format(
+                stepPath))
+            return
+
+        if reverse:
+            delta = reverseDelta(delta)
+
+        # split changes to the action data from changes to the step
+        actionDelta = []
+        newName = None
+        for op, path, key, oldValue, newValue in delta:
+            if path[:1] == ('action',):
+                actionDelta.append((op, path[1:], key, oldValue, newValue))
+            elif op == 'set' and not path and key == 'name':
+                newName = newValue
+            else:
+                LOG.error("applyStepDelta: cannot apply change to "
+                          "{0}: {1}".format(step, key))
+                return
+
+        index = self.buildStepTreeModel.indexByStepPath(stepPath)
+        if actionDelta:
+            if not step.isAction():
+                LOG.error(
+                    "applyStepDelta: {0} is not an action".format(step))
+                return
+            try:
+                step.actionProxy.applyDelta(actionDelta)
+            except ValueError as e:
+                LOG.error("applyStepDelta: {0}".format(e))
+                return
+        if newName is not None:
+            step.setName(newName)
+
+        self.buildStepTreeModel.dataChanged.emit(index, index, [])
+        return step.getFullPath()
+
+    def getStepsDeltaData(self, stepPaths):
+        """
+        Return serialized data for multiple steps, for creating
+        a single delta of changes to all the steps, indexed by path.
+        See `getStepDeltaData` and `applyStepsDelta`.
+        """
+        data = {}
+        for stepPath in stepPaths:
+            stepData = self.getStepDeltaData(stepPath)
+            if stepData is None:
+                return
+            data[stepPath] = stepData
+        return data
+
+    def applyStepsDelta(self, delta, reverse=False):
+        """
+        Apply a delta of changes to multiple steps, where the delta
+        was created by diffing the results of `getStepsDeltaData`.
+
+        Args:
+            delta (list): A delta created by `pulse.core.diffData`
+            reverse (bool): If True, undo the changes of the delta
+
+        Returns:
+            True if the changes were applied to all steps.
+        """
+        if reverse:
+            delta = reverseDelta(delta)
+
+        stepDeltas = OrderedDict()
+        for op, path, key, oldValue, newValue in delta:
+            if not path:
+                LOG.error("applyStepsDelta: cannot add or remove steps")
+                return False
+            stepDeltas.setdefault(path[0], []).append(
+                (op, path[1:], key, oldValue, newValue))
+
+        success = True
+        for stepPath, stepDelta in stepDeltas.items():
+            if self.applyStepDelta(stepPath, stepDelta) is None:
+                success = False
+        return success
+
     def getActionAttr(self, attrPath, variantIndex=-1):
         stepPath, attrName = attrPath.split('.')
 
@@ -320,22 +471,105 @@ class BlueprintUIModel(QtCore.QObject):
     def setActionAttr(self, attrPath, value, variantIndex=-1):
         """
         Set the value for an attribute on the Blueprint
+
+        Returns:
+            The list of paths (str) of the modified steps, or None
+            if the operation failed.
+        """
+        return self.setActionAttrs([(attrPath, variantIndex, value)])
+
+    def setActionAttrs(self, edits):
+        """
+        Set the values of multiple attributes on the Blueprint at once.
+        No values are set if any of the attributes are invalid, and
+        dataChanged is emitted once for each modified step.
+
+        Args:
+            edits (list): A list of (attrPath, variantIndex, value) for
+                each attribute to set, where variantIndex is -1 to set
+                the invariant value of the attribute
+
+        Returns:
+            The list of paths (str) of the modified steps, or None
+            if the operation failed.
         """
         if self.isReadOnly():
             return
 
+        # resolve all steps before modifying anything
+        stepsByPath = {}
+        resolvedEdits = []
+        for attrPath, variantIndex, value in edits:
+            stepPath, attrName = attrPath.split('.')
+            if stepPath not in stepsByPath:
+                step = self.blueprint.getStepByPath(stepPath)
+                if not step:
+                    LOG.error("setActionAttrs: failed to find step: "
+                              "{0}".format(stepPath))
+                    return
+                if not step.isAction():
+                    LOG.error(
+                        'setActionAttrs: {0} is not an action'.format(step))
+                    return
+                stepsByPath[stepPath] = step
+            resolvedEdits.append(
+                (stepPath, stepsByPath[stepPath], attrName,
+                 variantIndex, value))
+
+        stepPaths = []
+        for stepPath, step, attrName, variantIndex, value in resolvedEdits:
+            if variantIndex >= 0:
+                variant = step.actionProxy.getOrCreateVariant(variantIndex)
+                variant.setAttrValue(attrName, value)
+            else:
+                step.actionProxy.setAttrValue(attrName, value)
+            if stepPath not in stepPaths:
+                stepPaths.append(stepPath)
+
+        for stepPath in stepPaths:
+            index = self.buildStepTreeModel.indexByStepPath(stepPath)
+            self.buildStepTreeModel.dataChanged.emit(index, index, [])
+        return stepPaths
+
+    def getActionAttrVariantValues(self, attrPath):
+        """
+        Return the values of a variant attribute for all variants
+        """
         stepPath, attrName = attrPath.split('.')
 
         step = self.blueprint.getStepByPath(stepPath)
+        if not step:
+            LOG.error("Could not find step: {0}".format(stepPath))
+            return
+
         if not step.isAction():
-            LOG.error('setActionAttr: {0} is not an action'.format(step))
+            LOG.error(
+                'getActionAttrVariantValues: {0} is not an action'.format(step))
             return
 
-        if variantIndex >= 0:
-            variant = step.actionProxy.getOrCreateVariant(variantIndex)
-            variant.setAttrValue(attrName, value)
-        else:
-            step.actionProxy.setAttrValue(attrName, value)
+        return step.actionProxy.getVariantValues(attrName)
+
+    def setActionAttrVariantValues(self, attrPath, values):
+        """
+        Set the values of a variant attribute for multiple
+        variants at once, starting with the first variant.
+        """
+        if self.isReadOnly():
+            return
+
+        stepPath, attrName = attrPath.split('.')
+
+        step = self.blueprint.getStepByPath(stepPath)
+        if not step:
+            LOG.error("Could not find step: {0}".format(stepPath))
+            return
+
+        if not step.isAction():
+            LOG.error(
+                'setActionAttrVariantValues: {0} is not an action'.format(step))
+            return
+
+        step.actionProxy.setVariantValues(attrName, values)
 
         index = self.buildStepTreeModel.indexByStepPath(stepPath)
         self.buildStepTreeModel.dataChanged.emit(index, index, [])
@@ -513,8 +747,7 @@ class BuildStepTreeModel(QtCore.QAbstractItemModel):
     def insertRows(self, row, count, parent=QtCore.QModelIndex()):
         self.beginInsertRows(parent, row, row + count - 1)
         step = self.stepForIndex(parent)
-        for _ in range(count):
-            step.insertChild(row, BuildStep())
+        step.insertChildren(row, [BuildStep() for _ in range(count)])
         self.endInsertRows()
         return True
 
@@ -579,7 +812,8 @@ class BuildStepTreeModel(QtCore.QAbstractItemModel):
 
         def getSingleItemData(index):
             step = self.stepForIndex(index)
-            data = step.serialize()
+            # copy the serialized data, since it is shared with the step
+            data = step.serialize().copy()
             if 'children' in data:
                 del data['children']
             return data
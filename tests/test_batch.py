@@ -0,0 +1,63 @@
+import os
+import sys
+import json
+import shutil
+import tempfile
+import unittest
+
+import pulse.batch
+
+# a worker that succeeds for every scene except those named 'bad'
+STUB_WORKER = '''
+import os
+import sys
+import json
+jobFile, resultFile = sys.argv[1:3]
+with open(jobFile, 'r') as fp:
+    job = json.load(fp)
+name = os.path.splitext(os.path.basename(job['scene']))[0]
+if name == 'crash':
+    sys.exit(1)
+errors = [dict(path='Main', actionId='Test', message='failed')] \\
+    if name == 'bad' else []
+with open(resultFile, 'w') as fp:
+    json.dump(dict(success=not errors, errors=errors, buildTime=0), fp)
+'''
+
+
+class TestBatch(unittest.TestCase):
+
+    def setUp(self):
+        self.tempDir = tempfile.mkdtemp(prefix='pulse_test_batch_')
+        self.workerPath = os.path.join(self.tempDir, 'worker.py')
+        with open(self.workerPath, 'w') as fp:
+            fp.write(STUB_WORKER)
+
+    def tearDown(self):
+        shutil.rmtree(self.tempDir)
+
+    def test_runBatch(self):
+        outputDir = os.path.join(self.tempDir, 'output')
+        jobs = [
+            {'scene': 'a/rig.ma'},
+            {'scene': 'b/rig.ma', 'blueprint': 'b/rig.yaml'},
+            {'scene': 'bad.ma'},
+            {'scene': 'crash.ma'},
+        ]
+        report = pulse.batch.runBatch(
+            jobs, outputDir, workerCount=2,
+            workerCommand=[sys.executable, self.workerPath])
+
+        self.assertEqual(report['jobCount'], 4)
+        self.assertEqual(report['succeeded'], 2)
+        self.assertEqual(report['failed'], 2)
+        self.assertEqual(report['errorCount'], 2)
+        self.assertEqual([r['name'] for r in report['jobs']],
+                         ['rig', 'rig_1', 'bad', 'crash'])
+        self.assertEqual(report['jobs'][1]['blueprint'],
+                         os.path.abspath('b/rig.yaml'))
+        self.assertEqual(report['jobs'][2]['errors'][0]['path'], 'Main')
+        self.assertEqual(report['jobs'][3]['returnCode'], 1)
+
+        with open(os.path.join(outputDir, 'report.json'), 'r') as fp:
+            self.assertEqual(json.load(fp)['succeeded'], 2)
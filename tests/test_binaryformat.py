@@ -0,0 +1,55 @@
+
+import os
+import shutil
+import tempfile
+import unittest
+
+import pulse
+from pulse.core import binaryFormat
+
+
+class TestBinaryFormat(unittest.TestCase):
+
+    def setUp(self):
+        self.tempDir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tempDir)
+
+    def test_roundTrip(self):
+        data = {
+            'name': 'Root',
+            'values': [0, -1, 2 ** 40, 2 ** 70, 1.5, True, False, None],
+            'unicode': u'\u00e9',
+            'nested': {'a': [[], {}], 'b': ['a', 'a', 'b']},
+        }
+        result = binaryFormat.loadBinary(binaryFormat.dumpBinary(data))
+        self.assertEqual(result, data)
+
+    def test_unresolvedNodes(self):
+        node = pulse.UnresolvedNode('6A5E7F1B-4B1F-4F2A-9C1D-0123456789AB')
+        oddNode = pulse.UnresolvedNode('not-a-uuid')
+        dataStr = binaryFormat.dumpBinary([node, oddNode])
+        result = binaryFormat.loadBinary(dataStr, resolveNodes=False)
+        self.assertEqual(result, [node, oddNode])
+
+    def test_isBinaryData(self):
+        self.assertTrue(binaryFormat.isBinaryData(
+            binaryFormat.dumpBinary({})))
+        self.assertFalse(binaryFormat.isBinaryData('version: 1.0.0'))
+
+    def test_convertBlueprintFile(self):
+        bp = pulse.Blueprint()
+        bp.initializeDefaultActions()
+        yamlFile = os.path.join(self.tempDir, 'a.yaml')
+        binFile = os.path.join(self.tempDir, 'a' + pulse.BINARY_BLUEPRINT_EXT)
+        yamlFile2 = os.path.join(self.tempDir, 'b.yaml')
+        bp._writeFile(yamlFile)
+
+        self.assertTrue(pulse.convertBlueprintFile(yamlFile, binFile))
+        with open(binFile, 'rb') as fp:
+            self.assertTrue(binaryFormat.isBinaryData(fp.read(4)))
+
+        self.assertTrue(pulse.convertBlueprintFile(binFile, yamlFile2))
+        with open(yamlFile, 'rb') as fpA, open(yamlFile2, 'rb') as fpB:
+            self.assertEqual(fpA.read(), fpB.read())
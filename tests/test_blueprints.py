@@ -1,4 +1,9 @@
 
+import os
+import json
+import shutil
+import logging
+import tempfile
 import unittest
 import pymel.core as pm
 
@@ -44,3 +49,508 @@ class TestBlueprints(unittest.TestCase):
         assemblies = pm.ls(assemblies=True)
         self.assertTrue(len(assemblies) == 5)
 
+
+    def test_buildProfile(self):
+        bp = pulse.Blueprint()
+        bp.rigName = 'testRig'
+        bp.initializeDefaultActions()
+        logDir = tempfile.mkdtemp()
+        builder = pulse.BlueprintBuilder(bp, logDir=logDir, profile=True)
+        builder.start()
+        self.assertTrue(builder.isFinished)
+
+        results = builder.profiler.results
+        self.assertEqual(len(results), len(list(bp.actionIterator())))
+        self.assertTrue(all([r['wallTime'] >= 0 for r in results]))
+        basePath = os.path.join(logDir, builder.logName + '_profile')
+        with open(basePath + '.json') as fp:
+            traceData = json.load(fp)
+        self.assertEqual(len(traceData['traceEvents']), len(results))
+        self.assertTrue(os.path.isfile(basePath + '.txt'))
+
+    def test_buildJsonLog(self):
+        bp = pulse.Blueprint()
+        bp.rigName = 'testRig'
+        bp.initializeDefaultActions()
+        rootRecords = []
+        rootHandler = logging.Handler()
+        rootHandler.emit = rootRecords.append
+        rootLogger = logging.getLogger()
+        rootLevel = rootLogger.level
+        rootLogger.addHandler(rootHandler)
+        try:
+            for level in (logging.INFO, logging.WARNING):
+                # info is the level used by batch workers
+                rootLogger.setLevel(level)
+                del rootRecords[:]
+                logDir = tempfile.mkdtemp()
+                builder = pulse.BlueprintBuilder(
+                    bp, logDir=logDir, jsonLog=True)
+                builder.start()
+                self.assertTrue(builder.isFinished)
+                builder.log.warning('Test warning')
+                # only warnings reach the console
+                self.assertEqual(
+                    [r.getMessage() for r in rootRecords
+                     if r.name == 'pulse.build'], ['Test warning'])
+
+                jsonFile = os.path.join(logDir, builder.logName + '.jsonl')
+                with open(jsonFile) as fp:
+                    records = [json.loads(line) for line in fp]
+                self.assertEqual(
+                    len(records), len(list(bp.actionIterator())))
+                self.assertTrue(all([r['path'] for r in records]))
+                self.assertTrue(all([r['error'] is None for r in records]))
+                shutil.rmtree(logDir)
+        finally:
+            rootLogger.removeHandler(rootHandler)
+            rootLogger.setLevel(rootLevel)
+
+    def test_fastBuild(self):
+        class TestFastBuildAction(pulse.BuildAction):
+            def run(self):
+                raise RuntimeError('action failed')
+
+        pulse.registerAction(
+            {'id': 'Test.FastBuild', 'attrs': []}, TestFastBuildAction)
+        try:
+            bp = pulse.Blueprint()
+            bp.rigName = 'testRig'
+            bp.initializeDefaultActions()
+            bp.rootStep.addChild(pulse.BuildStep(actionId='Test.FastBuild'))
+            pm.undoInfo(state=True)
+            pm.group(em=True)
+            builder = pulse.BlueprintBuilder(bp, fastBuild=True)
+            builder.start()
+            self.assertTrue(builder.isFinished)
+            self.assertEqual(len(builder.errors), 1)
+            self.assertFalse(builder.fastBuildContext.isSuspended)
+            self.assertTrue(pm.undoInfo(q=True, state=True))
+            # changes from before the build can no longer be undone
+            self.assertTrue(pm.undoInfo(q=True, undoQueueEmpty=True))
+            self.assertFalse(
+                pulse.RigLifecycleEvents.getShared().isPaused())
+        finally:
+            pulse.unregisterAction('Test.FastBuild')
+
+    def test_buildCheckpoints(self):
+        builtSteps = []
+
+        class TestCheckpointAction(pulse.BuildAction):
+            def run(self):
+                builtSteps.append(self.tag)
+
+        pulse.registerAction({'id': 'Test.Checkpoint', 'attrs': [
+            {'name': 'tag', 'type': 'string'}]}, TestCheckpointAction)
+        tempDir = tempfile.mkdtemp()
+        try:
+            pm.newFile(force=True)
+            sceneFile = pm.saveAs(os.path.join(tempDir, 'source.mb'))
+
+            def build(tags):
+                # builds start from the saved source scene
+                pm.openFile(sceneFile, force=True)
+                bp = pulse.Blueprint()
+                bp.rigName = 'testCheckpointRig'
+                for tag in tags:
+                    step = pulse.BuildStep(tag, actionId='Test.Checkpoint')
+                    step.actionProxy.setAttrValue('tag', tag)
+                    bp.rootStep.addChild(step)
+                del builtSteps[:]
+                builder = pulse.BlueprintBuilder(
+                    bp, blueprintFile=str(sceneFile), logDir=tempDir,
+                    checkpoints=True)
+                builder.checkpoints.rigDir = os.path.join(tempDir, 'cache')
+                builder.start()
+                self.assertTrue(builder.isFinished)
+                return builder
+
+            self.assertEqual(build(['A', 'B', 'C']).resumeStepIndex, -1)
+            self.assertEqual(builtSteps, ['A', 'B', 'C'])
+            # only steps after the first changed step are built again
+            builder = build(['A', 'B', 'D'])
+            self.assertEqual(builder.resumeStepIndex, 1)
+            self.assertEqual(builtSteps, ['D'])
+            self.assertEqual(len(pulse.getAllRigs()), 1)
+            self.assertEqual(pm.sceneName(), sceneFile)
+        finally:
+            pulse.unregisterAction('Test.Checkpoint')
+            pm.newFile(force=True)
+            shutil.rmtree(tempDir)
+
+    def test_buildCheckpointsFallback(self):
+        builtNodes = []
+
+        class TestCheckpointAction(pulse.BuildAction):
+            def run(self):
+                builtNodes.append(self.node.exists())
+
+        pulse.registerAction({'id': 'Test.Checkpoint', 'attrs': [
+            {'name': 'node', 'type': 'node'}]}, TestCheckpointAction)
+        tempDir = tempfile.mkdtemp()
+        try:
+            pm.newFile(force=True)
+            pm.group(em=True, n='checkpointSource')
+            sceneFile = pm.saveAs(os.path.join(tempDir, 'source.mb'))
+            cacheDir = os.path.join(tempDir, 'cache')
+
+            def build():
+                bp = pulse.Blueprint()
+                bp.rigName = 'testCheckpointRig'
+                for name in ('A', 'B'):
+                    step = pulse.BuildStep(name, actionId='Test.Checkpoint')
+                    step.actionProxy.setAttrValue(
+                        'node', pm.PyNode('checkpointSource'))
+                    bp.rootStep.addChild(step)
+                del builtNodes[:]
+                builder = pulse.BlueprintBuilder(
+                    bp, blueprintFile=str(sceneFile), logDir=tempDir,
+                    checkpoints=True)
+                builder.checkpoints.rigDir = cacheDir
+                builder.start()
+                self.assertTrue(builder.isFinished)
+                return builder
+
+            build()
+            checkpointFiles = [os.path.join(cacheDir, f)
+                               for f in os.listdir(cacheDir)]
+            self.assertTrue(checkpointFiles)
+
+            # unsaved changes to the scene are not checkpointed
+            pm.openFile(sceneFile, force=True)
+            pm.group(em=True, n='unsaved')
+            self.assertEqual(build().resumeStepIndex, -1)
+            self.assertEqual(len(pulse.getAllRigs()), 1)
+            self.assertTrue(pm.objExists('unsaved'))
+
+            # remove the rig from all checkpoints
+            for path in checkpointFiles:
+                pm.openFile(path, force=True)
+                pm.delete(pulse.getAllRigs())
+                pm.saveFile(force=True)
+
+            pm.openFile(sceneFile, force=True)
+            builder = build()
+            self.assertEqual(builder.resumeStepIndex, -1)
+            # the blueprint's node references are resolved
+            # in the reopened source scene
+            self.assertEqual(builtNodes, [True, True])
+            self.assertEqual(len(pulse.getAllRigs()), 1)
+            self.assertEqual(pm.sceneName(), sceneFile)
+        finally:
+            pulse.unregisterAction('Test.Checkpoint')
+            pm.newFile(force=True)
+            shutil.rmtree(tempDir)
+
+    def test_buildCacheUnsavedChanges(self):
+        tempDir = tempfile.mkdtemp()
+        try:
+            pm.newFile(force=True)
+            sceneFile = pm.saveAs(os.path.join(tempDir, 'source.mb'))
+
+            def build():
+                bp = pulse.Blueprint()
+                bp.rigName = 'testCacheRig'
+                bp.initializeDefaultActions()
+                builder = pulse.BlueprintBuilder(
+                    bp, blueprintFile=str(sceneFile), logDir=tempDir,
+                    cache=True)
+                builder.cache.cacheDir = os.path.join(tempDir, 'cache')
+                builder.start()
+                self.assertTrue(builder.isFinished)
+                return builder
+
+            self.assertFalse(build().isCacheHit)
+            pm.openFile(sceneFile, force=True)
+            self.assertTrue(build().isCacheHit)
+
+            # unsaved changes to the scene are never discarded
+            pm.openFile(sceneFile, force=True)
+            pm.group(em=True, n='unsaved')
+            builder = build()
+            self.assertFalse(builder.isCacheHit)
+            self.assertIsNone(builder.cacheKey)
+            self.assertTrue(pm.objExists('unsaved'))
+        finally:
+            pm.newFile(force=True)
+            shutil.rmtree(tempDir)
+
+    def test_incrementalSerialize(self):
+        bp = pulse.Blueprint()
+        bp.initializeDefaultActions()
+        mainStep = bp.getStepByPath('Main')
+        ctlStep = pulse.BuildStep(actionId='Pulse.AnimControl')
+        mainStep.addChild(ctlStep)
+
+        data = bp.rootStep.serialize()
+        self.assertFalse(bp.rootStep.isDirty())
+        importData = bp.getStepByPath('Import References').serialize()
+
+        # modifying a proxy marks the step and all parents dirty
+        ctlStep.actionProxy.setAttrValue('createOffset', False)
+        self.assertTrue(ctlStep.isDirty())
+        self.assertTrue(mainStep.isDirty())
+        self.assertTrue(bp.rootStep.isDirty())
+        self.assertFalse(bp.getStepByPath('Import References').isDirty())
+
+        newData = bp.rootStep.serialize()
+        self.assertIsNot(newData, data)
+        # unmodified steps reuse their cached data
+        self.assertIs(newData['children'][0], importData)
+        ctlData = newData['children'][2]['children'][0]
+        self.assertEqual(ctlData['action']['createOffset'], False)
+
+    def test_lazyDeserialize(self):
+        bp = pulse.Blueprint()
+        bp.initializeDefaultActions()
+        mainStep = bp.getStepByPath('Main')
+        mainStep.addChild(pulse.BuildStep(actionId='Pulse.AnimControl'))
+        yamlStr = bp.dumpYaml()
+
+        lazyBp = pulse.Blueprint.fromData(bp.serialize(), lazy=True)
+        self.assertEqual(lazyBp.rootStep.numChildren(), 5)
+        # untouched children are serialized from their data
+        self.assertEqual(lazyBp.dumpYaml(), yamlStr)
+
+        lazyMainStep = lazyBp.getStepByPath('Main')
+        self.assertEqual(lazyMainStep.numChildren(), 1)
+        ctlStep = lazyMainStep.getChildAt(0)
+        self.assertEqual(ctlStep.actionProxy.getActionId(), 'Pulse.AnimControl')
+        self.assertEqual(lazyBp.dumpYaml(), yamlStr)
+
+    def test_lazyDeserializeDuplicateNames(self):
+        data = {'name': 'Root', 'children': [
+            {'name': 'Group', 'children': [
+                {'name': 'Step'}, {'name': 'Step'}, {'name': ' Step 1 '}]},
+            {'name': 'Group'},
+            {'name': ''},
+        ]}
+        eagerData = pulse.BuildStep.fromData(data).serialize()
+        lazyRoot = pulse.BuildStep.fromData(data, lazy=True)
+        lazyData = lazyRoot.serialize()
+        self.assertEqual(lazyData, eagerData)
+
+        # accessing children doesn't invalidate the cached data
+        self.assertEqual([c.name for c in lazyRoot.children],
+                         ['Group', 'Group 1', 'BuildStep'])
+        self.assertEqual([c.name for c in lazyRoot.getChildAt(0).children],
+                         ['Step', 'Step 1', 'Step 2'])
+        self.assertFalse(lazyRoot.isDirty())
+        self.assertIs(lazyRoot.serialize(), lazyData)
+        self.assertEqual(lazyRoot.getIndexErrors(), [])
+
+    def test_lazyDeserializeEdits(self):
+        bp = pulse.Blueprint()
+        bp.initializeDefaultActions()
+        mainStep = bp.getStepByPath('Main')
+        mainStep.addChild(pulse.BuildStep('Ctl', actionId='Pulse.AnimControl'))
+        lazyRoot = pulse.BuildStep.fromData(bp.rootStep.serialize(), lazy=True)
+        lazyRoot.serialize()
+
+        # edits of materialized children are included in the cached data
+        lazyRoot.getChildByPath('Main/Ctl').actionProxy.setAttrValue(
+            'createOffset', False)
+        self.assertTrue(lazyRoot.isDirty())
+        lazyRoot.serialize()
+        lazyRoot.children[0].setName('Renamed')
+        self.assertTrue(lazyRoot.isDirty())
+
+        data = lazyRoot.serialize()
+        self.assertEqual(data['children'][0]['name'], 'Renamed')
+        ctlStep = pulse.BuildStep.fromData(data).getChildByPath('Main/Ctl')
+        self.assertEqual(
+            ctlStep.actionProxy.getAttrValue('createOffset'), False)
+
+    def test_pathIndex(self):
+        bp = pulse.Blueprint()
+        bp.initializeDefaultActions()
+        root = bp.rootStep
+        mainStep = bp.getStepByPath('Main')
+        groupA = pulse.BuildStep('GroupA')
+        groupB = pulse.BuildStep('GroupB')
+        mainStep.addChildren([groupA, groupB])
+        ctlStep = pulse.BuildStep(actionId='Pulse.AnimControl')
+        groupA.addChild(ctlStep)
+
+        self.assertIs(bp.getStepByPath('Main/GroupA/Anim Control'), ctlStep)
+        self.assertEqual(root.getIndexErrors(), [])
+
+        groupA.setName('Renamed')
+        self.assertIsNone(bp.getStepByPath('Main/GroupA/Anim Control'))
+        self.assertIs(bp.getStepByPath('Main/Renamed/Anim Control'), ctlStep)
+
+        groupA.removeChild(ctlStep)
+        groupB.insertChild(0, ctlStep)
+        self.assertIsNone(bp.getStepByPath('Main/Renamed/Anim Control'))
+        self.assertIs(bp.getStepByPath('Main/GroupB/Anim Control'), ctlStep)
+
+        mainStep.removeChildAt(0)
+        self.assertIsNone(bp.getStepByPath('Main/Renamed'))
+        self.assertEqual(root.getIndexErrors(), [])
+
+        bp.deserialize(bp.serialize(), lazy=True)
+        newCtlStep = bp.getStepByPath('Main/GroupB/Anim Control')
+        self.assertIsNotNone(newCtlStep)
+        self.assertIs(bp.getStepByPath('Main/GroupB/Anim Control'), newCtlStep)
+        self.assertEqual(root.getIndexErrors(), [])
+
+    def test_addChildrenUniqueNames(self):
+        group = pulse.BuildStep('Group')
+        group.addChildren([pulse.BuildStep(n) for n in
+                           ['Step', 'Step', 'Step 2', 'Step', 'Step9', 'Step9']])
+        self.assertEqual([s.name for s in group.children],
+                         ['Step', 'Step 1', 'Step 2', 'Step 3', 'Step9', 'Step10'])
+
+        group.removeChildAt(1)
+        group.insertChildren(0, [pulse.BuildStep('Step'),
+                                 pulse.BuildStep('Step')])
+        self.assertEqual([s.name for s in group.children],
+                         ['Step 1', 'Step 4', 'Step', 'Step 2', 'Step 3',
+                          'Step9', 'Step10'])
+        self.assertEqual(group.getIndexErrors(), [])
+
+    def test_actionSchema(self):
+        schema = pulse.getBuildActionSchema('Pulse.AnimControl')
+        self.assertIsNotNone(schema)
+        self.assertEqual(schema.attrNames,
+                         [a['name'] for a in schema.config['attrs']])
+        self.assertEqual(schema.getAttrDefaultValue('keyableAttrs'),
+                         ['t', 'r', 's'])
+        self.assertTrue(schema.isAttrValueValid('createOffset', True))
+        self.assertFalse(schema.isAttrValueValid('createOffset', 'yes'))
+        self.assertFalse(schema.isAttrValueValid('notAnAttr', True))
+
+        proxy = pulse.BuildActionProxy('Pulse.AnimControl')
+        self.assertIs(proxy.getAttrConfig('createOffset'),
+                      schema.getAttrConfig('createOffset'))
+
+    def test_registerAction(self):
+        class TestRegistryAction(pulse.BuildAction):
+            pass
+
+        self.assertIn('Pulse.AnimControl', pulse.getRegisteredActions())
+        pulse.registerAction({'id': 'Test.Registry', 'attrs': []},
+                             TestRegistryAction)
+        try:
+            action = TestRegistryAction()
+            self.assertEqual(action.getActionId(), 'Test.Registry')
+        finally:
+            pulse.unregisterAction('Test.Registry')
+        self.assertNotIn('Test.Registry', pulse.getRegisteredActions())
+        self.assertIsNone(TestRegistryAction().getActionId())
+
+    def test_variantActions(self):
+        ctlNode = pm.polyCube(n='variant_ctl')[0]
+        proxy = pulse.BuildActionProxy('Pulse.SpaceConstrain')
+        proxy.setAttrValue('node', ctlNode)
+        proxy.setIsVariantAttr('spaces', True)
+        proxy.getOrCreateVariant(0).setAttrValue('spaces', ['a'])
+        proxy.getOrCreateVariant(1).setAttrValue('spaces', ['b'])
+
+        actions = list(proxy.actionIterator())
+        self.assertEqual(len(actions), 2)
+        self.assertEqual(actions[0].node, ctlNode)
+        self.assertEqual(actions[1].node, ctlNode)
+        self.assertEqual(actions[0].spaces, ['a'])
+        self.assertEqual(actions[1].spaces, ['b'])
+
+        # modifying values in an action doesn't affect the proxy
+        actions[0].spaces.append('c')
+        self.assertEqual(actions[0].spaces, ['a', 'c'])
+        self.assertEqual(proxy.getVariant(0).getAttrValue('spaces'), ['a'])
+        actions[1].setAttrValue('node', None)
+        self.assertEqual(proxy.getAttrValue('node'), ctlNode)
+        self.assertEqual(actions[0].node, ctlNode)
+
+    def test_variantValues(self):
+        proxy = pulse.BuildActionProxy('Pulse.AnimControl')
+        proxy.setAttrValue('keyableAttrs', ['t'])
+        proxy.setIsVariantAttr('keyableAttrs', True)
+        self.assertEqual(proxy.numVariants(), 1)
+        self.assertFalse(proxy.hasAttrValue('keyableAttrs'))
+        self.assertEqual(proxy.getVariantValues('keyableAttrs'), [['t']])
+
+        proxy.setVariantValues('keyableAttrs', [['r'], None, ['s']])
+        self.assertEqual(proxy.numVariants(), 3)
+        self.assertFalse(proxy.getVariant(1).hasAttrValue('keyableAttrs'))
+        self.assertEqual(proxy.getVariant(-1).getAttrValue('keyableAttrs'),
+                         ['s'])
+
+        proxy.removeVariantAt(0)
+        proxy.insertVariant(0)
+        self.assertEqual(proxy.getVariantValues('keyableAttrs'),
+                         [None, None, ['s']])
+        data = proxy.serialize()
+        self.assertEqual(data['variantAttrs'], ['keyableAttrs'])
+        self.assertEqual(data['variants'], [{}, {}, {'keyableAttrs': ['s']}])
+
+        proxy.setIsVariantAttr('keyableAttrs', False)
+        self.assertEqual(proxy.getAttrValue('keyableAttrs'), None)
+        self.assertEqual(proxy.numVariants(), 3)
+
+    def test_emptyCollections(self):
+        stepA = pulse.BuildStep('A')
+        stepB = pulse.BuildStep(actionId='Pulse.AnimControl')
+        self.assertFalse(hasattr(stepA, '__dict__'))
+        self.assertFalse(hasattr(stepB.actionProxy, '__dict__'))
+        # empty steps share the same empty list internally,
+        # but callers always get a list they can modify
+        self.assertIs(stepA._children, stepB._children)
+        self.assertIsNot(stepA.children, stepB.children)
+        stepA.children.append(stepB)
+        self.assertEqual(stepA.numChildren(), 0)
+        stepB.actionProxy.getVariantAttrs().append('keyableAttrs')
+        self.assertEqual(stepB.actionProxy.getVariantAttrs(), [])
+
+        stepA.addChild(stepB)
+        self.assertEqual(stepA.children, [stepB])
+        self.assertEqual(stepA.getChildByName(stepB.name), stepB)
+        stepB.actionProxy.setAttrValue('keyableAttrs', ['t'])
+        stepB.actionProxy.setIsVariantAttr('keyableAttrs', True)
+        self.assertEqual(stepB.actionProxy.getVariantAttrs(), ['keyableAttrs'])
+
+        stepA.clearChildren()
+        self.assertEqual(stepA.children, [])
+        self.assertEqual(stepA.getIndexErrors(), [])
+        self.assertEqual(pulse.BuildStep('C').children, [])
+
+    def test_chunkedNodeStorage(self):
+        bp = pulse.Blueprint()
+        bp.rigName = 'testRig'
+        bp.initializeDefaultActions()
+        mainStep = bp.getStepByPath('Main')
+        ctlStep = pulse.BuildStep(actionId='Pulse.AnimControl')
+        mainStep.addChild(ctlStep)
+        yamlStr = bp.dumpYaml()
+
+        node = bp.saveToNode('testBlueprint', create=True, chunked=True)
+        chunkAttrs = set(pm.listAttr(
+            node, ud=True, st=pulse.BLUEPRINT_CHUNK_ATTR_PREFIX + '*'))
+        self.assertEqual(len(chunkAttrs), bp.rootStep.numChildren())
+
+        # only the modified top-level step is written again
+        ctlStep.actionProxy.setAttrValue('createOffset', False)
+        bp.saveToNode(node, chunked=True)
+        newChunkAttrs = set(pm.listAttr(
+            node, ud=True, st=pulse.BLUEPRINT_CHUNK_ATTR_PREFIX + '*'))
+        self.assertEqual(len(newChunkAttrs - chunkAttrs), 1)
+        self.assertEqual(len(chunkAttrs - newChunkAttrs), 1)
+
+        loadedBp = pulse.Blueprint()
+        loadedBp.loadFromNode(node, lazy=True)
+        self.assertEqual(loadedBp.rigName, 'testRig')
+        self.assertEqual(loadedBp.dumpYaml(), bp.dumpYaml())
+        self.assertNotEqual(loadedBp.dumpYaml(), yamlStr)
+
+        # saving as a single string removes all chunks
+        bp.saveToNode(node, chunked=False)
+        self.assertEqual(pm.listAttr(
+            node, ud=True, st=pulse.BLUEPRINT_CHUNK_ATTR_PREFIX + '*'), [])
+        loadedBp.loadFromNode(node)
+        self.assertEqual(loadedBp.dumpYaml(), bp.dumpYaml())
+
+        # new blueprint nodes use chunks by default
+        newBp, newNode = pulse.Blueprint.createNode('testNewBlueprint')
+        self.assertEqual(len(pm.listAttr(
+            newNode, ud=True, st=pulse.BLUEPRINT_CHUNK_ATTR_PREFIX + '*')),
+            newBp.rootStep.numChildren())
@@ -0,0 +1,79 @@
+import os
+import time
+import json
+import shutil
+import tempfile
+import unittest
+
+import pulse
+
+
+class TestCacheSourceAction(pulse.BuildAction):
+
+    def getSourceFiles(self):
+        return [self.sourceFile]
+
+
+class TestBuildCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tempDir = tempfile.mkdtemp(prefix='pulse_test_buildcache_')
+        pulse.registerAction({'id': 'Test.CacheSource', 'attrs': [
+            {'name': 'sourceFile', 'type': 'string'}]}, TestCacheSourceAction)
+
+    def tearDown(self):
+        pulse.unregisterAction('Test.CacheSource')
+        shutil.rmtree(self.tempDir)
+
+    def writeFile(self, name, data):
+        path = os.path.join(self.tempDir, name)
+        with open(path, 'w') as fp:
+            fp.write(data)
+        return path
+
+    def addEntry(self, cache, key, size, lastUsed):
+        if not os.path.isdir(cache.cacheDir):
+            os.makedirs(cache.cacheDir)
+        with open(cache.getPath(key), 'w') as fp:
+            fp.write('x' * size)
+        with open(os.path.join(cache.cacheDir, key + '.json'), 'w') as fp:
+            json.dump(dict(key=key, lastUsed=lastUsed), fp)
+
+    def test_getKey(self):
+        sceneFile = self.writeFile('rig.ma', 'scene')
+        weightsFile = self.writeFile('rig.weights', 'weights')
+        bp = pulse.Blueprint()
+        step = pulse.BuildStep(actionId='Test.CacheSource')
+        step.actionProxy.setAttrValue('sourceFile', weightsFile)
+        bp.rootStep.addChild(step)
+
+        key = pulse.BuildCache.getKey(bp, sceneFile)
+        self.assertEqual(pulse.BuildCache.getKey(bp, sceneFile), key)
+        # changing a source file changes the key
+        time.sleep(0.01)
+        self.writeFile('rig.weights', 'new weights')
+        weightsKey = pulse.BuildCache.getKey(bp, sceneFile)
+        self.assertNotEqual(weightsKey, key)
+        # changing the blueprint changes the key
+        bp.rigName = 'otherRig'
+        self.assertNotEqual(pulse.BuildCache.getKey(bp, sceneFile), weightsKey)
+
+    def test_evict(self):
+        cache = pulse.BuildCache(os.path.join(self.tempDir, 'cache'),
+                                 maxSize=250, maxEntries=3)
+        for i in range(4):
+            self.addEntry(cache, 'key{0}'.format(i), 100, lastUsed=i)
+        cache.get('key0')
+        self.assertEqual([e['key'] for e in cache.getEntries()],
+                         ['key0', 'key3', 'key2', 'key1'])
+        self.assertEqual(cache.getSize(), 400)
+
+        # least recently used entries are removed first
+        self.assertEqual(cache.evict(), ['key2', 'key1'])
+        self.assertTrue(cache.has('key0'))
+        self.assertFalse(cache.has('key1'))
+        self.assertEqual(cache.getEntries()[0]['hitCount'], 1)
+
+        cache.clear()
+        self.assertEqual(cache.getEntries(), [])
+        self.assertEqual(os.listdir(cache.cacheDir), [])
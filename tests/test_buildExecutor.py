@@ -0,0 +1,86 @@
+import unittest
+import maya.cmds as cmds
+
+import pulse
+
+
+class TestExecutorAction(pulse.BuildAction):
+    def run(self):
+        pass
+
+
+class TestBuildExecutor(unittest.TestCase):
+
+    def setUp(self):
+        pulse.registerAction({'id': 'Test.Executor', 'attrs': []},
+                             TestExecutorAction)
+
+    def tearDown(self):
+        pulse.unregisterAction('Test.Executor')
+
+    def createBuilder(self, actionCount=5, **kwargs):
+        bp = pulse.Blueprint()
+        bp.rigName = 'testExecutorRig'
+        for i in range(actionCount):
+            bp.rootStep.addChild(pulse.BuildStep(actionId='Test.Executor'))
+        return pulse.BlueprintBuilder(bp, **kwargs)
+
+    def test_wait(self):
+        executor = pulse.BuildExecutor(
+            self.createBuilder(), sliceTime=0, showProgress=False)
+        doneResults = []
+        executor.addDoneCallback(doneResults.append)
+        builder = executor.wait()
+        self.assertTrue(executor.done())
+        self.assertTrue(builder.isFinished)
+        self.assertEqual(executor.getState(), 'finished')
+        self.assertEqual(doneResults, [executor])
+        # without a time budget, each slice runs one action
+        self.assertGreaterEqual(executor.sliceCount, 5)
+
+    def test_pauseAndCancel(self):
+        executor = pulse.BuildExecutor(
+            self.createBuilder(), sliceTime=0, showProgress=False)
+        executor.pause()
+        executor.start()
+        self.assertEqual(executor.getState(), 'paused')
+        executor.runSlice()
+        self.assertFalse(executor.done())
+        self.assertTrue(executor.cancel())
+        self.assertTrue(executor.done())
+        self.assertEqual(executor.getState(), 'cancelled')
+        self.assertIs(executor.result(), executor.builder)
+        self.assertFalse(executor.builder.isFinished)
+
+    def test_fastBuild(self):
+        undoState = cmds.undoInfo(q=True, state=True)
+        executor = pulse.BuildExecutor(
+            self.createBuilder(fastBuild=True), sliceTime=0,
+            showProgress=False)
+        executor.start()
+        # fast builds don't leave the scene suspended between idle events
+        self.assertTrue(executor.done())
+        self.assertTrue(executor.builder.isFinished)
+        self.assertFalse(executor.builder.fastBuildContext.isSuspended)
+        self.assertEqual(cmds.undoInfo(q=True, state=True), undoState)
+
+    def test_pausedFastBuild(self):
+        executor = pulse.BuildExecutor(
+            self.createBuilder(fastBuild=True), sliceTime=0,
+            showProgress=False)
+        executor.pause()
+        executor.start()
+        self.assertEqual(executor.getState(), 'paused')
+        self.assertFalse(executor.builder.fastBuildContext.isSuspended)
+        executor.resume()
+        self.assertTrue(executor.builder.isFinished)
+
+    def test_cancelOnNewScene(self):
+        executor = pulse.BuildExecutor(
+            self.createBuilder(), sliceTime=0, showProgress=False)
+        executor.start()
+        executor.runSlice()
+        self.assertEqual(executor.getState(), 'running')
+        cmds.file(new=True, force=True)
+        self.assertTrue(executor.done())
+        self.assertEqual(executor.getState(), 'cancelled')
@@ -0,0 +1,76 @@
+import os
+import json
+import shutil
+import logging
+import tempfile
+import unittest
+
+import pulse
+
+
+class TestBuildLog(unittest.TestCase):
+
+    def setUp(self):
+        self.tempDir = tempfile.mkdtemp(prefix='pulse_test_buildlog_')
+        self.log = logging.getLogger('pulse.test.buildLog')
+        self.log.propagate = False
+        self.log.setLevel(logging.DEBUG)
+
+    def tearDown(self):
+        self.log.handlers = []
+        shutil.rmtree(self.tempDir)
+
+    def test_logWriter(self):
+        logFile = os.path.join(self.tempDir, 'build.log')
+        jsonFile = os.path.join(self.tempDir, 'build.jsonl')
+        writer = pulse.BuildLogWriter(logFile, jsonFile)
+        self.log.handlers = [writer.handler]
+        writer.start()
+        self.assertTrue(writer.isRunning)
+        self.log.info('Started')
+        for i in range(3):
+            action = dict(path='Main/Step{0}'.format(i), actionId='Test',
+                          duration=0.5, error='failed' if i == 1 else None)
+            self.log.debug('Step {0}'.format(i), extra=dict(action=action))
+        try:
+            raise ValueError('bad value')
+        except ValueError:
+            self.log.error('Failed', exc_info=True)
+        writer.stop()
+        self.assertFalse(writer.isRunning)
+
+        with open(logFile) as fp:
+            lines = fp.read().splitlines()
+        self.assertIn('INFO pulse.test.buildLog: Started', lines[0])
+        self.assertIn('DEBUG pulse.test.buildLog: Step 2', lines[3])
+        self.assertEqual(lines[-1], 'ValueError: bad value')
+
+        with open(jsonFile) as fp:
+            records = [json.loads(line) for line in fp]
+        self.assertEqual([r['path'] for r in records],
+                         ['Main/Step0', 'Main/Step1', 'Main/Step2'])
+        self.assertEqual(records[1]['error'], 'failed')
+        self.assertEqual(records[0]['duration'], 0.5)
+
+    def test_parentLogHandler(self):
+        parent = logging.getLogger('pulse.test')
+        records = []
+        parentHandler = logging.Handler()
+        parentHandler.emit = records.append
+        parent.addHandler(parentHandler)
+        parent.setLevel(logging.INFO)
+        self.addCleanup(parent.removeHandler, parentHandler)
+        self.addCleanup(parent.setLevel, logging.NOTSET)
+
+        self.log.handlers = [pulse.ParentLogHandler(self.log)]
+        self.log.debug('Debug')
+        self.log.info('Info')
+        self.log.warning('Warning')
+        self.log.error('Error')
+        self.assertEqual([r.getMessage() for r in records],
+                         ['Warning', 'Error'])
+        # the level of the parent is respected
+        del records[:]
+        parent.setLevel(logging.ERROR)
+        self.log.warning('Warning')
+        self.assertEqual(records, [])
@@ -0,0 +1,119 @@
+import unittest
+import maya.cmds as cmds
+import pymel.core as pm
+
+import pulse
+import pulse.views
+
+
+class TestCommands(unittest.TestCase):
+
+    def setUp(self):
+        pm.newFile(force=True)
+        pm.loadPlugin('pulse', quiet=True)
+        cmds.undoInfo(state=True, infinity=True)
+        self.model = pulse.views.BlueprintUIModel.getDefaultModel()
+        self.model.initializeBlueprint()
+        self.model.undoJournal.clear()
+        self.ctlStep = pulse.BuildStep('Ctl', actionId='Pulse.AnimControl')
+        self.model.blueprint.getStepByPath('Main').addChild(self.ctlStep)
+
+    def tearDown(self):
+        self.model.undoJournal.maxEntries = 1000
+        self.model.initializeBlueprint()
+
+    def toStr(self, value):
+        return pulse.serializeAttrValue(value)
+
+    def test_setActionAttr(self):
+        proxy = self.ctlStep.actionProxy
+        cmds.pulseSetActionAttr(
+            'Main/Ctl.keyableAttrs', self.toStr(['t', 'r']))
+        self.assertEqual(proxy.getAttrValue('keyableAttrs'), ['t', 'r'])
+        # only the encoded old value is recorded
+        self.assertEqual(len(self.model.undoJournal), 1)
+        self.assertLess(self.model.undoJournal.getSize(), 100)
+
+        cmds.undo()
+        self.assertEqual(proxy.getAttrValue('keyableAttrs'), None)
+        cmds.redo()
+        self.assertEqual(proxy.getAttrValue('keyableAttrs'), ['t', 'r'])
+
+    def test_setActionAttrNewVariant(self):
+        proxy = self.ctlStep.actionProxy
+        proxy.setIsVariantAttr('keyableAttrs', True)
+        cmds.pulseSetActionAttr(
+            'Main/Ctl.keyableAttrs', self.toStr(['s']), v=1)
+        self.assertEqual(proxy.numVariants(), 2)
+
+        # creating variants is undone with a delta of the step
+        cmds.undo()
+        self.assertEqual(proxy.numVariants(), 0)
+        cmds.redo()
+        self.assertEqual(
+            proxy.getVariant(1).getAttrValue('keyableAttrs'), ['s'])
+
+    def test_discardedJournalEntry(self):
+        self.model.undoJournal.maxEntries = 1
+        cmds.pulseSetActionAttr('Main/Ctl.keyableAttrs', self.toStr(['t']))
+        cmds.pulseSetActionAttr('Main/Ctl.keyableAttrs', self.toStr(['r']))
+        cmds.undo()
+        self.assertEqual(
+            self.ctlStep.actionProxy.getAttrValue('keyableAttrs'), ['t'])
+        # undoing a change whose history was discarded fails loudly
+        with self.assertRaises(RuntimeError):
+            cmds.undo()
+
+    def test_setActionAttrs(self):
+        otherStep = pulse.BuildStep('Other', actionId='Pulse.AnimControl')
+        self.model.blueprint.getStepByPath('Main').addChild(otherStep)
+        ctlProxy = self.ctlStep.actionProxy
+        otherProxy = otherStep.actionProxy
+        ctlProxy.setIsVariantAttr('keyableAttrs', True)
+        ctlProxy.getOrCreateVariant(1)
+        oldData = [ctlProxy.serialize(), otherProxy.serialize()]
+
+        changedRows = []
+        treeModel = self.model.buildStepTreeModel
+
+        def onDataChanged(topLeft, bottomRight, roles):
+            changedRows.append(treeModel.stepForIndex(topLeft).getFullPath())
+        treeModel.dataChanged.connect(onDataChanged)
+        self.addCleanup(treeModel.dataChanged.disconnect, onDataChanged)
+
+        edits = [
+            ['Main/Ctl.keyableAttrs', 0, ['t']],
+            ['Main/Ctl.keyableAttrs', 1, ['r']],
+            ['Main/Ctl.createOffset', -1, False],
+            ['Main/Other.keyableAttrs', -1, ['s']],
+        ]
+        cmds.pulseSetActionAttrs(self.toStr(edits))
+        newData = [ctlProxy.serialize(), otherProxy.serialize()]
+        self.assertEqual(
+            ctlProxy.getVariant(1).getAttrValue('keyableAttrs'), ['r'])
+        self.assertEqual(otherProxy.getAttrValue('keyableAttrs'), ['s'])
+        # one journal entry, and one change per modified step
+        self.assertEqual(len(self.model.undoJournal), 1)
+        self.assertEqual(sorted(changedRows), ['Main/Ctl', 'Main/Other'])
+
+        del changedRows[:]
+        cmds.undo()
+        self.assertEqual([ctlProxy.serialize(), otherProxy.serialize()],
+                         oldData)
+        self.assertEqual(sorted(changedRows), ['Main/Ctl', 'Main/Other'])
+        cmds.redo()
+        self.assertEqual([ctlProxy.serialize(), otherProxy.serialize()],
+                         newData)
+        self.assertEqual(len(self.model.undoJournal), 1)
+
+    def test_setActionAttrsInvalid(self):
+        edits = [
+            ['Main/Ctl.createOffset', -1, False],
+            ['Main/Missing.createOffset', -1, False],
+        ]
+        with self.assertRaises(RuntimeError):
+            cmds.pulseSetActionAttrs(self.toStr(edits))
+        # no values are set if any edit is invalid
+        self.assertIsNone(
+            self.ctlStep.actionProxy.getAttrValue('createOffset'))
+        self.assertEqual(len(self.model.undoJournal), 0)
@@ -0,0 +1,99 @@
+import unittest
+
+import pulse
+from pulse.core import deltas
+
+
+class TestDeltas(unittest.TestCase):
+
+    def test_diffAndPatch(self):
+        old = {
+            'name': 'MyStep',
+            'action': {
+                'id': 'Pulse.AnimControl',
+                'keyableAttrs': ['t', 'r'],
+                'variants': [{'a': 1}, {'a': 2}, {'a': 3}],
+            },
+        }
+        new = {
+            'name': 'MyStep2',
+            'action': {
+                'id': 'Pulse.AnimControl',
+                'keyableAttrs': ['t', 's'],
+                'createOffset': True,
+                'variants': [{'a': 1}, {'a': 4}, {'a': 5}, {'a': 3}],
+            },
+        }
+        delta = deltas.diffData(old, new)
+        self.assertEqual(deltas.patchData(old, delta), new)
+        self.assertEqual(deltas.patchData(new, delta, reverse=True), old)
+        # only changed items are stored
+        self.assertEqual(len(delta), 4)
+        self.assertIn(('splice', ('action', 'variants'), 1,
+                       [{'a': 2}], [{'a': 4}, {'a': 5}]), delta)
+
+    def test_patchDoesNotModifyData(self):
+        old = {'a': [1, 2], 'b': {'c': [3]}}
+        new = {'a': [1], 'b': {'c': [3], 'd': None}}
+        delta = deltas.diffData(old, new)
+        result = deltas.patchData(old, delta)
+        self.assertEqual(old, {'a': [1, 2], 'b': {'c': [3]}})
+        self.assertEqual(result, new)
+        # unchanged values are shared
+        self.assertIs(result['b']['c'], old['b']['c'])
+
+    def test_diffIsCopied(self):
+        old = {'a': [1]}
+        new = {'a': 'x'}
+        delta = deltas.diffData(old, new)
+        old['a'].append(2)
+        self.assertEqual(deltas.patchData(new, delta, reverse=True),
+                         {'a': [1]})
+
+    def test_diffTypes(self):
+        self.assertEqual(deltas.diffData({'a': 1}, {'a': 1}), [])
+        self.assertEqual(len(deltas.diffData({'a': 1}, {'a': True})), 1)
+
+    def test_patchMismatch(self):
+        delta = deltas.diffData({'a': {'b': 1}}, {'a': {'b': 2}})
+        with self.assertRaises(ValueError):
+            deltas.patchData({'c': 1}, delta)
+
+    def test_undoJournal(self):
+        journal = pulse.UndoJournal(maxEntries=2)
+        ids = [journal.record(deltas.diffData({'a': i}, {'a': i + 1}))
+               for i in range(3)]
+        self.assertEqual(len(journal), 2)
+        self.assertIsNone(journal.get(ids[0]))
+        self.assertEqual(journal.get(ids[2]), [('set', (), 'a', 2, 3)])
+        self.assertGreater(journal.getSize(), 0)
+
+        journal.maxSize = 0
+        journal.record([])
+        self.assertEqual(len(journal), 1)
+        journal.clear()
+        self.assertEqual(journal.getSize(), 0)
+
+    def test_applyProxyDelta(self):
+        proxy = pulse.BuildActionProxy('Pulse.AnimControl')
+        proxy.setAttrValue('keyableAttrs', ['t'])
+        proxy.setIsVariantAttr('keyableAttrs', True)
+        proxy.setVariantValues('keyableAttrs', [['t'], ['r'], ['s']])
+        oldData = proxy.serialize()
+
+        # variant values only
+        proxy.getVariant(1).setAttrValue('keyableAttrs', ['r', 'x'])
+        proxy.setAttrValue('createOffset', True)
+        delta = deltas.diffData(oldData, proxy.serialize())
+        newData = proxy.serialize()
+        proxy.applyDelta(delta, reverse=True)
+        self.assertEqual(proxy.serialize(), oldData)
+        proxy.applyDelta(delta)
+        self.assertEqual(proxy.serialize(), newData)
+
+        # variant attrs
+        proxy.setIsVariantAttr('keyableAttrs', False)
+        delta = deltas.diffData(newData, proxy.serialize())
+        proxy.applyDelta(delta, reverse=True)
+        self.assertEqual(proxy.serialize(), newData)
+        self.assertTrue(proxy.isVariantAttr('keyableAttrs'))
@@ -0,0 +1,109 @@
+import unittest
+import pymel.core as pm
+
+import pulse
+
+
+class TestDependencyNodeAction(pulse.BuildAction):
+    def run(self):
+        pass
+
+
+class TestDependencyReadAction(pulse.BuildAction):
+    def run(self):
+        pass
+
+
+class TestDependencies(unittest.TestCase):
+
+    def setUp(self):
+        pm.newFile(force=True)
+        pulse.registerAction({'id': 'Test.DependencyNode', 'attrs': [
+            {'name': 'node', 'type': 'node'},
+            {'name': 'nodes', 'type': 'nodelist'},
+        ]}, TestDependencyNodeAction)
+        pulse.registerAction({
+            'id': 'Test.DependencyRead',
+            'inputs': ['node', 'myResource'],
+            'attrs': [{'name': 'node', 'type': 'node'}],
+        }, TestDependencyReadAction)
+
+    def tearDown(self):
+        pulse.unregisterAction('Test.DependencyNode')
+        pulse.unregisterAction('Test.DependencyRead')
+
+    def createBlueprint(self, actions):
+        bp = pulse.Blueprint()
+        for actionId, attrs in actions:
+            step = pulse.BuildStep(actionId=actionId)
+            for name, value in attrs.items():
+                step.actionProxy.setAttrValue(name, value)
+            bp.rootStep.addChild(step)
+        return bp
+
+    def test_actionGraph(self):
+        nodeA = pm.group(em=True, n='a')
+        nodeB = pm.group(em=True, n='b', p=nodeA)
+        nodeC = pm.group(em=True, n='c')
+        nodeD = pm.group(em=True, n='d')
+        bp = self.createBlueprint([
+            ('Test.DependencyNode', {'node': nodeA}),
+            ('Test.DependencyNode', {'node': nodeC}),
+            # child of a node that was written
+            ('Test.DependencyNode', {'node': nodeB}),
+            # reads don't depend on each other
+            ('Test.DependencyRead', {'node': nodeD}),
+            ('Test.DependencyRead', {'node': nodeD}),
+            ('Test.DependencyNode', {'nodes': [nodeC, nodeD]}),
+            # affects the whole scene
+            ('Pulse.OptimizeScene', {}),
+            ('Test.DependencyNode', {'node': nodeA}),
+        ])
+        graph = pulse.ActionGraph.fromBlueprint(bp)
+        self.assertEqual(graph.dependencies, [
+            [], [], [0], [], [], [1, 3, 4], [0, 1, 2, 3, 4, 5], [6]])
+        self.assertEqual(graph.getDependents(6), [7])
+        self.assertEqual(graph.getBatches(),
+                         [[0, 1, 3, 4], [2, 5], [6], [7]])
+        self.assertEqual(graph.getBatches([2, 3, 4, 5]), [[2, 3, 4], [5]])
+        self.assertEqual(graph.getCriticalPath(), [0, 2, 6, 7])
+        self.assertEqual(graph.getCriticalPath(
+            weights=[1, 1, 1, 5, 1, 1, 1, 1]), [3, 5, 6, 7])
+
+    def test_independentGroups(self):
+        nodeA = pm.group(em=True, n='a')
+        nodeB = pm.group(em=True, n='b')
+        bp = self.createBlueprint([
+            ('Test.DependencyNode', {'node': nodeA}),
+            ('Test.DependencyNode', {'node': nodeB}),
+            ('Test.DependencyRead', {'node': nodeA}),
+        ])
+        graph = pulse.ActionGraph.fromBlueprint(bp)
+        self.assertEqual(graph.getIndependentGroups(), [[0, 2], [1]])
+
+    def test_buildBatches(self):
+        nodeA = pm.group(em=True, n='a')
+        nodeB = pm.group(em=True, n='b')
+        bp = self.createBlueprint([
+            ('Test.DependencyNode', {'node': nodeA}),
+            ('Test.DependencyNode', {'node': nodeA}),
+            ('Test.DependencyNode', {'node': nodeB}),
+        ])
+        bp.rigName = 'testBatchRig'
+        builder = pulse.BlueprintBuilder(bp, batchActions=True)
+        builder.start()
+        self.assertTrue(builder.isFinished)
+        self.assertEqual(len(builder.errors), 0)
+        self.assertEqual(builder.actionGraph.getBatches(), [[0, 2], [1]])
+
+    def test_organizationActions(self):
+        nodes = [pm.group(em=True, n=n) for n in ('a', 'b', 'c', 'd')]
+        bp = self.createBlueprint([
+            ('Pulse.DisplayLayer', {'name': 'layer', 'objects': [nodes[0]]}),
+            ('Pulse.ObjectSet', {'name': 'set', 'objects': [nodes[1]]}),
+            ('Pulse.DisplayLayer', {'name': 'layer', 'objects': [nodes[2]]}),
+            ('Pulse.ObjectSet', {'name': 'set', 'objects': [nodes[3]]}),
+        ])
+        graph = pulse.ActionGraph.fromBlueprint(bp)
+        # layers and sets are looked up by name, so they stay in order
+        self.assertEqual(graph.dependencies, [[], [], [0], [1]])
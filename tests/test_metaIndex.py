@@ -0,0 +1,55 @@
+import unittest
+import pymel.core as pm
+import pymetanode as meta
+
+import pulse
+from pulse import spaces
+
+
+class TestMetaIndex(unittest.TestCase):
+
+    def setUp(self):
+        pm.newFile(force=True)
+        self.index = pulse.MetaIndex.getShared()
+
+    def test_findMetaNodes(self):
+        nodeA = pm.group(em=True, n='spaceA')
+        spaces.createSpace(nodeA, 'a')
+        self.assertEqual(spaces.getAllSpaces(), [nodeA])
+        scanCount = self.index.scanCount
+
+        # new nodes are found without rescanning
+        nodeB = pm.group(em=True, n='spaceB')
+        spaces.createSpace(nodeB, 'b')
+        self.assertEqual(set(spaces.getAllSpaces()), set([nodeA, nodeB]))
+        self.assertEqual(self.index.scanCount, scanCount)
+
+        # deleted nodes are removed
+        pm.delete(nodeA)
+        self.assertEqual(spaces.getAllSpaces(), [nodeB])
+
+        # removed metadata is detected by attribute callbacks
+        meta.removeMetaData(nodeB, spaces.SPACE_METACLASS)
+        self.assertEqual(spaces.getAllSpaces(), [])
+        self.assertEqual(self.index.scanCount, scanCount)
+
+    def test_getMetaData(self):
+        node = pm.group(em=True, n='space')
+        spaces.createSpace(node, 'a')
+        self.assertEqual(spaces.getAllSpacesIndexedByName(), {'a': node})
+        # changed data is not read from the cache
+        meta.setMetaData(node, spaces.SPACE_METACLASS, {'name': 'b'})
+        self.assertEqual(spaces.getAllSpacesIndexedByName(), {'b': node})
+
+    def test_rebuild(self):
+        node = pm.group(em=True, n='space')
+        self.index.disable()
+        try:
+            self.assertEqual(spaces.getAllSpaces(), [])
+            # changes are not detected while callbacks are disabled
+            meta.setMetaData(node, spaces.SPACE_METACLASS, {'name': 'a'})
+            self.assertEqual(spaces.getAllSpaces(), [])
+            self.index.rebuild()
+            self.assertEqual(spaces.getAllSpaces(), [node])
+        finally:
+            self.index.enable()
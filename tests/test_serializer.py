@@ -0,0 +1,64 @@
+
+import unittest
+import pymel.core as pm
+
+import pulse
+from pulse.vendor import yaml
+from pulse.core import serializer
+
+
+class TestSerializer(unittest.TestCase):
+
+    def _createBlueprint(self):
+        bp = pulse.Blueprint()
+        bp.rigName = 'testRig'
+        bp.initializeDefaultActions()
+        return bp
+
+    def test_dumpMatchesPurePython(self):
+        data = self._createBlueprint().serialize()
+        expected = yaml.dump(data, default_flow_style=False,
+                             Dumper=serializer.PulseDumper)
+        self.assertEqual(serializer.dumpYaml(data), expected)
+
+    def test_dumpPreservesOrder(self):
+        data = serializer.UnsortableOrderedDict()
+        data['z'] = 1
+        data['a'] = 2
+        self.assertEqual(serializer.dumpYaml(data), 'z: 1\na: 2\n')
+
+    def test_dumpSortsPlainDicts(self):
+        data = serializer.UnsortableOrderedDict()
+        data['z'] = {'b': 1, 'a': 2}
+        data['a'] = 3
+        self.assertEqual(serializer.dumpYaml(data),
+                         'z:\n  a: 2\n  b: 1\na: 3\n')
+        expected = yaml.dump(data, default_flow_style=False,
+                             Dumper=serializer.PulseDumper)
+        self.assertEqual(serializer.dumpYaml(data), expected)
+
+    def test_loadRoundTrip(self):
+        bp = self._createBlueprint()
+        text = bp.dumpYaml()
+        data = serializer.loadYaml(text)
+        self.assertEqual(data, yaml.load(text, Loader=serializer.PulseLoader))
+
+        bp2 = pulse.Blueprint.fromData(data)
+        self.assertEqual(bp2.dumpYaml(), text)
+
+    def test_resolveNodeReferences(self):
+        nodes = [pm.group(em=True, n='resolve{0}'.format(i)) for i in range(3)]
+        missing = pulse.UnresolvedNode('6A5E7F1B-4B1F-4F2A-9C1D-0123456789AB')
+        data = {'node': nodes[0], 'nodes': [nodes[1], nodes[2], nodes[0]],
+                'missing': [missing, None]}
+        text = serializer.dumpYaml(data)
+
+        rawData = serializer.loadYaml(text, resolveNodes=False)
+        self.assertIsInstance(rawData['node'], pulse.UnresolvedNode)
+        result, unresolved = serializer.resolveNodeReferences(rawData)
+        self.assertEqual(result['node'], nodes[0])
+        self.assertEqual(result['nodes'], [nodes[1], nodes[2], nodes[0]])
+        self.assertEqual(result['missing'], [None, None])
+        self.assertEqual(unresolved, [missing.uuid])
+
+        self.assertEqual(serializer.loadYaml(text), result)
@@ -0,0 +1,104 @@
+import unittest
+
+import pulse
+
+
+class TestValidationAction(pulse.BuildAction):
+
+    validateUsesScene = False
+
+    def validate(self):
+        if not self.name:
+            raise pulse.BuildActionError('name is not set')
+
+
+class TestValidationSceneAction(pulse.BuildAction):
+
+    def validate(self):
+        if self.name == 'bad':
+            raise pulse.BuildActionError('name is bad')
+
+
+class SceneNode(object):
+    """
+    A node whose truth value, like a PyNode's, requires the scene.
+    """
+
+    def __nonzero__(self):
+        raise AssertionError('validator accessed the scene')
+
+
+class TestValidation(unittest.TestCase):
+
+    def setUp(self):
+        attrs = [{'name': 'name', 'type': 'string'}]
+        pulse.registerAction({'id': 'Test.Validation', 'attrs': attrs},
+                             TestValidationAction)
+        pulse.registerAction({'id': 'Test.ValidationScene', 'attrs': attrs},
+                             TestValidationSceneAction)
+
+    def tearDown(self):
+        pulse.unregisterAction('Test.Validation')
+        pulse.unregisterAction('Test.ValidationScene')
+
+    def createBlueprint(self):
+        bp = pulse.Blueprint()
+        group = pulse.BuildStep('Group')
+        bp.rootStep.addChild(group)
+        for i in range(20):
+            step = pulse.BuildStep(actionId='Test.Validation')
+            step.actionProxy.setAttrValue('name', 'step{0}'.format(i))
+            group.addChild(step)
+        return bp
+
+    def test_checkBlueprint(self):
+        bp = self.createBlueprint()
+        results = pulse.BlueprintChecker(bp).run()
+        self.assertFalse(results.hasErrors())
+        self.assertEqual(results.actionCount, 20)
+
+        bp.getStepByPath('Group/Validation 5').actionProxy.setAttrValue(
+            'name', '')
+        sceneStep = pulse.BuildStep(actionId='Test.ValidationScene')
+        sceneStep.actionProxy.setAttrValue('name', 'bad')
+        bp.getStepByPath('Group').insertChild(0, sceneStep)
+        bp.rootStep.addChild(pulse.BuildStep(actionId='Test.Missing'))
+
+        for maxWorkers in (0, 4):
+            results = pulse.BlueprintChecker(bp, maxWorkers=maxWorkers).run()
+            self.assertEqual(results.getErrorsByPath(), {
+                'Missing': ['Unknown action id: Test.Missing'],
+                'Group/ValidationScene': ['name is bad'],
+                'Group/Validation 5': ['name is not set'],
+            })
+            # errors are reported in build order
+            self.assertEqual(
+                [path for path, _, _ in results.errors[1:]],
+                ['Group/ValidationScene', 'Group/Validation 5'])
+
+    def test_checkVariants(self):
+        bp = self.createBlueprint()
+        proxy = bp.getStepByPath('Group/Validation 1').actionProxy
+        proxy.setIsVariantAttr('name', True)
+        proxy.setVariantValues('name', ['a', '', 'c', ''])
+        results = pulse.BlueprintChecker(bp).run()
+        self.assertEqual(results.actionCount, 23)
+        self.assertEqual(results.getErrorsByPath(), {
+            'Group/Validation 1': ['name is not set', 'name is not set'],
+        })
+
+    def test_concurrentBuiltinValidators(self):
+        pulse.loadBuiltinActions()
+        for actionId in pulse.getRegisteredActionIds():
+            actionClass = pulse.getBuildActionClass(actionId)
+            if actionClass.validateUsesScene:
+                continue
+            attrs = pulse.getBuildActionConfig(actionId).get('attrs', [])
+            nodeValues = dict([(a['name'], SceneNode()) for a in attrs
+                               if a['type'] == 'node'])
+            action = pulse.BuildAction.fromSharedValues(actionId, nodeValues)
+            # validators run on worker threads must not access the scene
+            try:
+                action.validate()
+            except pulse.BuildActionError:
+                pass